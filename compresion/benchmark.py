@@ -0,0 +1,261 @@
+from frecuencias import (cargar_imagen, contar_bloques, a_diccionario, frecuencias_bloques,
+                         frecuencias_bloques_counter)
+from huffman import construir_arbol_huffman, obtener_codigos
+from main import estadisticas_desde_frecuencias
+from PIL import Image
+import numpy as np
+import tracemalloc
+import platform
+import argparse
+import tempfile
+import time
+import json
+import csv
+import os
+
+ETAPAS = ('decodificacion', 'conteo', 'arbol', 'codigos', 'estadisticas')
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), 'benchmarks')
+
+
+def medir(funcion, *args, repeticiones=3):
+    """
+    Devuelve la mediana del tiempo (en segundos) de varias ejecuciones, después de una
+    ejecución de calentamiento, y el resultado de la última (mismo criterio que el benchmark
+    de comunicacion_digital).
+    """
+    resultado = funcion(*args)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos)), resultado
+
+
+def memoria_pico(funcion, *args):
+    """
+    Pico de memoria (bytes) reservada por Python/NumPy durante una ejecución, medido con tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        funcion(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def imagen_sintetica(tipo, alto, ancho, niveles=256, semilla=0):
+    """
+    Genera una imagen en escala de grises con tamaño y entropía controlables.
+
+    Args:
+        tipo (str): 'ruido' (uniforme), 'gradiente' (diagonal con ruido leve) o 'logo' (binaria, figuras)
+        alto, ancho (int): Tamaño de la imagen
+        niveles (int): Cantidad de niveles de gris (a menos niveles, menor entropía)
+        semilla (int): Semilla del generador
+
+    Returns:
+        np.ndarray: Imagen 2D uint8
+    """
+    rng = np.random.default_rng(semilla)
+    paso = 256 // niveles
+
+    if tipo == 'ruido':
+        return (rng.integers(0, niveles, (alto, ancho)) * paso).astype(np.uint8)
+
+    if tipo == 'gradiente':
+        y, x = np.mgrid[0:alto, 0:ancho]
+        base = (x / max(ancho - 1, 1) + y / max(alto - 1, 1)) / 2 * (niveles - 1)
+        ruido = rng.integers(-1, 2, (alto, ancho))
+        return (np.clip(np.round(base) + ruido, 0, niveles - 1) * paso).astype(np.uint8)
+
+    if tipo == 'logo':
+        # Fondo blanco con rectángulos y círculos negros, como logoFI.tif
+        img = np.full((alto, ancho), 255, dtype=np.uint8)
+        y, x = np.ogrid[0:alto, 0:ancho]
+        for _ in range(12):
+            cy, cx = rng.integers(0, alto), rng.integers(0, ancho)
+            r = rng.integers(min(alto, ancho) // 20 + 1, min(alto, ancho) // 5 + 2)
+            if rng.random() < 0.5:
+                img[max(cy - r, 0):cy + r, max(cx - r, 0):cx + r] = 0
+            else:
+                img[(y - cy) ** 2 + (x - cx) ** 2 <= r ** 2] = 0
+        return img
+
+    raise ValueError(f"Tipo de imagen desconocido: {tipo}")
+
+
+def medir_etapas(ruta_imagen, n, repeticiones=3):
+    """
+    Mide tiempo y pico de memoria de cada etapa del cálculo de estadísticas para un n.
+
+    Returns:
+        dict: t_<etapa> [s] y mem_<etapa> [bytes] para cada etapa
+    """
+    resultado = {}
+
+    def registrar(etapa, funcion, *args):
+        t, salida = medir(funcion, *args, repeticiones=repeticiones)
+        resultado[f't_{etapa}'] = t
+        resultado[f'mem_{etapa}'] = memoria_pico(funcion, *args)
+        return salida
+
+    img = registrar('decodificacion', cargar_imagen, ruta_imagen)
+    claves, cuentas = registrar('conteo', contar_bloques, img.ravel(), n)
+    frecuencias = a_diccionario(claves, cuentas, n)
+    arbol = registrar('arbol', construir_arbol_huffman, frecuencias)
+    registrar('codigos', obtener_codigos, arbol)
+    registrar('estadisticas', estadisticas_desde_frecuencias, n, frecuencias, img.shape)
+    resultado['simbolos_distintos'] = len(cuentas)
+    return resultado
+
+
+def ejecutar_suite(tipos=('ruido', 'gradiente', 'logo'), tamanos=(256, 1024), niveles=(2, 16, 256),
+                   n_values=range(1, 15), repeticiones=3, semilla=0):
+    """
+    Ejecuta el benchmark sobre imágenes sintéticas para cada combinación de parámetros.
+
+    Las imágenes se guardan como TIFF en un directorio temporal para que la decodificación
+    forme parte de la medición, igual que en calcular_estadisticas_compresion.
+
+    Returns:
+        list: Un diccionario por (tipo, tamaño, niveles, n)
+    """
+    filas = []
+    with tempfile.TemporaryDirectory() as temporal:
+        for tipo in tipos:
+            for tamano in tamanos:
+                for nivel in (niveles if tipo != 'logo' else (2,)):
+                    ruta = os.path.join(temporal, f'{tipo}_{tamano}_{nivel}.tif')
+                    Image.fromarray(imagen_sintetica(tipo, tamano, tamano, nivel, semilla)).save(ruta)
+                    for n in n_values:
+                        fila = {'tipo': tipo, 'tamano': tamano, 'niveles': nivel, 'n': int(n)}
+                        fila.update(medir_etapas(ruta, int(n), repeticiones))
+                        fila['t_total'] = sum(fila[f't_{etapa}'] for etapa in ETAPAS)
+                        filas.append(fila)
+                        print(f"{tipo:>9} {tamano:>5}px {nivel:>3} niveles n={int(n):2d}  "
+                              f"simbolos={fila['simbolos_distintos']:7d}  total={fila['t_total']*1e3:9.2f} ms")
+    return filas
+
+
+def guardar_resultados(filas, nombre, directorio=DIRECTORIO_RESULTADOS):
+    """
+    Guarda los resultados como JSON (con datos del entorno) y CSV.
+
+    Returns:
+        str: Ruta del archivo JSON
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta_json = os.path.join(directorio, f'{nombre}.json')
+    entorno = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor(),
+        'nucleos': os.cpu_count(),
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(ruta_json, 'w') as archivo:
+        json.dump({'entorno': entorno, 'resultados': filas}, archivo, indent=2)
+    with open(os.path.join(directorio, f'{nombre}.csv'), 'w', newline='') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(filas[0].keys()))
+        escritor.writeheader()
+        escritor.writerows(filas)
+    return ruta_json
+
+
+def comparar_resultados(ruta_base, ruta_nueva, umbral=0.2, minimo=1e-3):
+    """
+    Compara dos corridas del benchmark y lista las etapas que empeoraron más que el umbral.
+
+    Args:
+        ruta_base (str): JSON de referencia
+        ruta_nueva (str): JSON a evaluar
+        umbral (float): Aumento relativo tolerado (0.2 = 20 %)
+        minimo (float): Tiempos por debajo de este valor [s] se ignoran (ruido de medición)
+
+    Returns:
+        list: Regresiones (caso, métrica, valor base, valor nuevo, cociente)
+    """
+    def indexar(ruta):
+        with open(ruta) as archivo:
+            filas = json.load(archivo)['resultados']
+        return {(f['tipo'], f['tamano'], f['niveles'], f['n']): f for f in filas}
+
+    base, nueva = indexar(ruta_base), indexar(ruta_nueva)
+    regresiones = []
+    for caso in sorted(base.keys() & nueva.keys()):
+        for metrica in [f't_{e}' for e in ETAPAS] + [f'mem_{e}' for e in ETAPAS]:
+            anterior, actual = base[caso][metrica], nueva[caso][metrica]
+            if metrica.startswith('t_') and max(anterior, actual) < minimo:
+                continue
+            if anterior > 0 and actual / anterior > 1 + umbral:
+                regresiones.append((caso, metrica, anterior, actual, actual / anterior))
+
+    for caso, metrica, anterior, actual, cociente in regresiones:
+        print(f"REGRESIÓN {caso} {metrica}: {anterior:.4g} -> {actual:.4g} (x{cociente:.2f})")
+    print(f"{len(base.keys() & nueva.keys())} casos comparados, {len(regresiones)} regresiones")
+    return regresiones
+
+
+def comparar_frecuencias(ruta_imagen, n_values=range(1, 15)):
+    """
+    Compara el conteo vectorizado de bloques con la implementación de referencia (Counter).
+
+    Args:
+        ruta_imagen (str): Ruta de la imagen
+        n_values: Valores de n a probar
+
+    Returns:
+        list: Diccionarios con los tiempos de cada método para cada n
+    """
+    flat = cargar_imagen(ruta_imagen).ravel()
+    resultados = []
+    for n in n_values:
+        t_counter, ref = medir(frecuencias_bloques_counter, flat, n, repeticiones=1)
+        t_numpy, freq = medir(frecuencias_bloques, flat, n)
+        assert freq == ref, f"Las frecuencias difieren para n={n}"
+        resultados.append({
+            'n': n,
+            'simbolos_distintos': len(freq),
+            't_counter': t_counter,
+            't_numpy': t_numpy,
+            'aceleracion': t_counter / t_numpy,
+        })
+        print(f"n={n:2d}  simbolos={len(freq):6d}  counter={t_counter*1e3:8.2f} ms  "
+              f"numpy={t_numpy*1e3:7.2f} ms  x{t_counter / t_numpy:6.1f}")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del paquete de compresión')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    suite = sub.add_parser('suite', help='Mide cada etapa sobre imágenes sintéticas')
+    suite.add_argument('--tipos', nargs='+', default=['ruido', 'gradiente', 'logo'])
+    suite.add_argument('--tamanos', type=int, nargs='+', default=[256, 1024])
+    suite.add_argument('--niveles', type=int, nargs='+', default=[2, 16, 256])
+    suite.add_argument('-n', type=int, nargs='+', default=list(range(1, 15)))
+    suite.add_argument('--repeticiones', type=int, default=3)
+    suite.add_argument('--nombre', default=time.strftime('%Y%m%d_%H%M%S'), help='Nombre de los archivos de salida')
+
+    comparar = sub.add_parser('comparar', help='Compara dos corridas y marca regresiones')
+    comparar.add_argument('base')
+    comparar.add_argument('nueva')
+    comparar.add_argument('--umbral', type=float, default=0.2)
+    comparar.add_argument('--minimo', type=float, default=1e-3, help='Tiempo mínimo comparado [s]')
+
+    sub.add_parser('frecuencias', help='Conteo vectorizado frente a Counter sobre logoFI.tif')
+
+    args = parser.parse_args()
+    if args.comando == 'suite':
+        filas = ejecutar_suite(args.tipos, args.tamanos, args.niveles, args.n, args.repeticiones)
+        print(f"Resultados en {guardar_resultados(filas, args.nombre)}")
+    elif args.comando == 'comparar':
+        regresiones = comparar_resultados(args.base, args.nueva, args.umbral, args.minimo)
+        raise SystemExit(1 if regresiones else 0)
+    else:
+        comparar_frecuencias(os.path.join(os.path.dirname(__file__), 'logoFI.tif'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+from frecuencias import cargar_imagen, empaquetar_bloques, desempaquetar_bloques
+from huffman import longitudes_huffman, codigos_canonicos_arreglo
+import numpy as np
+import struct
+import time
+import os
+
+# Formato del contenedor:
+#   cabecera  | magico, version, alto, ancho, n, resto, cantidad de simbolos, cantidad de bloques
+#   simbolos  | (simbolos x n) bytes, en orden canónico
+#   longitud  | 1 byte por símbolo (longitud de su código)
+#   resto     | píxeles finales que no completan un bloque
+#   datos     | bits de los códigos, MSB primero, completado con ceros al final
+MAGICO = b'HUFB'
+VERSION = 1
+CABECERA = struct.Struct('<4sBIIBBIQ')
+
+BITS_TABLA = 12               # Bits que resuelve la tabla de decodificación de una sola consulta
+BLOQUES_POR_TROZO = 1 << 16   # Bloques que se convierten a bits de una vez al codificar
+MAX_LONGITUD = 64             # Los códigos deben entrar en un uint64
+
+
+def asignar_codigos(cuentas, longitud_maxima=None):
+    """
+    Calcula los códigos canónicos de Huffman para un histograma.
+
+    Args:
+        cuentas: Array con la frecuencia de cada símbolo (índice = símbolo)
+        longitud_maxima: Longitud máxima de los códigos (opcional)
+
+    Returns:
+        tuple: (orden, codigos, longitudes)
+        - orden: Índices de los símbolos en orden canónico
+        - codigos: Código entero de cada símbolo (uint64, indexado por símbolo)
+        - longitudes: Longitud del código de cada símbolo (indexado por símbolo)
+    """
+    longitudes = longitudes_huffman(cuentas, longitud_maxima)
+    if longitudes.max() > MAX_LONGITUD:
+        raise ValueError(f"Código de {longitudes.max()} bits: supera el máximo de {MAX_LONGITUD}")
+    orden, codigos = codigos_canonicos_arreglo(longitudes)
+    return orden, codigos, longitudes
+
+
+def codificar_bits(indices, codigos, longitudes):
+    """
+    Escribe los códigos de una secuencia de símbolos como bits empaquetados.
+
+    Args:
+        indices: Símbolo de cada bloque (índices en codigos/longitudes)
+        codigos: Código entero de cada símbolo
+        longitudes: Longitud del código de cada símbolo
+
+    Returns:
+        bytearray: Bits de los códigos, MSB primero, completado con ceros
+    """
+    salida = bytearray()
+    pendientes = np.zeros(0, dtype=np.uint8)  # Bits que no completaron un byte en el trozo anterior
+
+    for inicio in range(0, len(indices), BLOQUES_POR_TROZO):
+        trozo = indices[inicio:inicio + BLOQUES_POR_TROZO]
+        c = codigos[trozo]
+        l = longitudes[trozo]
+
+        # Expandimos cada código a sus bits: bit j del código = (c >> (l - 1 - j)) & 1
+        comienzos = np.cumsum(l) - l
+        posicion = np.arange(l.sum()) - np.repeat(comienzos, l)
+        desplazamiento = (np.repeat(l, l) - 1 - posicion).astype(np.uint64)
+        bits = ((np.repeat(c, l) >> desplazamiento) & np.uint64(1)).astype(np.uint8)
+
+        bits = np.concatenate([pendientes, bits])
+        completos = len(bits) - len(bits) % 8
+        salida += np.packbits(bits[:completos]).tobytes()
+        pendientes = bits[completos:]
+
+    salida += np.packbits(pendientes).tobytes()
+    return salida
+
+
+def tabla_decodificacion(longitudes_ordenadas, bits_tabla):
+    """
+    Construye la tabla de consulta de varios bits para códigos canónicos.
+
+    Cada entrada de la tabla corresponde a una ventana de bits_tabla bits; si la ventana empieza
+    con un código de longitud <= bits_tabla, la entrada guarda el símbolo y su longitud. Las
+    entradas de códigos más largos quedan con longitud 0.
+
+    Args:
+        longitudes_ordenadas: Longitud de cada símbolo, en orden canónico
+        bits_tabla: Cantidad de bits de la ventana
+
+    Returns:
+        tuple: (tabla_simbolo, tabla_longitud)
+    """
+    tabla_simbolo = np.zeros(1 << bits_tabla, dtype=np.int64)
+    tabla_longitud = np.zeros(1 << bits_tabla, dtype=np.int64)
+
+    codigo = 0
+    longitud_previa = 0
+    for i, longitud in enumerate(longitudes_ordenadas.tolist()):
+        codigo <<= longitud - longitud_previa
+        longitud_previa = longitud
+        if longitud <= bits_tabla:
+            libres = bits_tabla - longitud
+            tabla_simbolo[codigo << libres:(codigo + 1) << libres] = i
+            tabla_longitud[codigo << libres:(codigo + 1) << libres] = longitud
+        codigo += 1
+    return tabla_simbolo, tabla_longitud
+
+
+def decodificar_bits(datos, longitudes_ordenadas, bloques):
+    """
+    Decodifica una secuencia de códigos canónicos.
+
+    Args:
+        datos: Bits de los códigos (bytes)
+        longitudes_ordenadas: Longitud de cada símbolo, en orden canónico
+        bloques: Cantidad de símbolos a decodificar
+
+    Returns:
+        np.ndarray: Índice (en orden canónico) de cada símbolo decodificado
+    """
+    if bloques == 0:
+        return np.empty(0, dtype=np.int64)
+    longitudes_ordenadas = np.asarray(longitudes_ordenadas, dtype=np.int64)
+    l_max = int(longitudes_ordenadas.max())
+    bits_tabla = min(BITS_TABLA, l_max)
+    tabla_simbolo, tabla_longitud = tabla_decodificacion(longitudes_ordenadas, bits_tabla)
+    tabla_simbolo = tabla_simbolo.tolist()
+    tabla_longitud = tabla_longitud.tolist()
+
+    # Para los códigos largos: primer código, cantidad y posición del primer símbolo de cada longitud
+    cuenta = np.bincount(longitudes_ordenadas, minlength=l_max + 1).tolist()
+    primero = [0] * (l_max + 1)
+    desplazamiento = [0] * (l_max + 1)
+    codigo = 0
+    indice = 0
+    for longitud in range(1, l_max + 1):
+        codigo = (codigo + cuenta[longitud - 1]) << 1
+        primero[longitud] = codigo
+        desplazamiento[longitud] = indice
+        indice += cuenta[longitud]
+
+    salida = np.empty(bloques, dtype=np.int64)
+    buffer = 0
+    en_buffer = 0
+    posicion = 0
+    for i in range(bloques):
+        # Recargamos de a 7 bytes hasta tener al menos el código más largo
+        if en_buffer < l_max:
+            nuevos = datos[posicion:posicion + 7]
+            buffer = (buffer << (8 * len(nuevos))) | int.from_bytes(nuevos, 'big')
+            en_buffer += 8 * len(nuevos)
+            posicion += len(nuevos)
+            if en_buffer < l_max:
+                # Fin de los datos: completamos con ceros
+                buffer <<= l_max - en_buffer
+                en_buffer = l_max
+
+        ventana = buffer >> (en_buffer - bits_tabla)
+        longitud = tabla_longitud[ventana]
+        if longitud:
+            salida[i] = tabla_simbolo[ventana]
+        else:
+            longitud = bits_tabla + 1
+            while True:
+                codigo = buffer >> (en_buffer - longitud)
+                if codigo - primero[longitud] < cuenta[longitud]:
+                    salida[i] = desplazamiento[longitud] + codigo - primero[longitud]
+                    break
+                longitud += 1
+        en_buffer -= longitud
+        buffer &= (1 << en_buffer) - 1
+    return salida
+
+
+def comprimir(img, n, longitud_maxima=None):
+    """
+    Comprime una imagen en escala de grises con códigos de Huffman de bloques de tamaño n.
+
+    Args:
+        img: Array 2D uint8
+        n: Tamaño del bloque
+        longitud_maxima: Longitud máxima de los códigos (acota el tamaño de la tabla del decodificador)
+
+    Returns:
+        bytes: Contenedor con cabecera, tabla de códigos y datos
+    """
+    alto, ancho = img.shape
+    flat = np.ascontiguousarray(img, dtype=np.uint8).ravel()
+    resto = len(flat) % n
+    if len(flat) < n:
+        # Ningún bloque completo: el contenedor lleva sólo los píxeles del resto, sin tabla ni datos
+        return CABECERA.pack(MAGICO, VERSION, alto, ancho, n, resto, 0, 0) + flat.tobytes()
+
+    claves = empaquetar_bloques(flat, n)
+    unicas, indices, cuentas = np.unique(claves, return_inverse=True, return_counts=True)
+    orden, codigos, longitudes = asignar_codigos(cuentas, longitud_maxima)
+
+    cabecera = CABECERA.pack(MAGICO, VERSION, alto, ancho, n, resto, len(unicas), len(claves))
+    simbolos = desempaquetar_bloques(unicas[orden], n)
+    datos = codificar_bits(indices.ravel(), codigos, longitudes)
+
+    return b''.join([
+        cabecera,
+        simbolos.tobytes(),
+        longitudes[orden].astype(np.uint8).tobytes(),
+        flat[len(flat) - resto:].tobytes(),
+        bytes(datos),
+    ])
+
+
+def descomprimir(contenedor):
+    """
+    Reconstruye la imagen a partir de un contenedor generado por comprimir.
+
+    Args:
+        contenedor: bytes del archivo comprimido
+
+    Returns:
+        np.ndarray: Imagen 2D uint8
+    """
+    magico, version, alto, ancho, n, resto, cantidad, bloques = CABECERA.unpack_from(contenedor)
+    if magico != MAGICO or version != VERSION:
+        raise ValueError("El contenedor no es un archivo Huffman válido")
+
+    posicion = CABECERA.size
+    simbolos = np.frombuffer(contenedor, dtype=np.uint8, count=cantidad * n, offset=posicion).reshape(-1, n)
+    posicion += cantidad * n
+    longitudes = np.frombuffer(contenedor, dtype=np.uint8, count=cantidad, offset=posicion)
+    posicion += cantidad
+    cola = np.frombuffer(contenedor, dtype=np.uint8, count=resto, offset=posicion)
+    posicion += resto
+
+    indices = decodificar_bits(contenedor[posicion:], longitudes, bloques)
+    flat = np.concatenate([simbolos[indices].ravel(), cola])
+    return flat.reshape(alto, ancho)
+
+
+def comprimir_archivo(ruta_imagen, ruta_salida, n):
+    """
+    Comprime la imagen en ruta_imagen y guarda el contenedor en ruta_salida.
+
+    Returns:
+        int: Tamaño del archivo comprimido en bytes
+    """
+    contenedor = comprimir(cargar_imagen(ruta_imagen), n)
+    with open(ruta_salida, 'wb') as archivo:
+        archivo.write(contenedor)
+    return len(contenedor)
+
+
+def descomprimir_archivo(ruta_comprimida):
+    """
+    Lee un contenedor de disco y devuelve la imagen reconstruida.
+    """
+    with open(ruta_comprimida, 'rb') as archivo:
+        return descomprimir(archivo.read())
+
+
+def evaluar_codec(img, n):
+    """
+    Comprime y descomprime la imagen verificando que la reconstrucción sea exacta.
+
+    Args:
+        img: Array 2D uint8
+        n: Tamaño del bloque
+
+    Returns:
+        dict: Tamaño real, tasa real y velocidades de codificación/decodificación
+    """
+    inicio = time.perf_counter()
+    contenedor = comprimir(img, n)
+    t_codificacion = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    reconstruida = descomprimir(contenedor)
+    t_decodificacion = time.perf_counter() - inicio
+
+    assert np.array_equal(reconstruida, img), f"La reconstrucción no coincide para n={n}"
+
+    megabytes = img.size / 1e6
+    return {
+        'n': n,
+        'tamano_comprimido': len(contenedor),
+        'bits_por_pixel': 8 * len(contenedor) / img.size,
+        'tasa_real': img.size / (8 * len(contenedor)),  # 1 bit/píxel sin comprimir, igual que la tasa teórica
+        'codificacion_MBs': megabytes / t_codificacion,
+        'decodificacion_MBs': megabytes / t_decodificacion,
+    }
+
+
+def reporte_codec(resultados, img):
+    """
+    Comprime la imagen para cada n de resultados e imprime la tasa real junto a la teórica.
+
+    Args:
+        resultados: Lista de diccionarios de calcular_estadisticas_compresion
+        img: Imagen 2D uint8 (ya decodificada)
+
+    Returns:
+        list: Diccionarios de evaluar_codec
+    """
+    reporte = []
+    print(f"\n{'n':>3} {'tasa teórica':>13} {'tasa real':>10} {'bytes':>8} {'cod MB/s':>9} {'dec MB/s':>9}")
+    for r in resultados:
+        evaluacion = evaluar_codec(img, int(r['n']))
+        reporte.append(evaluacion)
+        print(f"{r['n']:>3} {r['tasa_compresion']:>13.3f} {evaluacion['tasa_real']:>10.3f} "
+              f"{evaluacion['tamano_comprimido']:>8d} {evaluacion['codificacion_MBs']:>9.2f} "
+              f"{evaluacion['decodificacion_MBs']:>9.2f}")
+    return reporte
+
+
+def main():
+    ruta_imagen = os.path.join(os.path.dirname(__file__), 'logoFI.tif')
+    img = cargar_imagen(ruta_imagen)
+    for n in range(1, 15):
+        print(evaluar_codec(img, n))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+from frecuencias import cargar_imagen, contar_bloques, fusionar_histogramas
+from huffman import longitudes_huffman
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import argparse
+import hashlib
+import glob
+import os
+
+EXTENSIONES = ('.tif', '.tiff', '.png', '.bmp', '.gif', '.jpg', '.jpeg', '.pgm')
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(__file__), '.cache_frecuencias')
+MAX_BYTES_CACHE = 512 * 2**20  # Tamaño máximo de la caché en disco
+
+
+def hash_archivo(ruta):
+    """
+    Hash SHA-256 del contenido del archivo (identifica la imagen en la caché).
+    """
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for trozo in iter(lambda: archivo.read(1 << 20), b''):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def listar_imagenes(patron):
+    """
+    Devuelve las imágenes de un directorio o las rutas que coinciden con un patrón glob.
+    """
+    if os.path.isdir(patron):
+        rutas = [os.path.join(patron, nombre) for nombre in os.listdir(patron)]
+    else:
+        rutas = glob.glob(patron, recursive=True)
+    return sorted(r for r in rutas if os.path.isfile(r) and r.lower().endswith(EXTENSIONES))
+
+
+def _ruta_cache(directorio, hash_imagen, n):
+    return os.path.join(directorio, f'{hash_imagen}_n{n}.npz')
+
+
+def leer_cache(directorio, hash_imagen, n):
+    """
+    Lee la tabla de frecuencias y longitudes de código de (imagen, n) si está en la caché.
+
+    Returns:
+        dict o None: claves, cuentas, longitudes y shape
+    """
+    ruta = _ruta_cache(directorio, hash_imagen, n)
+    try:
+        with np.load(ruta) as datos:
+            entrada = {nombre: datos[nombre] for nombre in datos.files}
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+    # La fecha de modificación marca el último uso (política LRU)
+    os.utime(ruta)
+    return entrada
+
+
+def guardar_cache(directorio, hash_imagen, n, **tablas):
+    """
+    Guarda las tablas de (imagen, n) en la caché de forma atómica.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta = _ruta_cache(directorio, hash_imagen, n)
+    temporal = f'{ruta}.{os.getpid()}.tmp.npz'
+    np.savez(temporal, **tablas)
+    os.replace(temporal, ruta)
+
+
+def podar_cache(directorio, max_bytes=MAX_BYTES_CACHE):
+    """
+    Elimina las entradas usadas hace más tiempo hasta que la caché ocupe a lo sumo max_bytes.
+
+    Returns:
+        int: Cantidad de entradas eliminadas
+    """
+    if not os.path.isdir(directorio):
+        return 0
+    entradas = []
+    for nombre in os.listdir(directorio):
+        if nombre.endswith('.npz') and '.tmp' not in nombre:
+            estado = os.stat(os.path.join(directorio, nombre))
+            entradas.append((estado.st_mtime, estado.st_size, nombre))
+
+    total = sum(tamano for _, tamano, _ in entradas)
+    eliminadas = 0
+    for _, tamano, nombre in sorted(entradas):
+        if total <= max_bytes:
+            break
+        os.remove(os.path.join(directorio, nombre))
+        total -= tamano
+        eliminadas += 1
+    return eliminadas
+
+
+def tablas_imagen(ruta, n_values, directorio=DIRECTORIO_CACHE):
+    """
+    Obtiene las tablas de frecuencias y longitudes de código de una imagen para cada n.
+    La imagen sólo se decodifica si falta alguna n en la caché.
+
+    Args:
+        ruta (str): Ruta de la imagen
+        n_values: Valores de n
+        directorio (str): Directorio de la caché
+
+    Returns:
+        tuple: (hash_imagen, {n: entrada}, calculadas)
+    """
+    hash_imagen = hash_archivo(ruta)
+    tablas = {}
+    flat = None
+    calculadas = 0
+    for n in n_values:
+        n = int(n)
+        entrada = leer_cache(directorio, hash_imagen, n)
+        if entrada is None:
+            if flat is None:
+                img = cargar_imagen(ruta)
+                flat = img.ravel()
+            claves, cuentas = contar_bloques(flat, n)
+            entrada = {
+                'claves': claves,
+                'cuentas': cuentas,
+                'longitudes': longitudes_huffman(cuentas),
+                'shape': np.array(img.shape),
+            }
+            guardar_cache(directorio, hash_imagen, n, **entrada)
+            calculadas += 1
+        tablas[n] = entrada
+    return hash_imagen, tablas, calculadas
+
+
+def _resumen(n, cuentas, longitudes):
+    longitud_promedio = float(np.dot(cuentas, longitudes) / cuentas.sum())
+    return {'n': n, 'longitud_promedio': longitud_promedio, 'tasa_compresion': n / longitud_promedio}
+
+
+def _procesar_imagen(args):
+    ruta, n_values, directorio = args
+    hash_imagen, tablas, calculadas = tablas_imagen(ruta, n_values, directorio)
+    resultados = []
+    for n, entrada in tablas.items():
+        resumen = _resumen(n, entrada['cuentas'], entrada['longitudes'])
+        resumen.update({'imagen': ruta, 'hash': hash_imagen, 'shape': tuple(entrada['shape'].tolist())})
+        resultados.append(resumen)
+    return resultados, calculadas
+
+
+def analizar_corpus(patron, n_values, procesos=None, directorio=DIRECTORIO_CACHE, max_bytes=MAX_BYTES_CACHE):
+    """
+    Calcula las estadísticas de compresión de todas las imágenes de un directorio o patrón glob.
+
+    Cada imagen se procesa en un proceso del pool. Las tablas de (contenido, n) quedan en la caché,
+    así que al repetir el análisis no se recalculan, y las estadísticas del corpus se obtienen
+    de las tablas guardadas sin volver a leer las imágenes.
+
+    Args:
+        patron (str): Directorio o patrón glob de las imágenes
+        n_values: Valores de n
+        procesos (int): Cantidad de procesos (None = todos los núcleos)
+        directorio (str): Directorio de la caché
+        max_bytes (int): Tamaño máximo de la caché en disco
+
+    Returns:
+        tuple: (por_imagen, corpus)
+        - por_imagen: Lista de diccionarios (imagen, n, longitud promedio, tasa)
+        - corpus: Diccionario {n: estadísticas agregadas e histograma combinado}
+    """
+    rutas = listar_imagenes(patron)
+    tareas = [(ruta, [int(n) for n in n_values], directorio) for ruta in rutas]
+
+    por_imagen = []
+    calculadas = 0
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        for resultados, nuevas in pool.map(_procesar_imagen, tareas):
+            por_imagen.extend(resultados)
+            calculadas += nuevas
+
+    # Estadísticas del corpus a partir de las tablas en caché, sin volver a leer las imágenes
+    corpus = {}
+    for n in n_values:
+        n = int(n)
+        filas = [r for r in por_imagen if r['n'] == n]
+        if not filas:
+            continue
+        claves, cuentas = None, None
+        for fila in filas:
+            entrada = leer_cache(directorio, fila['hash'], n)
+            if entrada is None:
+                # Entrada podada o corrupta desde que se calculó: se recalcula desde la imagen
+                print(f"Tabla n={n} de {fila['imagen']} ausente de la caché: se recalcula")
+                _, tablas, nuevas = tablas_imagen(fila['imagen'], [n], directorio)
+                entrada = tablas[n]
+                calculadas += nuevas
+            if claves is None:
+                claves, cuentas = entrada['claves'], entrada['cuentas']
+            else:
+                claves, cuentas = fusionar_histogramas(claves, cuentas, entrada['claves'], entrada['cuentas'])
+
+        corpus[n] = _resumen(n, cuentas, longitudes_huffman(cuentas))
+        corpus[n].update({
+            'imagenes': len(filas),
+            'tasa_promedio': float(np.mean([r['tasa_compresion'] for r in filas])),
+            'claves': claves,
+            'cuentas': cuentas,
+        })
+
+    podar_cache(directorio, max_bytes)
+    print(f"{len(rutas)} imágenes, {calculadas} tablas calculadas, {len(rutas) * len(n_values) - calculadas} desde caché")
+    return por_imagen, corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estadísticas de compresión de un conjunto de imágenes')
+    parser.add_argument('patron', help='Directorio o patrón glob de las imágenes')
+    parser.add_argument('-n', type=int, nargs='+', default=list(range(1, 15)), help='Valores de n')
+    parser.add_argument('-p', '--procesos', type=int, default=None, help='Cantidad de procesos')
+    parser.add_argument('--cache', default=DIRECTORIO_CACHE, help='Directorio de la caché')
+    parser.add_argument('--max-mb', type=float, default=MAX_BYTES_CACHE / 2**20, help='Tamaño máximo de la caché [MB]')
+    args = parser.parse_args()
+
+    _, corpus = analizar_corpus(args.patron, args.n, args.procesos, args.cache, int(args.max_mb * 2**20))
+    print(f"\n{'n':>3} {'imágenes':>9} {'tasa promedio':>14} {'tasa corpus':>12} {'símbolos':>9}")
+    for n, r in corpus.items():
+        print(f"{n:>3} {r['imagenes']:>9} {r['tasa_promedio']:>14.3f} {r['tasa_compresion']:>12.3f} {len(r['claves']):>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+from frecuencias import cargar_imagen, contar_bloques
+from numpy.lib.stride_tricks import sliding_window_view
+import numpy as np
+import os
+
+# Vecinos causales (ya decodificados en orden de barrido): (desplazamiento de fila, de columna)
+VECINOS = {
+    'izq': (0, -1),
+    'arriba': (-1, 0),
+    'arriba_izq': (-1, -1),
+    'arriba_der': (-1, 1),
+    'izq2': (0, -2),
+    'arriba2': (-2, 0),
+}
+
+
+def entropia(cuentas):
+    """
+    Entropía (bits) de un histograma.
+    """
+    p = np.asarray(cuentas, dtype=float)
+    p = p[p > 0] / p.sum()
+    return float(-np.dot(p, np.log2(p)))
+
+
+def tasa(h):
+    """
+    Tasa de compresión (1 bit/píxel sin comprimir) para h bits por píxel; infinita si h es 0
+    (imagen constante o contexto que determina el píxel).
+    """
+    return 1 / h if h > 0 else np.inf
+
+
+def indices_densos(pixeles):
+    """
+    Reemplaza cada nivel de gris por su índice entre los niveles presentes.
+
+    Returns:
+        tuple: (indices uint8 con la misma forma, bits por símbolo)
+    """
+    presentes = np.bincount(pixeles.ravel(), minlength=256) > 0
+    tabla = (np.cumsum(presentes) - 1).astype(np.uint8)
+    niveles = int(presentes.sum())
+    return tabla[pixeles], max(1, int(np.ceil(np.log2(niveles))))
+
+
+def empaquetar_columnas(columnas, bits):
+    """
+    Empaqueta las columnas de una matriz (filas = muestras) en una clave por fila.
+
+    Si entran en 64 bits usa uint64 con bits por columna; si no, bytes de ancho fijo.
+    """
+    filas, ancho = columnas.shape
+    if ancho * bits <= 64:
+        claves = np.zeros(filas, dtype=np.uint64)
+        for j in range(ancho):
+            claves <<= np.uint64(bits)
+            claves |= columnas[:, j]
+        return claves
+    return np.ascontiguousarray(columnas, dtype=np.uint8).view(f'V{ancho}').ravel()
+
+
+def _entropia_claves(claves):
+    return entropia(np.unique(claves, return_counts=True)[1])
+
+
+def entropia_ngramas(flat, n, bits=8):
+    """
+    Entropía (bits) de los n-gramas superpuestos (ventana deslizante de paso 1) en orden de barrido.
+
+    Args:
+        flat: Array 1D de índices de símbolo
+        n: Largo del n-grama
+        bits: Bits por símbolo para empaquetar
+    """
+    if n == 0:
+        return 0.0
+    return _entropia_claves(empaquetar_columnas(sliding_window_view(flat, n), bits))
+
+
+def entropia_contexto_2d(indices, vecinos, bits=8):
+    """
+    Entropía condicional H(X | vecinos) con contextos 2D causales.
+
+    Los píxeles cuyo contexto cae fuera de la imagen se descartan.
+
+    Args:
+        indices: Imagen 2D de índices de símbolo
+        vecinos: Nombres de VECINOS que forman el contexto
+        bits: Bits por símbolo para empaquetar
+    """
+    desplazamientos = [VECINOS[v] for v in vecinos]
+    margen_arriba = max([-df for df, _ in desplazamientos] + [0])
+    margen_izq = max([-dc for _, dc in desplazamientos] + [0])
+    margen_der = max([dc for _, dc in desplazamientos] + [0])
+    alto, ancho = indices.shape
+    filas = slice(margen_arriba, alto)
+    cols = slice(margen_izq, ancho - margen_der)
+
+    # Una columna por vecino (vista desplazada de la imagen) y la última para el píxel actual
+    columnas = [indices[margen_arriba + df:alto + df, margen_izq + dc:ancho - margen_der + dc].ravel()
+                for df, dc in desplazamientos]
+    columnas.append(indices[filas, cols].ravel())
+    conjunta = np.stack(columnas, axis=1)
+
+    h_conjunta = _entropia_claves(empaquetar_columnas(conjunta, bits))
+    h_contexto = _entropia_claves(empaquetar_columnas(conjunta[:, :-1], bits)) if desplazamientos else 0.0
+    return h_conjunta - h_contexto
+
+
+def analizar_entropias(img, n_values, vecinos_2d=('izq', 'arriba', 'arriba_izq', 'arriba_der')):
+    """
+    Estima las tasas alcanzables por distintos modelos de la fuente, sin construir árboles de Huffman.
+
+    Para cada n calcula, en bits por píxel:
+    - bloques: H(bloques no superpuestos) / n, el límite del Huffman por bloques de main.py
+    - ngramas: H(n-gramas superpuestos) / n
+    - condicional: H(X_n | X_{n-1}, ..., X_1) = H(n-grama) - H((n-1)-grama), contexto de n-1 píxeles previos
+    Y una única vez la entropía condicional con el contexto 2D de vecinos_2d.
+
+    Args:
+        img: Imagen 2D uint8
+        n_values: Valores de n
+        vecinos_2d: Vecinos causales del contexto 2D (ver VECINOS)
+
+    Returns:
+        list: Un diccionario por n; 'tasa_*' = 1 / bits por píxel (1 bit/píxel sin comprimir,
+        igual que tasa_compresion), np.inf si la entropía es 0
+    """
+    img = np.asarray(img, dtype=np.uint8)     # Niveles de gris 0..255
+    indices, bits = indices_densos(img)
+    flat = indices.ravel()
+    h_contexto_2d = entropia_contexto_2d(indices, vecinos_2d, bits)
+
+    # H(n-grama) por n, para reutilizar H((n-1)-grama) cuando los n son consecutivos
+    h_ngramas = {}
+    def h(m):
+        if m not in h_ngramas:
+            h_ngramas[m] = entropia_ngramas(flat, m, bits)
+        return h_ngramas[m]
+
+    resultados = []
+    for n in n_values:
+        n = int(n)
+        h_ngrama = h(n)
+        h_condicional = h_ngrama - h(n - 1)
+        h_bloques = entropia(contar_bloques(img.ravel(), n)[1]) / n
+
+        resultados.append({
+            'n': n,
+            'h_bloques': h_bloques,
+            'h_ngramas': h_ngrama / n,
+            'h_condicional': h_condicional,
+            'h_contexto_2d': h_contexto_2d,
+            'tasa_bloques': tasa(h_bloques),
+            'tasa_ngramas': tasa(h_ngrama / n),
+            'tasa_condicional': tasa(h_condicional),
+            'tasa_contexto_2d': tasa(h_contexto_2d),
+        })
+    return resultados
+
+
+def main():
+    ruta_imagen = os.path.join(os.path.dirname(__file__), 'logoFI.tif')
+    for r in analizar_entropias(cargar_imagen(ruta_imagen), range(1, 15)):
+        print(f"n={r['n']:2d}  H bloques/n={r['h_bloques']:.4f}  H n-gramas/n={r['h_ngramas']:.4f}  "
+              f"H(X|n-1 previos)={r['h_condicional']:.4f}  H(X|contexto 2D)={r['h_contexto_2d']:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -2,33 +2,261 @@ import numpy as np
 from collections import Counter
 from PIL import Image
 
+# Bloques de hasta 8 bytes entran en una clave uint64
+MAX_N_ENTERO = 8
 
-def frecuencias_imagen(image_path, n):
+
+def empaquetar_bloques(flat, n):
     """
-    Calcula las frecuencias de bloques de tamaño n en la imagen.
-    
+    Empaqueta cada bloque de n símbolos consecutivos en una única clave.
+
     Args:
-        image_path: Ruta de la imagen
+        flat: Array 1D uint8 con los píxeles en orden de barrido
+        n: Tamaño del bloque
+
+    Returns:
+        np.ndarray: Una clave por bloque (uint64 si n <= 8, bytes de ancho fijo 'V{n}' si no)
+    """
+    flat = np.ascontiguousarray(flat, dtype=np.uint8)
+    # Vista (N/n, n) sin copiar, descartando el resto
+    bloques = flat[:len(flat) - (len(flat) % n)].reshape(-1, n)
+
+    if n <= MAX_N_ENTERO:
+        # Primer símbolo en el byte más significativo: el orden de las claves es el de las tuplas
+        claves = np.zeros(len(bloques), dtype=np.uint64)
+        for j in range(n):
+            claves <<= np.uint64(8)
+            claves |= bloques[:, j]
+        return claves
+
+    return bloques.view(f'V{n}').ravel()
+
+
+def desempaquetar_bloques(claves, n):
+    """
+    Inversa de empaquetar_bloques.
+
+    Args:
+        claves: Array de claves empaquetadas
+        n: Tamaño del bloque
+
+    Returns:
+        np.ndarray: Matriz uint8 (len(claves), n) con los símbolos de cada bloque
+    """
+    if n <= MAX_N_ENTERO:
+        claves = np.asarray(claves, dtype=np.uint64)
+        desplazamientos = np.arange(n - 1, -1, -1, dtype=np.uint64) * np.uint64(8)
+        return ((claves[:, None] >> desplazamientos) & np.uint64(0xFF)).astype(np.uint8)
+    return np.frombuffer(np.ascontiguousarray(claves).tobytes(), dtype=np.uint8).reshape(-1, n)
+
+
+def contar_bloques(flat, n):
+    """
+    Cuenta los bloques de tamaño n de un array de píxeles sin crear objetos Python por bloque.
+
+    Args:
+        flat: Array 1D uint8 con los píxeles en orden de barrido
+        n: Tamaño del bloque
+
+    Returns:
+        tuple: (claves, cuentas)
+        - claves: Claves empaquetadas únicas, ordenadas
+        - cuentas: Cantidad de apariciones de cada clave
+    """
+    claves = empaquetar_bloques(flat, n)
+    if n == 1:
+        # Alfabeto de 256 símbolos: histograma directo
+        cuentas = np.bincount(claves.astype(np.intp), minlength=256)
+        presentes = np.flatnonzero(cuentas)
+        return presentes.astype(np.uint64), cuentas[presentes]
+    return np.unique(claves, return_counts=True)
+
+
+def claves_python(claves, n):
+    """
+    Convierte claves empaquetadas a objetos Python compactos: int si n <= 8, bytes de ancho fijo si no.
+    """
+    if n <= MAX_N_ENTERO:
+        return np.asarray(claves, dtype=np.uint64).tolist()
+    return [clave.tobytes() for clave in claves]
+
+
+def a_diccionario(claves, cuentas, n, empaquetado=False):
+    """
+    Convierte un histograma empaquetado al Counter que consume construir_arbol_huffman.
+
+    Args:
+        claves: Claves empaquetadas
+        cuentas: Frecuencia de cada clave
         n: Tamaño del bloque
-    
+        empaquetado: Si es True las claves quedan como int/bytes en lugar de tuplas
+
+    Returns:
+        Counter: Diccionario {símbolo: frecuencia}
+    """
+    if empaquetado:
+        simbolos = claves_python(claves, n)
+    else:
+        simbolos = map(tuple, desempaquetar_bloques(claves, n).tolist())
+    return Counter(dict(zip(simbolos, cuentas.tolist())))
+
+
+def frecuencias_bloques(flat, n):
+    """
+    Calcula las frecuencias de bloques de tamaño n de un array de píxeles.
+
+    Args:
+        flat: Array 1D uint8 con los píxeles en orden de barrido
+        n: Tamaño del bloque
+
     Returns:
         Counter: Diccionario con las frecuencias de cada bloque de tamaño n
     """
-    # Convertimos a imagen a array en escala de grises
-    img = np.array(Image.open(image_path).convert('L'))
-    # Convertimos (2D) a (1D)
-    flat = img.flatten()
-    
-    # Aseguramos que la longitud sea múltiplo de n
+    claves, cuentas = contar_bloques(flat, n)
+    return a_diccionario(claves, cuentas, n)
+
+
+def frecuencias_bloques_counter(flat, n):
+    """
+    Implementación de referencia con tuplas y Counter (usada para comparar resultados y tiempos).
+    """
     flat = flat[:len(flat) - (len(flat) % n)]
-    
-    # Bloques de exactamente n símbolos consecutivos
     blocks = [tuple(flat[i:i+n]) for i in range(0, len(flat), n)]
-    
-    # Frecuencias x bloque
-    freq = Counter(blocks)
-    return freq
+    return Counter(blocks)
+
+
+def fusionar_histogramas(claves_a, cuentas_a, claves_b, cuentas_b):
+    """
+    Suma dos histogramas empaquetados.
 
+    Returns:
+        tuple: (claves, cuentas) con las claves únicas ordenadas
+    """
+    claves, inversa = np.unique(np.concatenate([claves_a, claves_b]), return_inverse=True)
+    cuentas = np.zeros(len(claves), dtype=np.int64)
+    np.add.at(cuentas, inversa.ravel(), np.concatenate([cuentas_a, cuentas_b]))
+    return claves, cuentas
+
+
+def cargar_imagen(image_path):
+    """
+    Carga la imagen en escala de grises como array 2D uint8.
+    """
+    return np.array(Image.open(image_path).convert('L'))
+
+
+def forma_imagen(image_path, forma=None):
+    """
+    Devuelve (alto, ancho) de la imagen sin decodificar los píxeles.
+
+    Args:
+        image_path: Ruta de la imagen
+        forma: (alto, ancho) para archivos crudos de 8 bits sin cabecera (opcional)
+    """
+    if forma is not None:
+        return tuple(forma)
+    if image_path.endswith('.npy'):
+        return np.load(image_path, mmap_mode='r').shape
+    ancho, alto = Image.open(image_path).size
+    return alto, ancho
+
+
+def iterar_franjas(image_path, filas_por_franja=256, forma=None, offset=0):
+    """
+    Recorre la imagen en franjas de filas completas, en orden de barrido.
+
+    Los archivos .npy y los crudos (indicando forma) se leen con np.memmap, así que sólo la franja
+    actual está en memoria. Para los formatos de PIL el decodificador mantiene el cuadro en su
+    propio buffer de 8 bits, pero no se crean copias NumPy de la imagen completa.
+
+    Args:
+        image_path: Ruta de la imagen
+        filas_por_franja: Cantidad de filas por franja
+        forma: (alto, ancho) para archivos crudos de 8 bits sin cabecera (opcional)
+        offset: Bytes a saltear al comienzo del archivo crudo
+
+    Yields:
+        np.ndarray: Franja 2D uint8 (filas_por_franja x ancho, la última puede ser menor)
+    """
+    if forma is not None or image_path.endswith('.npy'):
+        if forma is not None:
+            img = np.memmap(image_path, dtype=np.uint8, mode='r', offset=offset, shape=tuple(forma))
+        else:
+            img = np.load(image_path, mmap_mode='r')
+        for fila in range(0, img.shape[0], filas_por_franja):
+            yield np.array(img[fila:fila + filas_por_franja], dtype=np.uint8)
+        return
+
+    with Image.open(image_path) as img:
+        ancho, alto = img.size
+        for fila in range(0, alto, filas_por_franja):
+            franja = img.crop((0, fila, ancho, min(fila + filas_por_franja, alto)))
+            yield np.asarray(franja.convert('L'))
+
+
+def contar_bloques_franjas(franjas, n):
+    """
+    Cuenta los bloques de tamaño n de una secuencia de franjas, con la misma semántica que
+    contar_bloques sobre la imagen aplanada completa.
+
+    El bloque que queda incompleto al final de una franja se arrastra a la siguiente, y los
+    histogramas parciales se fusionan a medida que se procesan las franjas.
 
+    Args:
+        franjas: Iterable de arrays uint8 en orden de barrido
+        n: Tamaño del bloque
+
+    Returns:
+        tuple: (claves, cuentas)
+    """
+    claves = empaquetar_bloques(np.zeros(0, dtype=np.uint8), n)
+    cuentas = np.zeros(0, dtype=np.int64)
+    pendiente = np.zeros(0, dtype=np.uint8)
+
+    for franja in franjas:
+        flat = np.concatenate([pendiente, franja.ravel()])
+        completos = len(flat) - len(flat) % n
+        claves_franja, cuentas_franja = contar_bloques(flat[:completos], n)
+        claves, cuentas = fusionar_histogramas(claves, cuentas, claves_franja, cuentas_franja)
+        pendiente = flat[completos:].copy()
+
+    return claves, cuentas
 
 
+def contar_bloques_imagen(image_path, n, filas_por_franja=None, forma=None):
+    """
+    Cuenta los bloques de tamaño n de la imagen y devuelve el histograma empaquetado.
+
+    Args:
+        image_path: Ruta de la imagen
+        n: Tamaño del bloque
+        filas_por_franja: Procesa la imagen por franjas de esa cantidad de filas (opcional; los .npy
+            y crudos se leen siempre por franjas con np.memmap)
+        forma: (alto, ancho) para archivos crudos de 8 bits sin cabecera (opcional)
+
+    Returns:
+        tuple: (claves, cuentas)
+    """
+    if filas_por_franja is not None or forma is not None or image_path.endswith('.npy'):
+        return contar_bloques_franjas(iterar_franjas(image_path, filas_por_franja or 256, forma), n)
+    return contar_bloques(cargar_imagen(image_path).ravel(), n)
+
+
+def frecuencias_imagen(image_path, n, filas_por_franja=None, forma=None, empaquetado=False):
+    """
+    Calcula las frecuencias de bloques de tamaño n en la imagen.
+
+    Args:
+        image_path: Ruta de la imagen
+        n: Tamaño del bloque
+        filas_por_franja: Si se indica, la imagen se procesa por franjas de esa cantidad de filas
+            y la memoria queda acotada por la franja en lugar de por la imagen (opcional)
+        forma: (alto, ancho) para archivos crudos de 8 bits sin cabecera (opcional)
+        empaquetado: Si es True cada bloque se representa con un int (n <= 8) o bytes (n > 8)
+            en lugar de una tupla
+
+    Returns:
+        Counter: Diccionario con las frecuencias de cada bloque de tamaño n
+    """
+    claves, cuentas = contar_bloques_imagen(image_path, n, filas_por_franja, forma)
+    return a_diccionario(claves, cuentas, n, empaquetado)
@@ -1,88 +1,211 @@
+from frecuencias import desempaquetar_bloques
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 
-def estadisticas_compresion(resultados):
+# Sin ventanas (backend Agg, sin plt.show) si está definida la variable de entorno o tras usar_headless()
+MOSTRAR = not os.environ.get('COMPRESION_HEADLESS')
+if not MOSTRAR:
+    plt.switch_backend('Agg')
+
+TOP_K = 40  # Alfabetos más grandes se resumen en las K barras más probables + curvas rango/CDF
+
+
+def usar_headless():
     """
-    Genera gráficos de las estadísticas de compresión.
-    
-    Args:
-        resultados: Lista de diccionarios con las estadísticas de compresión
+    Activa el modo sin ventanas: backend Agg y las figuras se guardan y cierran sin mostrarse.
+    """
+    global MOSTRAR
+    MOSTRAR = False
+    plt.switch_backend('Agg')
+
+def _finalizar(fig, output_file, dpi=300):
     """
+    Guarda la figura y la muestra, o la cierra en modo headless.
+    """
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+    if MOSTRAR:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def _graficos_dir():
     # Crear directorio de gráficos si no existe
     graficos_dir = os.path.join(os.path.dirname(__file__), 'graficos')
     os.makedirs(graficos_dir, exist_ok=True)
+    return graficos_dir
+
+def _probabilidades(codigos_info):
+    """
+    Probabilidades de codigos_info (lista de diccionarios o columnar) como array.
+    """
+    if isinstance(codigos_info, dict):
+        return np.asarray(codigos_info['probabilidad'], dtype=float)
+    return np.fromiter((codigo['probabilidad'] for codigo in codigos_info), dtype=float, count=len(codigos_info))
+
+def _etiquetas(codigos_info, indices, n):
+    """
+    Etiquetas (tuplas) sólo de los símbolos en indices; los empaquetados se desempaquetan aquí.
+    """
+    if isinstance(codigos_info, dict):
+        return [tuple(s) for s in desempaquetar_bloques(codigos_info['simbolo'][indices], n).tolist()]
+    return [codigos_info[i]['simbolo'] for i in indices]
+
+def estadisticas_compresion(resultados, entropias=None):
+    """
+    Genera gráficos de las estadísticas de compresión.
+
+    Args:
+        resultados: Lista de diccionarios con las estadísticas de compresión
+        entropias: Lista de diccionarios de entropia.analizar_entropias para superponer
+            los límites de cada modelo de fuente (opcional)
+    """
+    graficos_dir = _graficos_dir()
 
     # Extraer datos
     n_values = [r['n'] for r in resultados]
     longitudes = [r['longitud_promedio'] for r in resultados]
     tasas = [r['tasa_compresion'] for r in resultados]
-    
+
     # Crear figura con dos subplots
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-    
+
     # Gráfico 1: Longitud promedio/n vs n
     ax1.plot(n_values, np.array(longitudes)/n_values, 'bo-', label='Longitud promedio/n')
+    if entropias:
+        n_h = [e['n'] for e in entropias]
+        ax1.plot(n_h, [e['h_bloques'] for e in entropias], 'c--', label='H(bloques)/n')
+        ax1.plot(n_h, [e['h_ngramas'] for e in entropias], 'g--', label='H(n-gramas superpuestos)/n')
+        ax1.plot(n_h, [e['h_condicional'] for e in entropias], 'm--', label='H(X | n-1 previos)')
+        ax1.plot(n_h, [e['h_contexto_2d'] for e in entropias], 'k:', label='H(X | contexto 2D)')
     ax1.set_xlabel('n (tamaño del bloque)')
     ax1.set_ylabel('Longitud promedio/n (bits/símbolo)')
     ax1.set_title('Longitud promedio normalizada vs extension de fuente')
     ax1.grid(True)
     ax1.legend()
-    
+
     # Gráfico 2: Tasa de compresión vs n
     ax2.plot(n_values, tasas, 'ro-', label='Tasa de compresión')
+    if entropias:
+        ax2.plot(n_h, [e['tasa_condicional'] for e in entropias], 'm--', label='Tasa límite (n-1 previos)')
+        ax2.plot(n_h, [e['tasa_contexto_2d'] for e in entropias], 'k:', label='Tasa límite (contexto 2D)')
     ax2.set_xlabel('n (tamaño del bloque)')
     ax2.set_ylabel('Tasa de compresión')
     ax2.set_title('Tasa de compresión vs extension de fuente')
     ax2.grid(True)
     ax2.legend()
-    
+
     # Ajustar layout y guardar antes de mostrar
-    plt.tight_layout()
-    output_file = os.path.join(graficos_dir, 'Longitudes_Tasas.png')
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.show()
+    _finalizar(fig, os.path.join(graficos_dir, 'Longitudes_Tasas.png'))
 
 
-def distribuciones_probabilidad(codigos_info, n):
+def distribuciones_probabilidad(codigos_info, n, top_k=TOP_K):
     """
     Genera gráficos de las distribuciones de probabilidad de los símbolos.
 
+    Con alfabetos de más de top_k símbolos se dibujan sólo las top_k barras más probables,
+    junto a la curva rango/probabilidad (tipo Zipf) y la probabilidad acumulada de todo el alfabeto.
+
     Args:
-        codigos_info: Lista de diccionarios con información de los símbolos
+        codigos_info: Lista de diccionarios con información de los símbolos, o diccionario
+            columnar de arrays (símbolos empaquetados) de estadisticas_empaquetadas
         n: Tamaño del bloque
+        top_k: Cantidad máxima de barras
     """
-    # Crear directorio de gráficos si no existe
-    graficos_dir = os.path.join(os.path.dirname(__file__), 'graficos')
-    os.makedirs(graficos_dir, exist_ok=True)
+    graficos_dir = _graficos_dir()
+    output_file = os.path.join(graficos_dir, f'distribucion_probabilidades_n{n}.png')
 
-    # Extraer símbolos y probabilidades
-    simbolos = [codigo['simbolo'] for codigo in codigos_info]
-    probabilidades = [codigo['probabilidad'] for codigo in codigos_info]
+    # Extraer probabilidades (las etiquetas se generan sólo para las barras dibujadas)
+    probabilidades = _probabilidades(codigos_info)
     equiprob = 1/len(probabilidades)
-    
-    # Crear figura
-    plt.figure(figsize=(15, 5))
-    
-    # Gráfico de barras
-    plt.bar(range(len(simbolos)), probabilidades, alpha=0.7, color='blue')
-    plt.axhline(equiprob, color='red', linestyle='--', 
-                label=f'Equiprobabilidad ({equiprob:.4f})')
-    
-    # Configurar ejes
-    plt.title(f'Probabilidad de cada símbolo n={n}')
-    plt.xlabel('Símbolo')
-    plt.ylabel('Probabilidad')
-    plt.grid(True, alpha=0.3)
-    plt.legend()
-    
-    # Configurar etiquetas del eje x
-    plt.xticks(range(len(simbolos)), simbolos, rotation=45, ha='right')
-    
-    # Ajustar layout y guardar antes de mostrar
-    plt.tight_layout()
-    output_file = os.path.join(graficos_dir, f'distribucion_probabilidades_n{n}.png')
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    plt.show()
-    
-    
+
+    if len(probabilidades) <= top_k:
+        simbolos = _etiquetas(codigos_info, range(len(probabilidades)), n)
+
+        # Crear figura
+        fig, ax = plt.subplots(figsize=(15, 5))
+
+        # Gráfico de barras
+        ax.bar(range(len(simbolos)), probabilidades, alpha=0.7, color='blue')
+        ax.axhline(equiprob, color='red', linestyle='--',
+                   label=f'Equiprobabilidad ({equiprob:.4f})')
+
+        # Configurar ejes
+        ax.set_title(f'Probabilidad de cada símbolo n={n}')
+        ax.set_xlabel('Símbolo')
+        ax.set_ylabel('Probabilidad')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+        # Configurar etiquetas del eje x
+        ax.set_xticks(range(len(simbolos)))
+        ax.set_xticklabels(simbolos, rotation=45, ha='right')
+
+        # Ajustar layout y guardar antes de mostrar
+        _finalizar(fig, output_file)
+        return
+
+    # Alfabeto grande: top-K barras + rango/probabilidad + CDF
+    top = np.argpartition(probabilidades, -top_k)[-top_k:]
+    top = top[np.argsort(probabilidades[top])[::-1]]
+    ordenadas = np.sort(probabilidades)[::-1]
+    rangos = np.arange(1, len(ordenadas) + 1)
+
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(18, 5), gridspec_kw={'width_ratios': [2, 1, 1]})
+
+    ax1.bar(range(top_k), probabilidades[top], alpha=0.7, color='blue')
+    ax1.axhline(equiprob, color='red', linestyle='--', label=f'Equiprobabilidad ({equiprob:.2e})')
+    ax1.set_title(f'{top_k} símbolos más probables de {len(probabilidades)} (n={n})')
+    ax1.set_xlabel('Símbolo')
+    ax1.set_ylabel('Probabilidad')
+    ax1.set_xticks(range(top_k))
+    ax1.set_xticklabels(_etiquetas(codigos_info, top, n), rotation=45, ha='right', fontsize=6)
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    ax2.loglog(rangos, ordenadas, 'b-')
+    ax2.set_title('Rango vs probabilidad')
+    ax2.set_xlabel('Rango')
+    ax2.set_ylabel('Probabilidad')
+    ax2.grid(True, which='both', alpha=0.3)
+
+    ax3.semilogx(rangos, np.cumsum(ordenadas), 'g-')
+    ax3.set_title('Probabilidad acumulada')
+    ax3.set_xlabel('Rango')
+    ax3.set_ylabel('CDF')
+    ax3.grid(True, which='both', alpha=0.3)
+
+    _finalizar(fig, output_file)
+
+
+def distribuciones_barrido(resultados):
+    """
+    Dibuja en una sola figura las curvas rango/probabilidad y las CDF de todos los n de un barrido.
+
+    Args:
+        resultados: Lista de diccionarios con las estadísticas de compresión
+    """
+    graficos_dir = _graficos_dir()
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    colores = plt.cm.viridis(np.linspace(0, 1, len(resultados)))
+
+    for r, color in zip(resultados, colores):
+        ordenadas = np.sort(_probabilidades(r['codigos_info']))[::-1]
+        rangos = np.arange(1, len(ordenadas) + 1)
+        ax1.loglog(rangos, ordenadas, '-', color=color, label=f"n={r['n']}")
+        ax2.semilogx(rangos, np.cumsum(ordenadas), '-', color=color, label=f"n={r['n']}")
+
+    ax1.set_title('Rango vs probabilidad')
+    ax1.set_xlabel('Rango')
+    ax1.set_ylabel('Probabilidad')
+    ax1.grid(True, which='both', alpha=0.3)
+    ax1.legend(fontsize=7, ncol=2)
+
+    ax2.set_title('Probabilidad acumulada')
+    ax2.set_xlabel('Rango')
+    ax2.set_ylabel('CDF')
+    ax2.grid(True, which='both', alpha=0.3)
+    ax2.legend(fontsize=7, ncol=2)
+
+    _finalizar(fig, os.path.join(graficos_dir, 'distribuciones_barrido.png'))
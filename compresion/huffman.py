@@ -1,5 +1,5 @@
 import heapq
-from collections import defaultdict, Counter
+import numpy as np
 
 class Nodo:
     def __init__(self, simbolo, frecuencia):
@@ -63,3 +63,158 @@ def obtener_codigos(nodo, codigo_actual="", codigos=None):
     return codigos
 
 
+def longitudes_codigo(raiz):
+    """
+    Obtiene la longitud del código de cada símbolo recorriendo el árbol sin recursión.
+    
+    Args:
+        raiz: Raíz del árbol de Huffman
+    
+    Returns:
+        dict: Diccionario {simbolo: longitud}
+    """
+    # Un único símbolo necesita igualmente 1 bit para poder escribirse
+    if raiz.simbolo is not None:
+        return {raiz.simbolo: 1}
+
+    longitudes = {}
+    pila = [(raiz, 0)]
+    while pila:
+        nodo, profundidad = pila.pop()
+        if nodo.simbolo is not None:
+            longitudes[nodo.simbolo] = profundidad
+            continue
+        pila.append((nodo.izq, profundidad + 1))
+        pila.append((nodo.der, profundidad + 1))
+    return longitudes
+
+def _longitudes_dos_colas(pesos):
+    """
+    Longitudes de Huffman para pesos ordenados de menor a mayor (fusión lineal con dos colas).
+    Las hojas son los nodos 0..m-1 y los nodos internos m..2m-2, en orden de creación.
+    """
+    m = len(pesos)
+    hojas = pesos.tolist()
+    internos = [0] * (m - 1)
+    padre = [0] * (2 * m - 1)
+
+    i = j = 0
+    for t in range(m - 1):
+        # Tomamos los dos menores entre la cola de hojas y la de internos (en empate, la hoja)
+        suma = 0
+        for _ in range(2):
+            if i < m and (j >= t or hojas[i] <= internos[j]):
+                suma += hojas[i]
+                padre[i] = m + t
+                i += 1
+            else:
+                suma += internos[j]
+                padre[m + j] = m + t
+                j += 1
+        internos[t] = suma
+
+    # Cada padre se crea después que sus hijos: recorremos de la raíz hacia las hojas
+    profundidad = [0] * (2 * m - 1)
+    for nodo in range(2 * m - 3, -1, -1):
+        profundidad[nodo] = profundidad[padre[nodo]] + 1
+    return np.array(profundidad[:m], dtype=np.int64)
+
+def _longitudes_package_merge(pesos, longitud_maxima):
+    """
+    Longitudes óptimas limitadas a longitud_maxima (package-merge) para pesos ordenados de menor a mayor.
+    """
+    m = len(pesos)
+    pesos = np.asarray(pesos, dtype=np.float64)
+
+    # Lista del nivel más profundo: sólo hojas. Cada nivel superior fusiona las hojas con los
+    # paquetes (pares consecutivos) del nivel inferior; en empate van primero las hojas.
+    lista = pesos
+    es_hoja = [np.ones(m, dtype=bool)]
+    for _ in range(longitud_maxima - 1):
+        paquetes = lista[0:len(lista) - 1:2] + lista[1::2]
+        combinada = np.concatenate([pesos, paquetes])
+        orden = np.argsort(combinada, kind='stable')
+        lista = combinada[orden]
+        es_hoja.append(orden < m)
+
+    # Se eligen los 2m-2 primeros elementos del último nivel; cada hoja elegida en un nivel
+    # suma 1 a su longitud y cada paquete elegido arrastra 2 elementos del nivel inferior
+    longitudes = np.zeros(m, dtype=np.int64)
+    elegidos = 2 * m - 2
+    for hojas_nivel in reversed(es_hoja):
+        hojas_elegidas = int(np.count_nonzero(hojas_nivel[:elegidos]))
+        longitudes[:hojas_elegidas] += 1
+        elegidos = 2 * (elegidos - hojas_elegidas)
+    return longitudes
+
+def longitudes_huffman(frecuencias, longitud_maxima=None):
+    """
+    Calcula las longitudes de los códigos de Huffman sin construir nodos.
+    
+    Args:
+        frecuencias: Array con la frecuencia de cada símbolo
+        longitud_maxima: Longitud máxima permitida para los códigos (opcional)
+    
+    Returns:
+        np.ndarray: Longitud del código de cada símbolo (mismo orden que frecuencias)
+    """
+    frecuencias = np.asarray(frecuencias)
+    m = len(frecuencias)
+    if m == 1:
+        return np.ones(1, dtype=np.int64)
+    if longitud_maxima is not None and (1 << longitud_maxima) < m:
+        raise ValueError(f"{m} símbolos no entran en códigos de {longitud_maxima} bits")
+
+    # Ordenamos una sola vez; el resto trabaja sobre arreglos paralelos
+    orden = np.argsort(frecuencias, kind='stable')
+    pesos = frecuencias[orden]
+    longitudes_ordenadas = _longitudes_dos_colas(pesos)
+    if longitud_maxima is not None and longitudes_ordenadas.max() > longitud_maxima:
+        longitudes_ordenadas = _longitudes_package_merge(pesos, longitud_maxima)
+
+    longitudes = np.empty(m, dtype=np.int64)
+    longitudes[orden] = longitudes_ordenadas
+    return longitudes
+
+def codigos_canonicos_arreglo(longitudes):
+    """
+    Asigna códigos canónicos a partir de las longitudes de cada símbolo (indexadas por símbolo).
+    Los símbolos se ordenan por (longitud, símbolo) y reciben códigos consecutivos.
+    
+    Args:
+        longitudes: Array con la longitud del código de cada símbolo (máximo 64)
+    
+    Returns:
+        tuple: (orden, codigos)
+        - orden: Índices de los símbolos en orden canónico (longitud, símbolo)
+        - codigos: Código entero de cada símbolo (uint64, indexado por símbolo)
+    """
+    longitudes = np.asarray(longitudes, dtype=np.int64)
+    orden = np.lexsort((np.arange(len(longitudes)), longitudes))
+    l_ordenadas = longitudes[orden]
+    l_max = int(l_ordenadas[-1])
+
+    # El código de cada símbolo es la suma de Kraft de los anteriores, escalada a su longitud
+    aportes = np.left_shift(np.uint64(1), (l_max - l_ordenadas).astype(np.uint64))
+    kraft = np.concatenate([np.zeros(1, dtype=np.uint64), np.cumsum(aportes[:-1], dtype=np.uint64)])
+    codigos = np.empty(len(longitudes), dtype=np.uint64)
+    codigos[orden] = kraft >> (l_max - l_ordenadas).astype(np.uint64)
+    return orden, codigos
+
+def codigos_huffman(frecuencias, longitud_maxima=None):
+    """
+    Obtiene los códigos Huffman (canónicos) con el constructor de arreglos.
+    Devuelve el mismo tipo de diccionario que obtener_codigos.
+    
+    Args:
+        frecuencias: Diccionario con las frecuencias de cada símbolo
+        longitud_maxima: Longitud máxima permitida para los códigos (opcional)
+    
+    Returns:
+        dict: Diccionario con los códigos Huffman para cada símbolo
+    """
+    simbolos = list(frecuencias.keys())
+    longitudes = longitudes_huffman(np.fromiter(frecuencias.values(), dtype=np.int64, count=len(simbolos)),
+                                    longitud_maxima)
+    orden, codigos = codigos_canonicos_arreglo(longitudes)
+    return {simbolos[i]: format(int(codigos[i]), f'0{longitudes[i]}b') for i in orden.tolist()}
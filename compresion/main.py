@@ -1,32 +1,38 @@
-from frecuencias import frecuencias_imagen
-from huffman import construir_arbol_huffman, obtener_codigos
-from helpers import estadisticas_compresion, distribuciones_probabilidad
+from frecuencias import frecuencias_imagen, frecuencias_bloques, forma_imagen, cargar_imagen, contar_bloques, contar_bloques_imagen
+from huffman import construir_arbol_huffman, obtener_codigos, codigos_huffman, longitudes_codigo, longitudes_huffman, codigos_canonicos_arreglo
+from helpers import estadisticas_compresion, distribuciones_probabilidad, distribuciones_barrido, usar_headless
+from codec import reporte_codec
+from entropia import analizar_entropias
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import numpy as np
-from PIL import Image
 import os
 
-def calcular_estadisticas_compresion(n, ruta_imagen):
+def estadisticas_desde_frecuencias(n, frecuencias, shape, metodo='arbol', longitud_maxima=None):
     """
-    Calcula las estadísticas de compresión para un valor de n dado.
-    
+    Calcula las estadísticas de compresión a partir de las frecuencias de los bloques.
+
     Args:
         n (int): Tamaño del bloque
-        ruta_imagen (str): Ruta de la imagen a comprimir
-    
+        frecuencias: Diccionario con las frecuencias de cada bloque de tamaño n
+        shape (tuple): (alto, ancho) de la imagen
+        metodo (str): 'arbol' (nodos y recorrido del árbol) o 'arreglos' (longitudes sobre arreglos NumPy)
+        longitud_maxima (int): Longitud máxima de los códigos, sólo para metodo='arreglos' (opcional)
+
     Returns:
         dict: Diccionario con las estadísticas de compresión
     """
-    # Datos de imagen original 
-    original_img = np.array(Image.open(ruta_imagen).convert('L'))
-    SHAPE = original_img.shape
-    LONGITUD = original_img.size
+    SHAPE = tuple(shape)
+    LONGITUD = SHAPE[0] * SHAPE[1]
     SIMBOLOS = LONGITUD // n
     LONGITUD_PROMEDIO_SC = 1  # Sin comprimir
 
-    # Cálculo de frecuencias y armado de árbol de Huffman
-    frecuencias = frecuencias_imagen(ruta_imagen, n)
-    arbol = construir_arbol_huffman(frecuencias)
-    codigos = obtener_codigos(arbol)
+    # Armado de árbol de Huffman
+    if metodo == 'arreglos':
+        codigos = codigos_huffman(frecuencias, longitud_maxima)
+    else:
+        arbol = construir_arbol_huffman(frecuencias)
+        codigos = obtener_codigos(arbol)
 
     # Información de los símbolos
     codigos_info = []
@@ -35,14 +41,70 @@ def calcular_estadisticas_compresion(n, ruta_imagen):
             'simbolo': simbolo,
             'codigo': codigo,
             'probabilidad': frecuencias[simbolo] / SIMBOLOS
-        }) 
+        })
 
     # Verificación de la suma de probabilidades
     assert np.allclose(sum(codigo['probabilidad'] for codigo in codigos_info), 1)
-    
+
     # Cálculo de estadísticas
     LONGITUD_PROMEDIO_C = sum((codigo['probabilidad']) * len(codigo['codigo']) for codigo in codigos_info)
-    TASA_COMPRESION = 1/(LONGITUD_PROMEDIO_C / n)  # n símbolos por bloque  
+    TASA_COMPRESION = 1/(LONGITUD_PROMEDIO_C / n)  # n símbolos por bloque
+
+    return {
+        'n': n,
+        'longitud_promedio': LONGITUD_PROMEDIO_C,
+        'tasa_compresion': TASA_COMPRESION,
+        'codigos_info': codigos_info,
+        'shape': SHAPE,
+        'longitud': LONGITUD,
+        'simbolos': SIMBOLOS,
+    }
+
+def estadisticas_empaquetadas(n, claves, cuentas, shape, metodo='arbol', longitud_maxima=None):
+    """
+    Calcula las estadísticas de compresión a partir de un histograma de claves empaquetadas.
+
+    A diferencia de estadisticas_desde_frecuencias, 'codigos_info' es columnar: un diccionario de
+    arrays alineados (en orden canónico) en lugar de una lista de diccionarios por símbolo.
+
+    Args:
+        n (int): Tamaño del bloque
+        claves: Claves empaquetadas de los bloques (uint64 si n <= 8, bytes de ancho fijo si no)
+        cuentas: Frecuencia de cada clave
+        shape (tuple): (alto, ancho) de la imagen
+        metodo (str): 'arbol' (nodos y recorrido del árbol) o 'arreglos' (longitudes sobre arreglos NumPy)
+        longitud_maxima (int): Longitud máxima de los códigos, sólo para metodo='arreglos' (opcional)
+
+    Returns:
+        dict: Diccionario con las estadísticas de compresión
+    """
+    SHAPE = tuple(shape)
+    LONGITUD = SHAPE[0] * SHAPE[1]
+    SIMBOLOS = LONGITUD // n
+
+    # Longitudes de código: el árbol usa como símbolo el índice entero de cada clave
+    if metodo == 'arreglos':
+        longitudes = longitudes_huffman(cuentas, longitud_maxima)
+    else:
+        por_simbolo = longitudes_codigo(construir_arbol_huffman(dict(enumerate(cuentas.tolist()))))
+        longitudes = np.fromiter((por_simbolo[i] for i in range(len(cuentas))), dtype=np.int64, count=len(cuentas))
+    orden, codigos = codigos_canonicos_arreglo(longitudes)
+
+    # Información de los símbolos (columnar)
+    codigos_info = {
+        'simbolo': claves[orden],
+        'cuenta': cuentas[orden],
+        'probabilidad': cuentas[orden] / SIMBOLOS,
+        'codigo': codigos[orden],
+        'longitud': longitudes[orden],
+    }
+
+    # Verificación de la suma de probabilidades
+    assert np.allclose(codigos_info['probabilidad'].sum(), 1)
+
+    # Cálculo de estadísticas
+    LONGITUD_PROMEDIO_C = float(np.dot(codigos_info['probabilidad'], codigos_info['longitud']))
+    TASA_COMPRESION = 1/(LONGITUD_PROMEDIO_C / n)  # n símbolos por bloque
 
     return {
         'n': n,
@@ -54,27 +116,126 @@ def calcular_estadisticas_compresion(n, ruta_imagen):
         'simbolos': SIMBOLOS,
     }
 
+def calcular_estadisticas_compresion(n, ruta_imagen, metodo='arbol', longitud_maxima=None, filas_por_franja=None,
+                                     empaquetado=False, forma=None):
+    """
+    Calcula las estadísticas de compresión para un valor de n dado.
+
+    Args:
+        n (int): Tamaño del bloque
+        ruta_imagen (str): Ruta de la imagen a comprimir
+        metodo (str): 'arbol' (nodos y recorrido del árbol) o 'arreglos' (longitudes sobre arreglos NumPy)
+        longitud_maxima (int): Longitud máxima de los códigos, sólo para metodo='arreglos' (opcional)
+        filas_por_franja (int): Procesa la imagen por franjas de filas para acotar la memoria (opcional)
+        empaquetado (bool): Usa símbolos enteros empaquetados y 'codigos_info' columnar
+        forma (tuple): (alto, ancho) para archivos crudos de 8 bits sin cabecera (opcional); los crudos
+            y los .npy se leen por franjas con np.memmap
+
+    Returns:
+        dict: Diccionario con las estadísticas de compresión
+    """
+    # Datos de imagen original (sólo la cabecera, sin decodificar)
+    SHAPE = forma_imagen(ruta_imagen, forma)
+
+    if empaquetado:
+        claves, cuentas = contar_bloques_imagen(ruta_imagen, n, filas_por_franja, forma)
+        return estadisticas_empaquetadas(n, claves, cuentas, SHAPE, metodo, longitud_maxima)
+
+    # Cálculo de frecuencias
+    frecuencias = frecuencias_imagen(ruta_imagen, n, filas_por_franja, forma)
+    return estadisticas_desde_frecuencias(n, frecuencias, SHAPE, metodo, longitud_maxima)
+
+
+# Imagen compartida con los procesos del barrido (se asigna en _iniciar_worker)
+_memoria = None
+_pixeles = None
+
+def _iniciar_worker(nombre, shape):
+    """
+    Conecta el proceso a la memoria compartida con los píxeles de la imagen (sin copiarlos).
+    """
+    global _memoria, _pixeles
+    _memoria = shared_memory.SharedMemory(name=nombre)
+    _pixeles = np.ndarray(shape, dtype=np.uint8, buffer=_memoria.buf)
+
+def _estadisticas_pixeles(pixeles, n, metodo, longitud_maxima, empaquetado):
+    if empaquetado:
+        claves, cuentas = contar_bloques(pixeles.ravel(), n)
+        return estadisticas_empaquetadas(n, claves, cuentas, pixeles.shape, metodo, longitud_maxima)
+    frecuencias = frecuencias_bloques(pixeles.ravel(), n)
+    return estadisticas_desde_frecuencias(n, frecuencias, pixeles.shape, metodo, longitud_maxima)
+
+def _estadisticas_worker(args):
+    return _estadisticas_pixeles(_pixeles, *args)
+
+def barrido_n(img, n_values, procesos=None, metodo='arbol', longitud_maxima=None, empaquetado=False):
+    """
+    Calcula las estadísticas de compresión para varios n sobre la imagen ya decodificada.
+
+    Los píxeles se copian una vez a memoria compartida y cada proceso del pool los lee sin copiarlos.
+
+    Args:
+        img: Imagen 2D uint8 (p. ej. de cargar_imagen)
+        n_values: Valores de n a calcular
+        procesos (int): Cantidad de procesos (None = todos los núcleos, 1 = sin pool)
+        metodo (str): Constructor de códigos ('arbol' o 'arreglos')
+        longitud_maxima (int): Longitud máxima de los códigos, sólo para metodo='arreglos' (opcional)
+        empaquetado (bool): Usa símbolos enteros empaquetados y 'codigos_info' columnar
+
+    Returns:
+        list: Diccionarios de estadísticas, en el orden de n_values
+    """
+    img = np.ascontiguousarray(img, dtype=np.uint8)
+    tareas = [(n, metodo, longitud_maxima, empaquetado) for n in n_values]
+
+    if procesos == 1:
+        return [_estadisticas_pixeles(img, *tarea) for tarea in tareas]
+
+    memoria = shared_memory.SharedMemory(create=True, size=img.nbytes)
+    try:
+        np.ndarray(img.shape, dtype=np.uint8, buffer=memoria.buf)[:] = img
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_worker,
+                                 initargs=(memoria.name, img.shape)) as pool:
+            return list(pool.map(_estadisticas_worker, tareas))
+    finally:
+        memoria.close()
+        memoria.unlink()
+
 def main():
     # Configuración de rutas
     directorio_actual = os.path.dirname(__file__)
     ruta_imagen = os.path.join(directorio_actual, 'logoFI.tif')
-    
+
     # Parámetros de simulación
     n_values = np.arange(1, 15, 1)  # Valores de n a probar
+    PROCESOS = None                 # None = todos los núcleos
+    EMPAQUETADO = True              # Símbolos enteros y resultados columnares
+    HEADLESS = False                # True = guardar los gráficos sin mostrarlos (corridas por lotes)
+
+    if HEADLESS:
+        usar_headless()
+
+    # La imagen se decodifica una sola vez para el barrido, el codec y las entropías
+    img = cargar_imagen(ruta_imagen)
 
     # Calcular estadísticas para cada valor de n
-    resultados = []
-    for n in n_values:
-        print(f"\nCalculando estadísticas para n={n}...")
-        stats = calcular_estadisticas_compresion(n, ruta_imagen)
-        resultados.append(stats)
+    print(f"\nCalculando estadísticas para n={n_values[0]}..{n_values[-1]}...")
+    resultados = barrido_n(img, n_values, PROCESOS, empaquetado=EMPAQUETADO)
+
+    # Compresión real (archivo) frente a la tasa teórica
+    reporte_codec(resultados, img)
+
+    # Límites de modelos de contexto (n-gramas superpuestos y vecinos 2D)
+    entropias = analizar_entropias(img, n_values)
 
     # Generar gráficos
-    estadisticas_compresion(resultados)
-    
+    estadisticas_compresion(resultados, entropias)
+
     # Generar gráfico de distribución de probabilidades para n=4
     distribuciones_probabilidad(resultados[3]['codigos_info'], n=4)
 
+    # Distribuciones de todos los n en una sola figura
+    distribuciones_barrido(resultados)
+
 if __name__ == "__main__":
     main()
-
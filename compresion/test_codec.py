@@ -0,0 +1,13 @@
+from codec import comprimir, descomprimir
+import numpy as np
+
+
+def test_imagen_sin_bloques_completos():
+    for img in (np.zeros((1, 2), dtype=np.uint8), np.zeros((0, 5), dtype=np.uint8)):
+        assert np.array_equal(descomprimir(comprimir(img, 3)), img)
+
+
+def test_ida_y_vuelta_con_resto():
+    img = np.random.default_rng(0).integers(0, 4, (7, 11)).astype(np.uint8)
+    for n in (1, 3, 4):
+        assert np.array_equal(descomprimir(comprimir(img, n)), img)
@@ -0,0 +1,7 @@
+from entropia import analizar_entropias
+import numpy as np
+
+
+def test_imagen_constante_tiene_tasa_infinita():
+    for r in analizar_entropias(np.zeros((10, 10)), [1, 2]):
+        assert r['tasa_bloques'] == r['tasa_condicional'] == r['tasa_contexto_2d'] == np.inf
@@ -0,0 +1,16 @@
+from frecuencias import contar_bloques_imagen, forma_imagen
+import numpy as np
+
+
+def test_npy_y_crudo_igual_que_por_franjas(tmp_path):
+    img = np.random.default_rng(0).integers(0, 4, (33, 17)).astype(np.uint8) * 60
+    npy, crudo = str(tmp_path / 'img.npy'), str(tmp_path / 'img.raw')
+    np.save(npy, img)
+    img.tofile(crudo)
+    assert forma_imagen(npy) == forma_imagen(crudo, img.shape) == img.shape
+    for n in (1, 3, 9):
+        claves, cuentas = contar_bloques_imagen(npy, n, filas_por_franja=5)
+        # Sin filas_por_franja, los .npy y crudos también se leen con np.memmap (no con PIL)
+        for ruta, forma in ((npy, None), (crudo, img.shape)):
+            claves_r, cuentas_r = contar_bloques_imagen(ruta, n, forma=forma)
+            assert np.array_equal(claves_r, claves) and np.array_equal(cuentas_r, cuentas)
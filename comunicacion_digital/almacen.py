@@ -0,0 +1,90 @@
+import hashlib
+import sqlite3
+import numpy as np
+import os
+
+# Almacén incremental de resultados de Simulacion: una fila por tanda simulada con los conteos
+# crudos, para reanudar barridos interrumpidos y acumular corridas sobre los mismos puntos.
+RUTA_ALMACEN = os.path.join(os.path.dirname(__file__), 'resultados', 'simulaciones.sqlite')
+
+# Configuración que identifica un punto (además de Eb/N0)
+CAMPOS_CONFIGURACION = ('n', 'k', 'dmin', 'modo', 'canal', 'decision', 'codigo', 'flujo')
+
+_ESQUEMA = '''
+CREATE TABLE IF NOT EXISTS tandas (
+    n INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    dmin INTEGER NOT NULL,
+    modo INTEGER NOT NULL,
+    canal TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    codigo TEXT NOT NULL,
+    flujo TEXT NOT NULL,
+    ebn0 REAL NOT NULL,
+    semilla TEXT NOT NULL,
+    tanda INTEGER NOT NULL,
+    palabras INTEGER NOT NULL,
+    errores_palabra INTEGER NOT NULL,
+    errores_bit INTEGER NOT NULL,
+    evaluadas INTEGER NOT NULL,
+    PRIMARY KEY (n, k, dmin, modo, canal, decision, codigo, flujo, ebn0, semilla, tanda)
+)
+'''
+
+
+def huella_codigo(G):
+    """
+    Identificador corto de la matriz generadora (distingue códigos con los mismos n, k, dmin).
+    """
+    G = np.ascontiguousarray(G, dtype=np.uint8)
+    return hashlib.sha1(G.tobytes() + str(G.shape).encode()).hexdigest()[:16]
+
+def abrir(ruta=RUTA_ALMACEN):
+    """
+    Abre (o crea) el almacén SQLite.
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    conexion = sqlite3.connect(ruta)
+    conexion.execute(_ESQUEMA)
+    return conexion
+
+def leer_tandas(conexion, configuracion, EbN0):
+    """
+    Tandas guardadas de un punto.
+
+    Args:
+        conexion: Conexión de abrir()
+        configuracion: Diccionario con CAMPOS_CONFIGURACION
+        EbN0: Eb/N0 del punto [dB]
+
+    Returns:
+        dict: {(semilla, tanda): (palabras, errores_palabra, errores_bit, evaluadas)}
+    """
+    condicion = ' AND '.join(f'{campo} = ?' for campo in CAMPOS_CONFIGURACION)
+    filas = conexion.execute(
+        f'SELECT semilla, tanda, palabras, errores_palabra, errores_bit, evaluadas FROM tandas '
+        f'WHERE {condicion} AND ebn0 = ?',
+        [configuracion[campo] for campo in CAMPOS_CONFIGURACION] + [float(EbN0)])
+    return {(semilla, tanda): tuple(conteos) for semilla, tanda, *conteos in filas}
+
+def guardar_tanda(conexion, configuracion, EbN0, semilla, tanda, palabras, errores_palabra, errores_bit, evaluadas):
+    """
+    Guarda (y confirma) los conteos de una tanda; se llama a medida que terminan las tandas.
+    """
+    valores = [configuracion[campo] for campo in CAMPOS_CONFIGURACION]
+    valores += [float(EbN0), str(semilla), int(tanda), int(palabras), int(errores_palabra), int(errores_bit),
+                int(evaluadas)]
+    with conexion:
+        conexion.execute(f'INSERT OR REPLACE INTO tandas VALUES ({", ".join("?" * len(valores))})', valores)
+
+def resumen(conexion):
+    """
+    Conteos totales por punto (todas las semillas y tandas sumadas).
+
+    Returns:
+        list: Tuplas (CAMPOS_CONFIGURACION..., ebn0, tandas, palabras, errores_palabra, errores_bit, evaluadas)
+    """
+    campos = ', '.join(CAMPOS_CONFIGURACION)
+    return conexion.execute(
+        f'SELECT {campos}, ebn0, COUNT(*), SUM(palabras), SUM(errores_palabra), SUM(errores_bit), SUM(evaluadas) '
+        f'FROM tandas GROUP BY {campos}, ebn0 ORDER BY {campos}, ebn0').fetchall()
@@ -0,0 +1,132 @@
+from csb import probabilidad_error
+from decodificacion import tabla_lideres
+from diseno import disenar_codigo
+from empaquetado import CodigoEmpaquetado, popcount
+from scipy.special import comb
+import numpy as np
+import time
+
+MAX_N_ENUMERACION = 24       # perfil_decodificador recorre los 2^n patrones de error
+PATRONES_POR_BLOQUE = 1 << 20
+
+
+def polinomio_pesos(coeficientes, p, n):
+    """
+    Evalúa sum_w c_w p^w (1-p)^(n-w) para un vector de p (canal binario simétrico).
+
+    Args:
+        coeficientes: c_0..c_n (cantidad de patrones de error de cada peso con la propiedad buscada)
+        p: Probabilidad de error de bit del canal (escalar o array)
+        n: Largo de palabra
+
+    Returns:
+        np.ndarray: Probabilidad para cada p
+    """
+    p = np.asarray(p, dtype=float)[..., None]
+    w = np.arange(n + 1)
+    return (np.asarray(coeficientes, dtype=float) * p**w * (1 - p)**(n - w)).sum(axis=-1)
+
+def distribucion_lideres(H_t):
+    """
+    Distribución de pesos de los líderes de coclase (decodificador completo de mínima distancia).
+
+    Returns:
+        np.ndarray: alfa[i] = cantidad de coclases cuyo líder tiene peso i, i = 0..n
+    """
+    n, r = H_t.shape
+    tabla = tabla_lideres(H_t, r)      # Todo síndrome tiene un líder de peso <= n - k
+    return np.bincount(tabla.sum(axis=1), minlength=n + 1)
+
+def prob_no_detectado(pesos, p):
+    """
+    Probabilidad de error no detectado: el patrón de error es una palabra código no nula.
+    """
+    A = np.array(pesos, dtype=float)
+    A[0] = 0
+    return polinomio_pesos(A, p, len(A) - 1)
+
+def prob_falla_decodificacion(alfa, p):
+    """
+    Probabilidad de que el decodificador por líderes de coclase no devuelva la palabra enviada:
+    el patrón de error no es líder de su coclase. Se suman directamente los patrones que fallan
+    (C(n, i) - alfa_i) para no perder precisión con probabilidades muy chicas.
+    """
+    n = len(alfa) - 1
+    return polinomio_pesos(comb(n, np.arange(n + 1)) - np.asarray(alfa), p, n)
+
+def perfil_decodificador(H_t, G, tc, MODO):
+    """
+    Recorre los 2^n patrones de error con el decodificador de la simulación y acumula, por peso
+    del patrón, las palabras aceptadas, las palabras con error en el mensaje y los bits de
+    mensaje con error. Como el código es lineal, el resultado no depende de la palabra enviada.
+
+    Args:
+        H_t, G: Matrices del código (n <= MAX_N_ENUMERACION)
+        tc: Errores corregibles del decodificador
+        MODO: 0 = DETECTOR; 1 = CORRECTOR
+
+    Returns:
+        tuple: (aceptadas, errores_palabra, errores_bit), arrays de largo n + 1
+    """
+    n = H_t.shape[0]
+    if n > MAX_N_ENUMERACION:
+        raise ValueError(f"n = {n} > {MAX_N_ENUMERACION}: usar prob_no_detectado / prob_falla_decodificacion")
+    codigo = CodigoEmpaquetado(H_t, G, tc)
+    aceptadas = np.zeros(n + 1, dtype=np.int64)
+    errores_palabra = np.zeros(n + 1, dtype=np.int64)
+    errores_bit = np.zeros(n + 1, dtype=np.int64)
+
+    for inicio in range(0, 1 << n, PATRONES_POR_BLOQUE):
+        e = np.arange(inicio, min(inicio + PATRONES_POR_BLOQUE, 1 << n), dtype=np.uint64)
+        peso = popcount(e).astype(np.intp)
+        if MODO:
+            validas = np.ones(len(e), dtype=bool)
+            error_mensaje = codigo.mensaje(codigo.corregir(e))   # Se envía la palabra nula
+        else:
+            validas = ~codigo.detectar(e)
+            error_mensaje = np.where(validas, codigo.mensaje(e), np.uint64(0))
+        bits = popcount(error_mensaje).astype(np.int64)
+        aceptadas += np.bincount(peso[validas], minlength=n + 1)
+        errores_palabra += np.bincount(peso[bits > 0], minlength=n + 1)
+        errores_bit += np.bincount(peso, weights=bits, minlength=n + 1).astype(np.int64)
+    return aceptadas, errores_palabra, errores_bit
+
+def tasas_analiticas(EbN0_c, n, k, H_t, G, dmin, MODO):
+    """
+    P_ep y P_eb exactos del decodificador de la simulación con detección dura, vectorizados sobre Eb/N0.
+
+    Usa las mismas definiciones que Simulacion: en DETECTOR las tasas se calculan sobre las
+    palabras aceptadas (síndrome nulo); en CORRECTOR sobre todas.
+
+    Returns:
+        tuple: (P_ep, P_eb)
+    """
+    p = probabilidad_error(n, k, 10**(np.asarray(EbN0_c, dtype=float) / 10))
+    aceptadas, errores_palabra, errores_bit = perfil_decodificador(H_t, G, (dmin - 1) // 2, MODO)
+    P_aceptada = polinomio_pesos(aceptadas, p, n)
+    P_ep = polinomio_pesos(errores_palabra, p, n) / P_aceptada
+    P_eb = polinomio_pesos(errores_bit, p, n) / (k * P_aceptada)
+    return P_ep, P_eb
+
+def main():
+    n, k = 14, 10
+    H_t, G, dmin, pesos = disenar_codigo(n, k)
+    EbN0_c = np.linspace(0, 14, 1401)
+
+    inicio = time.perf_counter()
+    curvas = {MODO: tasas_analiticas(EbN0_c, n, k, H_t, G, dmin, MODO) for MODO in (0, 1)}
+    p = probabilidad_error(n, k, 10**(EbN0_c / 10))
+    P_u = prob_no_detectado(pesos, p)
+    P_falla = prob_falla_decodificacion(distribucion_lideres(H_t), p)
+    demora = time.perf_counter() - inicio
+
+    print(f"({n}, {k}), dmin = {dmin}: {len(EbN0_c)} puntos de Eb/N0 en {1e3 * demora:.1f} ms")
+    print("Distribución de pesos:", {w: int(a) for w, a in enumerate(pesos) if a})
+    print("Líderes de coclase:", {w: int(a) for w, a in enumerate(distribucion_lideres(H_t)) if a})
+    for EbN0 in (4, 6, 8, 10, 12):
+        i = np.searchsorted(EbN0_c, EbN0)
+        print(f"Eb/N0 = {EbN0:2d} dB: P_u = {P_u[i]:.3e}  P_falla = {P_falla[i]:.3e}  "
+              f"DETECTOR P_ep = {curvas[0][0][i]:.3e}  CORRECTOR P_eb = {curvas[1][1][i]:.3e}")
+
+if __name__ == "__main__":
+    main()
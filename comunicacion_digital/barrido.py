@@ -0,0 +1,138 @@
+from helpers import bloques_palabras, intervalo_confianza, graficos_comparacion, Q
+from diseno import disenar_codigo
+from empaquetado import CodigoEmpaquetado, random_U_empaquetado, desempaquetar, empaquetar, popcount
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import os
+
+# Barrido con números aleatorios comunes: en cada tanda se sortean una sola vez los mensajes y
+# el ruido (para el código más largo) y todos los códigos y ambos modos usan esa misma realización.
+MODOS = ('DETECTOR', 'CORRECTOR')
+MEMORIA_BLOQUE = 64 << 20
+
+
+def iteracion_comun(PALABRAS, codigos, A, EbfN0, rng=None, palabras_bloque=None):
+    """
+    Simula PALABRAS palabras para todos los códigos y ambos modos sobre las mismas realizaciones.
+
+    Cada código toma los primeros k bits del mensaje sorteado y las primeras n muestras del ruido
+    normal estándar, escaladas por su propio desvío (depende de la tasa k/n). El mismo vector
+    recibido se decodifica como DETECTOR y como CORRECTOR.
+
+    Args:
+        PALABRAS: Cantidad de palabras
+        codigos: Lista de CodigoEmpaquetado
+        A: Amplitud de la señal BPSK
+        EbfN0: Cociente Eb/N0 (en veces)
+        rng: np.random.Generator (opcional)
+        palabras_bloque: Palabras por bloque
+
+    Returns:
+        np.ndarray: Conteos (códigos x modos x [e_p, e_b, palabras evaluadas])
+    """
+    n_max = max(codigo.n for codigo in codigos)
+    k_max = max(codigo.k for codigo in codigos)
+    normal = np.random.standard_normal if rng is None else rng.standard_normal
+    conteos = np.zeros((len(codigos), len(MODOS), 3), dtype=np.int64)
+
+    for m in bloques_palabras(PALABRAS, palabras_bloque or PALABRAS):
+        U_comun = random_U_empaquetado(m, k_max, rng)
+        Z = normal((m, n_max))                          # Ruido común (normal estándar)
+        for c, codigo in enumerate(codigos):
+            n, k = codigo.n, codigo.k
+            sigma = np.sqrt(A**2 * n / k / EbfN0 / 2)
+            U = U_comun >> np.uint64(k_max - k)
+            V = codigo.codificar(U)
+            bits = desempaquetar(V, n).astype(bool)
+            ruido = sigma * Z[:, :n]
+            R = V ^ empaquetar(np.where(bits, ruido <= -A, ruido > A))
+
+            # DETECTOR: sólo las palabras con síndrome nulo
+            validas = ~codigo.detectar(R)
+            E = U[validas] ^ codigo.mensaje(R[validas])
+            conteos[c, 0] += [np.count_nonzero(E), int(popcount(E).sum()), len(E)]
+            # CORRECTOR: todas las palabras, corregidas por líder de coclase
+            E = U ^ codigo.mensaje(codigo.corregir(R))
+            conteos[c, 1] += [np.count_nonzero(E), int(popcount(E).sum()), len(E)]
+    return conteos
+
+def _unidad(tarea):
+    PALABRAS, codigos, A, EbfN0, palabras_bloque, semilla = tarea
+    return iteracion_comun(PALABRAS, codigos, A, EbfN0, np.random.default_rng(semilla), palabras_bloque)
+
+def barrido_comun(EbN0_c, codigos_nk, A=1, procesos=None, semilla=None, confianza=0.95,
+                  memoria_bloque=MEMORIA_BLOQUE):
+    """
+    Barrido de Eb/N0 de varios códigos (n, k) en modos DETECTOR y CORRECTOR en una sola pasada.
+
+    Como todas las configuraciones comparten mensajes y ruido, el costo de generar el canal se paga
+    una vez y las diferencias entre códigos o modos tienen menos varianza que con corridas separadas.
+    Las palabras por punto siguen la regla de Simulacion (max(1e6, 100/P_eb teorica), 10 tandas).
+
+    Args:
+        EbN0_c (array): Rango de energía/ruido con codigo [dB]
+        codigos_nk: Lista de (n, k); los códigos se obtienen con diseno.disenar_codigo
+        A: Amplitud de la señal BPSK
+        procesos (int): Cantidad de procesos (None = todos los núcleos, 1 = sin pool)
+        semilla (int): Semilla de la SeedSequence (None = entropía del sistema)
+        confianza (float): Nivel de confianza de los intervalos
+        memoria_bloque (int): Memoria aproximada por proceso para un bloque de palabras [bytes]
+
+    Returns:
+        pd.DataFrame: Una fila por (código, modo, Eb/N0) con tasas, intervalos y conteos
+    """
+    ITERACIONES = 10
+    disenos = [disenar_codigo(n, k) for n, k in codigos_nk]
+    codigos = [CodigoEmpaquetado(H_t, G, (dmin - 1) // 2) for H_t, G, dmin, _ in disenos]
+    n_max = max(n for n, _ in codigos_nk)
+    palabras_bloque = max(1, memoria_bloque // (24 * n_max + 48 * len(codigos)))
+    semilla = np.random.SeedSequence(semilla).entropy
+
+    tareas = []
+    for EbN0 in EbN0_c:
+        EbfN0 = 10**(EbN0/10)
+        PALABRAS = max(int(100 / Q(np.sqrt(2 * EbfN0))), 1000000)
+        semillas = np.random.SeedSequence(semilla, spawn_key=(int(np.float64(EbN0).view(np.uint64)),))
+        for semilla_tanda in semillas.spawn(ITERACIONES):
+            tareas.append((PALABRAS, codigos, A, EbfN0, palabras_bloque, semilla_tanda))
+
+    if procesos == 1:
+        resultados = [_unidad(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_unidad, tareas))
+    # (puntos x códigos x modos x [e_p, e_b, palabras])
+    conteos = np.sum(np.reshape(resultados, (len(EbN0_c), ITERACIONES) + resultados[0].shape), axis=1)
+
+    filas = []
+    for c, ((n, k), (_, _, dmin, _)) in enumerate(zip(codigos_nk, disenos)):
+        for modo, nombre in enumerate(MODOS):
+            e_p, e_b, palabras = conteos[:, c, modo].T
+            P_ep_inf, P_ep_sup = intervalo_confianza(e_p, palabras, confianza)
+            P_eb_inf, P_eb_sup = intervalo_confianza(e_b, k * palabras, confianza)
+            for i, EbN0 in enumerate(EbN0_c):
+                filas.append({
+                    'Código': f'({n}, {k})', 'n': n, 'k': k, 'dmin': dmin, 'MODO': nombre, 'Eb/N0 [dB]': EbN0,
+                    'P_ep': e_p[i] / max(palabras[i], 1), 'P_eb': e_b[i] / max(k * palabras[i], 1),
+                    'P_ep inf': P_ep_inf[i], 'P_ep sup': P_ep_sup[i],
+                    'P_eb inf': P_eb_inf[i], 'P_eb sup': P_eb_sup[i],
+                    'Palabras': palabras[i], 'Errores de palabra': e_p[i], 'Errores de bit': e_b[i],
+                })
+    return pd.DataFrame(filas)
+
+def main():
+    PROCESOS = None # None = todos los núcleos; 1 = sin pool
+    SEMILLA = None
+    CODIGOS = [(7, 5), (14, 10), (21, 15)]  # Misma tasa k/n = 5/7
+    EbN0_c = np.linspace(1, 8, 15)
+
+    df = barrido_comun(EbN0_c, CODIGOS, procesos=PROCESOS, semilla=SEMILLA)
+
+    resultados_dir = os.path.join(os.path.dirname(__file__), 'resultados')
+    os.makedirs(resultados_dir, exist_ok=True)
+    df.to_csv(os.path.join(resultados_dir, 'comparacion.csv'), index=False)
+    graficos_comparacion(df)
+
+if __name__ == "__main__":
+    main()
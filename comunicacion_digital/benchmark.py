@@ -0,0 +1,134 @@
+from codificacion import matrizGeneradora
+from diseno import disenar_codigo
+from decodificacion import corregir, detectar
+from csb import canalCSB
+from empaquetado import CodigoEmpaquetado, empaquetar, canalCSB_empaquetado
+from main import _unidad, crear_tarea
+from instrumentacion import medir, memoria_pico, guardar_resultados
+import instrumentacion
+import numpy as np
+import argparse
+import time
+import os
+
+# Etapas medidas; las de una sola palabra por uint64 llevan el sufijo _empaquetado
+ETAPAS = ('matriz', 'canal', 'corregir', 'detectar', 'canal_empaquetado', 'corregir_empaquetado',
+          'detectar_empaquetado', 'simulacion_detector', 'simulacion_corrector')
+CODIGOS = ((7, 4), (14, 10), (15, 11), (31, 26))
+CLAVES = ('n', 'k', 'palabras', 'ebn0')   # Campos que identifican cada caso
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), 'benchmarks')
+
+
+def _corregir(R, H_t, tc):
+    # corregir modifica R: cada ejecución trabaja sobre una copia
+    return corregir(R.copy(), H_t, tc)
+
+def _simulacion(EbfN0, n, k, MODO, palabras, H_t, G, tc, semilla):
+    # Una tanda de 'palabras' palabras de un punto: la unidad de trabajo de Simulacion, sin pool ni almacén
+    return _unidad(crear_tarea(palabras, n, k, EbfN0, H_t, G, MODO, tc, semilla))
+
+
+def medir_etapas(n, k, palabras, EbN0, repeticiones=5, semilla=0):
+    """
+    Mide tiempo (mediana), palabras/s y pico de memoria de cada etapa para un código y tamaño de tanda.
+    Las etapas usan el código de diseno.disenar_codigo y su dmin, como main.py; 'matriz' mide
+    matrizGeneradora(n, k, dmin), la construcción por defecto de Simulacion.
+
+    Returns:
+        dict: t_<etapa> [s], palabras_s_<etapa> y mem_<etapa> [bytes] para cada etapa
+            (matriz no tiene palabras_s: no depende de la tanda)
+    """
+    rng = np.random.default_rng(semilla)
+    EbfN0 = 10**(EbN0/10)
+    resultado = {}
+
+    def registrar(etapa, funcion, *args):
+        t, salida = medir(funcion, *args, repeticiones=repeticiones)
+        resultado[f't_{etapa}'] = t
+        if etapa != 'matriz':
+            resultado[f'palabras_s_{etapa}'] = palabras / t if t else float('inf')
+        resultado[f'mem_{etapa}'] = memoria_pico(funcion, *args)
+        return salida
+
+    H_t, G, dmin, _ = disenar_codigo(n, k)
+    tc = (dmin - 1) // 2
+    registrar('matriz', matrizGeneradora, n, k, dmin)
+    V = rng.integers(0, 2, (palabras, k)) @ G % 2
+    R = registrar('canal', canalCSB, n, k, 1, EbfN0, V, rng)
+    registrar('corregir', _corregir, R, H_t, tc)
+    registrar('detectar', detectar, R, H_t)
+
+    codigo = CodigoEmpaquetado(H_t, G, tc)
+    v = empaquetar(V)
+    r = registrar('canal_empaquetado', canalCSB_empaquetado, n, k, 1, EbfN0, v, rng)
+    registrar('corregir_empaquetado', codigo.corregir, r)
+    registrar('detectar_empaquetado', codigo.detectar, r)
+
+    for MODO, etapa in enumerate(('simulacion_detector', 'simulacion_corrector')):
+        registrar(etapa, _simulacion, EbfN0, n, k, MODO, palabras, H_t, G, tc, semilla)
+    return resultado
+
+
+def ejecutar_suite(codigos=CODIGOS, tamanos=(10**4, 10**5, 10**6), EbN0_c=(4.0, 8.0), repeticiones=5, semilla=0):
+    """
+    Ejecuta el benchmark para cada combinación de código (n, k), palabras por tanda y Eb/N0.
+
+    Returns:
+        list: Un diccionario por (n, k, palabras, Eb/N0)
+    """
+    filas = []
+    for n, k in codigos:
+        for palabras in tamanos:
+            for EbN0 in EbN0_c:
+                fila = {'n': int(n), 'k': int(k), 'palabras': int(palabras), 'ebn0': float(EbN0)}
+                fila.update(medir_etapas(int(n), int(k), int(palabras), float(EbN0), repeticiones=repeticiones,
+                                         semilla=semilla))
+                filas.append(fila)
+                print(f"({n:2d}, {k:2d}) {palabras:>8d} palabras {EbN0:4.1f} dB  "
+                      f"canal={fila['palabras_s_canal']:9.3g}  corregir={fila['palabras_s_corregir']:9.3g}  "
+                      f"detectar={fila['palabras_s_detectar']:9.3g}  "
+                      f"simulacion={fila['palabras_s_simulacion_corrector']:9.3g} palabras/s")
+    return filas
+
+
+def comparar_resultados(ruta_base, ruta_nueva, umbral=0.2, minimo=1e-3):
+    """
+    Compara dos corridas del benchmark (casos por n, k, palabras y Eb/N0); ver instrumentacion.comparar_resultados.
+    """
+    return instrumentacion.comparar_resultados(ruta_base, ruta_nueva, CLAVES, ETAPAS, umbral, minimo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la simulación de comunicación digital')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    suite = sub.add_parser('suite', help='Mide cada etapa para varios códigos, tandas y Eb/N0')
+    suite.add_argument('--codigos', nargs='+', default=[f'{n},{k}' for n, k in CODIGOS], help='Códigos n,k')
+    suite.add_argument('--palabras', type=int, nargs='+', default=[10**4, 10**5, 10**6])
+    suite.add_argument('--ebn0', type=float, nargs='+', default=[4.0, 8.0])
+    suite.add_argument('--repeticiones', type=int, default=5)
+    suite.add_argument('--nombre', default=time.strftime('%Y%m%d_%H%M%S'), help='Nombre de los archivos de salida')
+    suite.add_argument('--base', help='JSON de referencia: al terminar se comparan las corridas')
+    suite.add_argument('--umbral', type=float, default=0.2)
+    suite.add_argument('--minimo', type=float, default=1e-3, help='Tiempo mínimo comparado [s]')
+
+    comparar = sub.add_parser('comparar', help='Compara dos corridas y marca regresiones')
+    comparar.add_argument('base')
+    comparar.add_argument('nueva')
+    comparar.add_argument('--umbral', type=float, default=0.2)
+    comparar.add_argument('--minimo', type=float, default=1e-3, help='Tiempo mínimo comparado [s]')
+
+    args = parser.parse_args()
+    if args.comando == 'suite':
+        codigos = [tuple(int(x) for x in codigo.split(',')) for codigo in args.codigos]
+        filas = ejecutar_suite(codigos, args.palabras, args.ebn0, args.repeticiones)
+        ruta = guardar_resultados(filas, args.nombre, DIRECTORIO_RESULTADOS)
+        print(f"Resultados en {ruta}")
+        if args.base is not None:
+            raise SystemExit(1 if comparar_resultados(args.base, ruta, args.umbral, args.minimo) else 0)
+    else:
+        regresiones = comparar_resultados(args.base, args.nueva, args.umbral, args.minimo)
+        raise SystemExit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import numpy as np
+from scipy.special import erfc
 
-def canalCSB(n, k, A, EbfN0, V):
+def canalCSB(n, k, A, EbfN0, V, rng=None, suave=False):
     """
     Simula la transmisión y recepción de palabras código a través de un canal AWGN con modulación BPSK.
     
@@ -10,6 +11,8 @@ def canalCSB(n, k, A, EbfN0, V):
         A: Amplitud de la señal BPSK
         EbfN0: Cociente Eb/N0 deseado (en veces)
         V: Matriz de palabras código (cada fila es una palabra código)
+        rng: np.random.Generator para el ruido (opcional; por defecto el estado global de np.random)
+        suave: Devolver las muestras reales (float32) en lugar de la detección dura
     
     Returns:
         Rd: Matriz de palabras código recibidas (cada fila es una palabra código)
@@ -21,10 +24,54 @@ def canalCSB(n, k, A, EbfN0, V):
     # Modulación BPSK (0 -> -A, 1 -> +A)
     S = (2 * V - 1) * A
     # Ruido AWGN para cada palabra código
-    noise = np.sqrt(N0 / 2) * (np.random.randn(*S.shape) + 1j * np.random.randn(*S.shape))
+    normal = np.random.standard_normal if rng is None else rng.standard_normal
+    noise = np.sqrt(N0 / 2) * (normal(S.shape) + 1j * normal(S.shape))
     # Señal recibida
     R = S + noise
+    if suave:
+        return np.real(R).astype(np.float32)
     # Demodulación (detección dura)
     Rd = (np.real(R) > 0).astype(int)
     return Rd
 
+
+def probabilidad_error(n, k, EbfN0):
+    """
+    Probabilidad de error de bit del canal con detección dura: p = Q(sqrt(2 Es/N0)),
+    con Es/N0 = (k/n) Eb/N0. No depende de la amplitud A.
+    """
+    return 0.5 * erfc(np.sqrt(EbfN0 * k / n))
+
+def posiciones_error(bits, p, rng=None):
+    """
+    Sortea las posiciones con error entre bits bits independientes con probabilidad p cada uno.
+
+    Primero la cantidad de errores (Binomial(bits, p)) y luego sus posiciones, uniformes y sin
+    repetición: el costo es proporcional a la cantidad de errores y no a la de bits.
+
+    Args:
+        bits: Cantidad total de bits
+        p: Probabilidad de error de cada bit
+        rng: np.random.Generator (opcional; por defecto uno derivado del estado global de np.random)
+
+    Returns:
+        np.ndarray: Posiciones (int64) de los bits con error, sin orden
+    """
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(2**32))
+    cantidad = rng.binomial(bits, p)
+    return rng.choice(bits, cantidad, replace=False, shuffle=False)
+
+def canalCSB_errores(n, k, A, EbfN0, V, rng=None):
+    """
+    Canal equivalente a canalCSB con detección dura que sortea directamente el patrón de errores
+    (canal binario simétrico con p = probabilidad_error(n, k, EbfN0)) en lugar del ruido.
+
+    Args: iguales a canalCSB
+
+    Returns:
+        Rd: Matriz de palabras código recibidas (cada fila es una palabra código)
+    """
+    Rd = np.array(V, dtype=int)
+    Rd.reshape(-1)[posiciones_error(Rd.size, probabilidad_error(n, k, EbfN0), rng)] ^= 1
+    return Rd
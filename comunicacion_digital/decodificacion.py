@@ -1,42 +1,193 @@
 import numpy as np
+from itertools import combinations
 
-def corregir(R, H_t):
+# Tablas de líderes de coclase ya calculadas, por (H_t, tc)
+_TABLAS = {}
+# Libros de código (±1, float32) ya calculados, por G
+_LIBROS = {}
+PALABRAS_ML = 1 << 7  # Palabras por multiplicación en decodificar_ml (correlaciones en caché)
+
+
+def columnas_sindrome(H_t):
+    """
+    Empaqueta cada fila de H_t en un entero: el síndrome que produce un error en esa posición.
+
+    Args:
+        H_t: Matriz de chequeo de paridad del código (H_transpuesta, n x (n-k))
+
+    Returns:
+        np.ndarray: n enteros de (n-k) bits
+    """
+    pesos = 1 << np.arange(H_t.shape[1] - 1, -1, -1, dtype=np.int64)
+    return (np.asarray(H_t, dtype=np.int64) & 1) @ pesos
+
+def sindromes(R, H_t):
+    """
+    Calcula el síndrome de cada palabra recibida empaquetado como entero.
+
+    Args:
+        R: Matriz de palabras código recibidas (cada fila es una palabra código)
+        H_t: Matriz de chequeo de paridad del código (H_transpuesta)
+
+    Returns:
+        np.ndarray: Síndrome de cada palabra (entero de n-k bits)
+    """
+    h = columnas_sindrome(H_t)
+    S = np.zeros(R.shape[0], dtype=np.int64)
+    # XOR de las columnas de H_t seleccionadas por los bits de cada palabra
+    for j in range(R.shape[1]):
+        S ^= R[:, j].astype(np.int64) * h[j]
+    return S
+
+def tabla_lideres(H_t, tc):
+    """
+    Tabla de líderes de coclase indexada por el síndrome empaquetado.
+
+    Recorre los patrones de error por peso creciente (hasta tc) y asigna a cada síndrome el
+    primer patrón que lo produce. Los síndromes sin patrón de peso <= tc quedan en cero
+    (la palabra no se modifica).
+
+    Args:
+        H_t: Matriz de chequeo de paridad del código (H_transpuesta)
+        tc: Cantidad de errores corregibles
+
+    Returns:
+        np.ndarray: Matriz (2^(n-k) x n) uint8 con el patrón de error de cada síndrome
+    """
+    clave = (np.asarray(H_t).tobytes(), H_t.shape, tc)
+    if clave in _TABLAS:
+        return _TABLAS[clave]
+
+    n, r = H_t.shape
+    h = columnas_sindrome(H_t)
+    tabla = np.zeros((1 << r, n), dtype=np.uint8)
+    asignado = np.zeros(1 << r, dtype=bool)
+    asignado[0] = True
+
+    for peso in range(1, tc + 1):
+        posiciones = np.array(list(combinations(range(n), peso)), dtype=np.int64)
+        if len(posiciones) == 0:
+            break
+        S = np.bitwise_xor.reduce(h[posiciones], axis=1)
+        # Primer patrón (en orden) de cada síndrome todavía libre
+        S_unicos, primero = np.unique(S, return_index=True)
+        libres = ~asignado[S_unicos]
+        S_nuevos, filas = S_unicos[libres], posiciones[primero[libres]]
+        tabla[np.repeat(S_nuevos, peso), filas.ravel()] = 1
+        asignado[S_nuevos] = True
+        if asignado.all():
+            break
+
+    _TABLAS[clave] = tabla
+    return tabla
+
+def corregir(R, H_t, tc=1):
     """
-    Corrige (tc = 1) errores en la matriz de palabras código recibidas R
-    
+    Corrige hasta tc errores en la matriz de palabras código recibidas R
+
     Args:
         R: Matriz de palabras código recibidas (cada fila es una palabra código)
         H_t: Matriz de chequeo de paridad del código (H_transpuesta)
-    
+        tc: Cantidad de errores corregibles (mejorCodigo)
+
     Returns:
         Ve: Matriz de palabras de codigo corregidas
     """
-    
-    # Calculamos sindromes
-    S = np.dot(R, H_t) % 2
-
-    for i in range(S.shape[0]): 
-        if np.sum(S[i]) != 0:
-            # Buscamos fila de H_t que coincide con el sindrome
-            for j in range(H_t.shape[0]):
-                if np.array_equal(S[i], H_t[j]):
-                    # Corregimos el error (invertimos bit de error)
-                    R[i][j] = (R[i][j] + 1) % 2
-                    break
+    # Sindromes empaquetados -> patrón de error de la tabla -> XOR sobre todas las palabras a la vez
+    tabla = tabla_lideres(H_t, tc)
+    R ^= tabla[sindromes(R, H_t)].astype(R.dtype)
     return R
 
 def detectar(R, H_t):
     """
-    Detecta (td = 2) errores en la matriz de palabras código recibidas R
-    
+    Detecta errores en la matriz de palabras código recibidas R
+
     Args:
         R: Matriz de palabras código recibidas (cada fila es una palabra código)
         H_t: Matriz de chequeo de paridad del código (H_transpuesta)
-    
+
+    Returns:
+        detectados: Máscara booleana de las palabras con errores detectados (síndrome no nulo)
+    """
+    return sindromes(R, H_t) != 0
+
+def libro_codigos(G):
+    """
+    Las 2^k palabras código de G, en el orden de los mensajes (fila i = mensaje i, bit 0 = más significativo).
+
+    Returns:
+        tuple: (palabras código uint8 (2^k x n), símbolos BPSK ±1 float32 (2^k x n))
+    """
+    clave = (np.asarray(G).tobytes(), G.shape)
+    if clave in _LIBROS:
+        return _LIBROS[clave]
+    k = G.shape[0]
+    mensajes = (np.arange(1 << k)[:, None] >> np.arange(k - 1, -1, -1)) & 1
+    C = (mensajes @ G % 2).astype(np.uint8)
+    _LIBROS[clave] = C, (2 * C.astype(np.float32) - 1)
+    return _LIBROS[clave]
+
+def decodificar_ml(Y, G):
+    """
+    Decodificación de máxima verosimilitud con decisión suave (canal AWGN, BPSK 0 -> -A, 1 -> +A).
+
+    La palabra ML es la de mayor correlación con la muestra recibida: se correlacionan bloques
+    de palabras con todo el libro de códigos en un único producto matricial float32 y se toma
+    el argmax. Pensado para k <= 12 (libro de hasta 4096 palabras).
+
+    Args:
+        Y: Matriz de muestras recibidas reales (cada fila es una palabra)
+        G: Matriz generadora del código (k x n)
+
+    Returns:
+        Ve: Matriz de palabras de codigo decodificadas
+    """
+    C, simbolos = libro_codigos(G)
+    Y = np.asarray(Y, dtype=np.float32)
+    indices = np.empty(len(Y), dtype=np.intp)
+    for inicio in range(0, len(Y), PALABRAS_ML):
+        bloque = Y[inicio:inicio + PALABRAS_ML]
+        indices[inicio:inicio + PALABRAS_ML] = np.argmax(bloque @ simbolos.T, axis=1)
+    return C[indices]
+
+def decodificar_chase(Y, H_t, tc=1, p=None):
+    """
+    Decodificación suave de tipo Chase (Chase-2) para códigos con k grande.
+
+    Invierte todas las combinaciones de los p bits menos confiables (menor |y|) de la decisión
+    dura, corrige cada una con la tabla de síndromes y se queda con la candidata de mayor
+    correlación con la muestra recibida. Sólo compiten las candidatas que quedan con síndrome
+    nulo (palabras código); si ninguna lo logra, se devuelve la decisión dura corregida.
+
+    Args:
+        Y: Matriz de muestras recibidas reales (cada fila es una palabra)
+        H_t: Matriz de chequeo de paridad del código (H_transpuesta)
+        tc: Cantidad de errores corregibles
+        p: Cantidad de posiciones poco confiables a probar (por defecto tc + 1)
+
     Returns:
-        detectados: Vector con indices de palabras con errores detectados
+        Ve: Matriz de palabras de codigo decodificadas
     """
+    p = tc + 1 if p is None else p
+    Y = np.asarray(Y, dtype=np.float32)
+    duras = (Y > 0).astype(np.int64)
+    menos_confiables = np.argsort(np.abs(Y), axis=1)[:, :p]
+    filas = np.arange(len(Y))[:, None]
 
-    S = np.dot(R, H_t) % 2
-    detectados = [i for i in range(S.shape[0]) if np.sum(S[i]) != 0]
-    return detectados
\ No newline at end of file
+    mejor = np.zeros_like(duras)
+    mejor_metrica = np.full(len(Y), -np.inf, dtype=np.float32)
+    for patron in range(1 << p):
+        # Bits del patrón de prueba sobre las p posiciones menos confiables
+        invertir = ((patron >> np.arange(p)) & 1).astype(np.int64)
+        candidata = duras.copy()
+        candidata[filas, menos_confiables] ^= invertir
+        candidata = corregir(candidata, H_t, tc)
+        metrica = np.einsum('ij,ij->i', 2 * candidata.astype(np.float32) - 1, Y)
+        metrica[sindromes(candidata, H_t) != 0] = -np.inf   # Más de tc errores: no es palabra código
+        mejores = metrica > mejor_metrica
+        mejor[mejores] = candidata[mejores]
+        mejor_metrica[mejores] = metrica[mejores]
+    sin_candidata = np.isneginf(mejor_metrica)
+    if sin_candidata.any():
+        mejor[sin_candidata] = corregir(duras[sin_candidata], H_t, tc)
+    return mejor
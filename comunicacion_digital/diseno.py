@@ -0,0 +1,212 @@
+from empaquetado import empaquetar, popcount
+from scipy.special import comb
+from itertools import combinations
+import numpy as np
+import argparse
+import os
+
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(__file__), '.cache_codigos')
+PALABRAS_POR_BLOQUE = 1 << 20  # Palabras código por bloque al enumerar
+
+
+def distribucion_pesos(G, H_t=None):
+    """
+    Distribución de pesos (enumerador de pesos) de un código binario lineal, exacta.
+
+    Recorre las 2^k palabras código en orden de código Gray: cada palabra difiere de la anterior
+    en una fila de G (la del bit menos significativo en 1 del índice), así que la secuencia
+    completa es un XOR acumulado de filas empaquetadas. Si se da H_t y n - k < k, se enumeran
+    en cambio las 2^(n-k) palabras del código dual y se aplica la identidad de MacWilliams.
+
+    Args:
+        G: Matriz generadora (k x n), n <= 64
+        H_t: Matriz de chequeo de paridad (n x (n-k)), opcional
+
+    Returns:
+        np.ndarray: A[w] = cantidad de palabras código de peso w, w = 0..n
+    """
+    k, n = G.shape
+    if H_t is not None and n - k < k:
+        return macwilliams(_enumerar_pesos(np.asarray(H_t).T), n, k)
+    return _enumerar_pesos(G)
+
+def _enumerar_pesos(G):
+    k, n = G.shape
+    filas = empaquetar(G)
+    pesos = np.zeros(n + 1, dtype=np.int64)
+    pesos[0] = 1                                   # Palabra nula
+    anterior = np.uint64(0)
+    for inicio in range(1, 1 << k, PALABRAS_POR_BLOQUE):
+        i = np.arange(inicio, min(inicio + PALABRAS_POR_BLOQUE, 1 << k), dtype=np.int64)
+        # Índice del bit menos significativo en 1 de i = fila que cambia en el paso i
+        cambios = np.log2(i & -i).astype(np.intp)
+        palabras = np.bitwise_xor.accumulate(filas[cambios]) ^ anterior
+        anterior = palabras[-1]
+        pesos += np.bincount(popcount(palabras), minlength=n + 1)
+    return pesos
+
+def macwilliams(pesos_dual, n, k):
+    """
+    Distribución de pesos de un código (n, k) a partir de la de su dual (identidad de MacWilliams):
+    A_w = 2^-(n-k) sum_j B_j K_w(j), con K_w(j) = sum_s (-1)^s C(j, s) C(n-j, w-s). Con enteros exactos.
+    """
+    A = []
+    for w in range(n + 1):
+        total = 0
+        for j, B in enumerate(pesos_dual):
+            if B:
+                krawtchouk = sum((-1)**s * comb(j, s, exact=True) * comb(n - j, w - s, exact=True)
+                                 for s in range(min(j, w) + 1))
+                total += int(B) * krawtchouk
+        A.append(total >> (n - k))
+    return np.array(A, dtype=np.int64)
+
+def distancia_minima(pesos):
+    """
+    Distancia mínima a partir de la distribución de pesos.
+    """
+    return int(np.flatnonzero(pesos[1:])[0] + 1)
+
+def cota_distancia(n, k):
+    """
+    Cota superior de la distancia mínima de un código (n, k): Singleton y Hamming.
+    """
+    def hamming(n, r, d):
+        # La esfera de radio t = (d-1)/2 debe entrar en los 2^r síndromes
+        return sum(comb(n, i, exact=True) for i in range((d - 1) // 2 + 1)) <= 2**r
+
+    d = n - k + 1
+    # Con d par se acota el código perforado (n-1, k, d-1), más ajustado que (n, k, d)
+    while d > 1 and not (hamming(n, n - k, d) if d % 2 else hamming(n - 1, n - 1 - k, d - 1)):
+        d -= 1
+    return d
+
+def matrices_sistematicas(P):
+    """
+    H_t (n x (n-k)) y G (k x n) de la forma sistemática con parte de paridad P (k x (n-k)).
+    """
+    k, r = P.shape
+    H_t = np.vstack([P, np.eye(r, dtype=int)])
+    G = np.hstack([np.eye(k, dtype=int), P])
+    return H_t, G
+
+def filas_iniciales(n, k, rng):
+    """
+    P inicial: filas distintas de peso >= 2, primero las de peso impar. Con H_t = [P; I], si todas
+    las filas de H_t tienen peso impar y son distintas, la distancia es al menos 4; si sólo son
+    distintas y no nulas, al menos 3. Si no alcanzan, el resto se completa al azar.
+    """
+    r = n - k
+    filas = []
+    for paridad in (1, 0):
+        for peso in range(2, r + 1):
+            if peso % 2 != paridad:
+                continue
+            for posiciones in combinations(range(r), peso):
+                if len(filas) == k:
+                    break
+                fila = np.zeros(r, dtype=int)
+                fila[list(posiciones)] = 1
+                filas.append(fila)
+    while len(filas) < k:
+        filas.append(rng.integers(0, 2, r))
+    return np.array(filas[:k], dtype=int).reshape(k, r)
+
+def _objetivo(pesos):
+    # Mayor distancia mínima y, a igual distancia, menos palabras de peso mínimo
+    d = distancia_minima(pesos)
+    return d, -int(pesos[d])
+
+def buscar_codigo(n, k, intentos=2000, semilla=0):
+    """
+    Busca la matriz de paridad P con la mayor distancia mínima para (n, k).
+
+    Parte de filas_iniciales y hace una búsqueda local: reemplaza una fila de P por otra al azar
+    y acepta el cambio si no empeora (distancia mínima, palabras de peso mínimo). Termina al
+    alcanzar cota_distancia o tras intentos cambios sin mejora. Cada evaluación enumera
+    min(2^k, 2^(n-k)) palabras (ver distribucion_pesos).
+
+    Args:
+        n (int): Longitud total del código
+        k (int): Longitud de la palabra de información
+        intentos (int): Cambios consecutivos sin mejora antes de detenerse
+        semilla (int): Semilla de la búsqueda
+
+    Returns:
+        tuple: (H_t, G, dmin, pesos)
+    """
+    rng = np.random.default_rng(semilla)
+    r = n - k
+    cota = cota_distancia(n, k)
+    P = filas_iniciales(n, k, rng)
+    H_t, G = matrices_sistematicas(P)
+    pesos = distribucion_pesos(G, H_t)
+    mejor = _objetivo(pesos)
+
+    sin_mejora = 0
+    while mejor[0] < cota and sin_mejora < intentos:
+        candidata = P.copy()
+        candidata[rng.integers(k)] = rng.integers(0, 2, r)
+        H_t, G = matrices_sistematicas(candidata)
+        pesos_candidata = distribucion_pesos(G, H_t)
+        objetivo = _objetivo(pesos_candidata)
+        sin_mejora = 0 if objetivo > mejor else sin_mejora + 1
+        if objetivo >= mejor:
+            P, pesos, mejor = candidata, pesos_candidata, objetivo
+
+    H_t, G = matrices_sistematicas(P)
+    return H_t, G, mejor[0], pesos
+
+def _ruta_cache(directorio, n, k, intentos, semilla):
+    # v2: búsqueda con cota de Hamming ajustada y P inicial de peso impar (invalida entradas anteriores).
+    # La clave incluye los parámetros de la búsqueda: con otro presupuesto se busca de nuevo
+    return os.path.join(directorio, f'codigo_v2_n{n}_k{k}_i{intentos}_s{semilla}.npz')
+
+def disenar_codigo(n, k, directorio=DIRECTORIO_CACHE, intentos=2000, semilla=0, forzar=False):
+    """
+    Código (n, k) con la mejor distancia mínima encontrada, leído de la caché en disco si existe.
+
+    Args:
+        n, k: Parámetros del código
+        directorio (str): Directorio de la caché
+        intentos, semilla: Parámetros de buscar_codigo (forman parte de la clave de la caché)
+        forzar (bool): Buscar de nuevo aunque haya una entrada en la caché (y reemplazarla)
+
+    Returns:
+        tuple: (H_t, G, dmin, pesos)
+    """
+    ruta = _ruta_cache(directorio, n, k, intentos, semilla)
+    if not forzar:
+        try:
+            with np.load(ruta) as datos:
+                return datos['H_t'], datos['G'], int(datos['dmin']), datos['pesos']
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            pass
+
+    H_t, G, dmin, pesos = buscar_codigo(n, k, intentos, semilla)
+    # Escritura atómica: otro proceso puede estar leyendo la misma entrada
+    os.makedirs(directorio, exist_ok=True)
+    temporal = f'{ruta}.{os.getpid()}.tmp.npz'
+    np.savez(temporal, H_t=H_t, G=G, dmin=dmin, pesos=pesos)
+    os.replace(temporal, ruta)
+    return H_t, G, dmin, pesos
+
+def main():
+    parser = argparse.ArgumentParser(description='Diseño de códigos lineales (n, k) con distancia mínima exacta')
+    parser.add_argument('n', type=int)
+    parser.add_argument('k', type=int)
+    parser.add_argument('--intentos', type=int, default=2000, help='Cambios sin mejora antes de detenerse')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla de la búsqueda')
+    parser.add_argument('--forzar', action='store_true', help='Buscar de nuevo aunque el código esté en la caché')
+    args = parser.parse_args()
+
+    _, G, dmin, pesos = disenar_codigo(args.n, args.k, intentos=args.intentos, semilla=args.semilla,
+                                       forzar=args.forzar)
+    print(f"({args.n}, {args.k}): dmin = {dmin} (cota {cota_distancia(args.n, args.k)}), "
+          f"tc = {(dmin - 1) // 2}")
+    print("Distribución de pesos:", {w: int(a) for w, a in enumerate(pesos) if a})
+    print("G =")
+    print(G)
+
+if __name__ == "__main__":
+    main()
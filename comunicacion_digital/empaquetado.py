@@ -0,0 +1,168 @@
+import numpy as np
+from decodificacion import tabla_lideres
+from csb import probabilidad_error, posiciones_error
+
+# Cantidad de unos de cada byte (popcount por tabla si NumPy no trae bitwise_count)
+POPCOUNT8 = np.array([bin(b).count('1') for b in range(256)], dtype=np.uint8)
+PALABRAS_POR_BLOQUE = 1 << 14  # Palabras por bloque al generar el ruido del canal
+
+
+def popcount(x):
+    """
+    Cantidad de bits en 1 de cada elemento de un array uint64.
+    """
+    x = np.asarray(x, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(x)
+    return POPCOUNT8[x.view(np.uint8)].reshape(*x.shape, 8).sum(axis=-1)
+
+def empaquetar(M):
+    """
+    Empaqueta cada fila de una matriz binaria en un uint64 (columna 0 = bit más significativo).
+
+    Args:
+        M: Matriz (palabras x ancho) con ancho <= 64
+
+    Returns:
+        np.ndarray: Un uint64 por fila
+    """
+    M = np.atleast_2d(M)
+    x = np.zeros(M.shape[0], dtype=np.uint64)
+    for j in range(M.shape[1]):
+        x <<= np.uint64(1)
+        x |= M[:, j].astype(np.uint64)
+    return x
+
+def desempaquetar(x, ancho):
+    """
+    Inversa de empaquetar.
+
+    Returns:
+        np.ndarray: Matriz (palabras x ancho) int64
+    """
+    desplazamientos = np.arange(ancho - 1, -1, -1, dtype=np.uint64)
+    return ((np.asarray(x, dtype=np.uint64)[:, None] >> desplazamientos) & np.uint64(1)).astype(np.int64)
+
+def random_U_empaquetado(palabras, k, rng=None):
+    """
+    Genera palabras fuente aleatorias de k bits, una por uint64.
+    """
+    x = np.frombuffer((np.random if rng is None else rng).bytes(8 * palabras), dtype=np.uint64)
+    return x >> np.uint64(64 - k)
+
+def tablas_lineales(filas):
+    """
+    Precalcula una aplicación lineal sobre GF(2) como tablas de 256 entradas por byte de entrada.
+
+    La salida para una entrada x es el XOR de filas[i] para cada bit i de x en 1 (bit 0 de la
+    entrada = bit más significativo). Cada tabla resuelve 8 bits de entrada con una consulta.
+
+    Args:
+        filas: Matriz binaria (ancho de entrada x ancho de salida)
+
+    Returns:
+        list: (desplazamiento, tabla uint64 de 256 entradas) por cada byte de la entrada
+    """
+    filas_emp = empaquetar(filas)
+    m = len(filas_emp)
+    bytes_ = np.arange(256, dtype=np.uint64)
+    tablas = []
+    for inicio in range(0, m, 8):
+        ancho = min(8, m - inicio)
+        tabla = np.zeros(256, dtype=np.uint64)
+        for b in range(ancho):
+            # Bit b del grupo (desde el más significativo) selecciona la fila inicio + b
+            seleccion = ((bytes_ >> np.uint64(ancho - 1 - b)) & np.uint64(1)).astype(bool)
+            tabla[seleccion] ^= filas_emp[inicio + b]
+        tablas.append((m - inicio - ancho, tabla[:1 << ancho]))
+    return tablas
+
+def aplicar_lineal(x, tablas, out=None):
+    """
+    Aplica una aplicación lineal precalculada con tablas_lineales a un array de uint64.
+    (out: array uint64 opcional donde escribir el resultado)
+    """
+    y = np.zeros(len(x), dtype=np.uint64) if out is None else out
+    y[:] = 0
+    for desplazamiento, tabla in tablas:
+        y ^= tabla[(x >> np.uint64(desplazamiento)) & np.uint64(len(tabla) - 1)]
+    return y
+
+class CodigoEmpaquetado:
+    """
+    Tablas precalculadas de un código (n, k) para simular con una palabra por uint64.
+    """
+    def __init__(self, H_t, G, tc):
+        self.n, self.k = G.shape[1], G.shape[0]
+        self.codificacion = tablas_lineales(G)                 # u (k bits) -> v (n bits)
+        self.sindrome = tablas_lineales(H_t)                   # r (n bits) -> s (n-k bits)
+        self.lideres = empaquetar(tabla_lideres(H_t, tc))      # s -> patrón de error (n bits)
+
+    def codificar(self, u, out=None):
+        return aplicar_lineal(u, self.codificacion, out)
+
+    def sindromes(self, r):
+        return aplicar_lineal(r, self.sindrome)
+
+    def corregir(self, r):
+        return r ^ self.lideres[self.sindromes(r).astype(np.intp)]
+
+    def detectar(self, r):
+        return self.sindromes(r) != 0
+
+    def mensaje(self, v):
+        # Código sistemático: los k bits de información son los más significativos
+        return v >> np.uint64(self.n - self.k)
+
+def canalCSB_empaquetado(n, k, A, EbfN0, v, rng=None, out=None):
+    """
+    Canal AWGN con modulación BPSK y detección dura sobre palabras empaquetadas.
+
+    Equivale a canalCSB: sólo se usa la parte real del ruido (la imaginaria no afecta la
+    decisión), y el ruido se genera por bloques de palabras para acotar la memoria.
+
+    Args:
+        n: Largo de palabra de código
+        k: Largo de palabra de fuente
+        A: Amplitud de la señal BPSK
+        EbfN0: Cociente Eb/N0 deseado (en veces)
+        v: Palabras código empaquetadas (uint64)
+        rng: np.random.Generator para el ruido (opcional; por defecto el estado global de np.random)
+        out: Array uint64 opcional donde escribir las palabras recibidas
+
+    Returns:
+        np.ndarray: Palabras recibidas empaquetadas
+    """
+    Es = A**2
+    Ebf = Es * n / k
+    N0 = Ebf / EbfN0
+    sigma = np.sqrt(N0 / 2)
+
+    normal = np.random.standard_normal if rng is None else rng.standard_normal
+    r = np.empty_like(v) if out is None else out
+    for inicio in range(0, len(v), PALABRAS_POR_BLOQUE):
+        bloque = v[inicio:inicio + PALABRAS_POR_BLOQUE]
+        bits = desempaquetar(bloque, n).astype(bool)
+        # Error cuando el ruido supera la amplitud en sentido contrario al símbolo enviado
+        ruido = sigma * normal(bits.shape)
+        errores = np.where(bits, ruido <= -A, ruido > A)
+        r[inicio:inicio + PALABRAS_POR_BLOQUE] = bloque ^ empaquetar(errores)
+    return r
+
+def patron_errores_empaquetado(palabras, n, p, rng=None):
+    """
+    Patrones de error empaquetados de palabras palabras de n bits, cada bit con error con probabilidad p.
+    """
+    e = np.zeros(palabras, dtype=np.uint64)
+    posiciones = posiciones_error(palabras * n, p, rng)
+    # Posición p: palabra p // n, columna p % n (columna 0 = bit más significativo)
+    indices, columnas = np.divmod(posiciones, n)
+    np.bitwise_xor.at(e, indices, np.uint64(1) << (n - 1 - columnas).astype(np.uint64))
+    return e
+
+def canalCSB_errores_empaquetado(n, k, A, EbfN0, v, rng=None, out=None):
+    """
+    Igual que canalCSB_errores sobre palabras empaquetadas: XOR de los bits sorteados con error.
+    """
+    e = patron_errores_empaquetado(len(v), n, probabilidad_error(n, k, EbfN0), rng)
+    return np.bitwise_xor(v, e, out=out)
@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.special import erfc, erfcinv, comb
+from scipy.stats import beta
 import pandas as pd
 import os
 
@@ -17,17 +18,56 @@ def Qinv(p):
     p = np.asarray(p)
     return np.sqrt(2) * erfcinv(2 * p)
 
-def random_U(n: int, k:int):
+def intervalo_confianza(errores, total, confianza=0.95, metodo='wilson'):
+    """
+    Intervalo de confianza de una proporción errores/total (escalar o vectorial).
+
+    Args:
+        errores: Cantidad de eventos de error
+        total: Cantidad de ensayos
+        confianza: Nivel de confianza
+        metodo: 'wilson' o 'clopper-pearson' (exacto, conservador)
+
+    Returns:
+        tuple: (inferior, superior)
+    """
+    e = np.asarray(errores, dtype=float)
+    N = np.maximum(np.asarray(total, dtype=float), 1)
+    alfa = 1 - confianza
+    if metodo == 'wilson':
+        z = Qinv(alfa / 2)
+        p = e / N
+        centro = (p + z**2 / (2 * N)) / (1 + z**2 / N)
+        radio = z / (1 + z**2 / N) * np.sqrt(p * (1 - p) / N + z**2 / (4 * N**2))
+        return np.where(e > 0, np.maximum(centro - radio, 0), 0.0), np.minimum(centro + radio, 1)
+    if metodo == 'clopper-pearson':
+        inferior = np.where(e > 0, beta.ppf(alfa / 2, np.maximum(e, 1), N - e + 1), 0.0)
+        superior = np.where(e < N, beta.ppf(1 - alfa / 2, e + 1, np.maximum(N - e, 1)), 1.0)
+        return inferior, superior
+    raise ValueError(f"Método de intervalo desconocido: {metodo}")
+
+def random_U(n: int, k:int, rng=None):
     """
     Genera una matriz U de n palabras de longitud k en GF(2)
+    (rng: np.random.Generator opcional; por defecto el estado global de np.random)
+    """
+    if rng is None:
+        return np.random.randint(0, 2, (n, k))
+    return rng.integers(0, 2, (n, k))
+
+def bloques_palabras(PALABRAS, palabras_bloque):
+    """
+    Genera los tamaños de los bloques en que se procesan PALABRAS palabras.
     """
-    return np.random.randint(0, 2, (n, k))
+    for inicio in range(0, PALABRAS, palabras_bloque):
+        yield min(palabras_bloque, PALABRAS - inicio)
 
-def graficos_corrector(Ebn_c, P_eb, Gc, Ga, n, k, tc):
+def graficos_corrector(Ebn_c, P_eb, Gc, Ga, n, k, tc, analitica=None):
     """
     Genera gráficos para el modo CORRECTOR:
     - Curvas de tasa de error de bit y teórica
     - Ganancia asintótica y ganancia real
+    analitica: (Eb/N0 [dB], P_eb) exacta de analitico.tasas_analiticas (opcional)
     """
     Ebn_c = np.asarray(Ebn_c)         # Eb/N0 [dB]
     P_eb = np.asarray(P_eb)           # Tasa de error de bit
@@ -45,6 +85,8 @@ def graficos_corrector(Ebn_c, P_eb, Gc, Ga, n, k, tc):
     axs[0].semilogy(Ebn_c, P_eb, 'o-', label=r'$P_{eb}$ (codificada - simulacion)')
     axs[0].semilogy(Ebn_c, P_eb_teorica, '--', label=r'$P_{eb}$ (codificada - teórica)')
     axs[0].semilogy(Ebn_c, Q_teorica, '--', label=r'$Q(\sqrt{2 E_b/N_0})$ (sin codificar - teórica)')
+    if analitica is not None:
+        axs[0].semilogy(*analitica, 'k-', lw=1, label=r'$P_{eb}$ (codificada - exacta)')
     axs[0].set_xticks(np.arange(np.min(Ebn_c), np.max(Ebn_c) + 1, 1))
     axs[0].grid(True, which="both", ls="-", alpha=0.2)
     axs[0].set_yscale('log')
@@ -68,11 +110,12 @@ def graficos_corrector(Ebn_c, P_eb, Gc, Ga, n, k, tc):
     plt.savefig(os.path.join(graficos_dir, 'CORRECTOR.png'))
     plt.show()
 
-def graficos_detector(Ebn_c, P_ep, n, k, td):
+def graficos_detector(Ebn_c, P_ep, n, k, td, analitica=None):
     """
     Genera gráficos para el modo DETECTOR:
     - Curvas de tasa de error de palabra y teórica
     Todos los argumentos deben ser np.arrays.
+    analitica: (Eb/N0 [dB], P_ep) exacta de analitico.tasas_analiticas (opcional)
     """
     Ebn_c = np.asarray(Ebn_c) # Eb/n0 del canal [dB]
     P_ep = np.asarray(P_ep) # Tasa de error de palabra
@@ -86,6 +129,8 @@ def graficos_detector(Ebn_c, P_ep, n, k, td):
     ax.semilogy(Ebn_c, P_ep, 'o-', label=r'$P_{ep}$ (codificada - simulacion)')
     ax.semilogy(Ebn_c , P_ep_teorica, '--', label=r'$P_{ep}$ (codificada - teórica)')
     ax.semilogy(Ebn_c, Q_teorica, '--', label=r'$Q(\sqrt{2 E_b/N_0})$ (sin codificar - teórica)')
+    if analitica is not None:
+        ax.semilogy(*analitica, 'k-', lw=1, label=r'$P_{ep}$ (codificada - exacta)')
     ax.set_xticks(np.arange(np.min(Ebn_c), np.max(Ebn_c) + 1, 1))
     ax.grid(True, which="both", ls="-", alpha=0.2)
     ax.set_yscale('log')
@@ -100,10 +145,41 @@ def graficos_detector(Ebn_c, P_ep, n, k, td):
     plt.savefig(os.path.join(graficos_dir, 'DETECTOR.png'))
     plt.show()
 
-def simulation_table(Ebn_c, P_ep, P_eb, Gc, Ga):
+def graficos_comparacion(df):
+    """
+    Genera gráficos de comparación entre códigos (tabla de barrido.barrido_comun):
+    - P_ep de cada código en modo DETECTOR
+    - P_eb de cada código en modo CORRECTOR
+    Ambos con su intervalo de confianza y la curva sin codificar.
+    """
+    fig, axs = plt.subplots(1, 2, figsize=(14, 6))
+    for ax, (modo, tasa) in zip(axs, (('DETECTOR', 'P_ep'), ('CORRECTOR', 'P_eb'))):
+        filas = df[df['MODO'] == modo]
+        for codigo, curva in filas.groupby('Código', sort=False):
+            Ebn_c = curva['Eb/N0 [dB]'].to_numpy()
+            linea, = ax.semilogy(Ebn_c, curva[tasa], 'o-', label=f'{codigo}, dmin = {curva["dmin"].iloc[0]}')
+            ax.fill_between(Ebn_c, curva[f'{tasa} inf'], curva[f'{tasa} sup'], color=linea.get_color(), alpha=0.2)
+        Ebn_c = np.unique(df['Eb/N0 [dB]'])
+        ax.semilogy(Ebn_c, Q(np.sqrt(2 * 10**(Ebn_c/10))), 'k--', label=r'$Q(\sqrt{2 E_b/N_0})$ (sin codificar - teórica)')
+        ax.set_xticks(np.arange(np.min(Ebn_c), np.max(Ebn_c) + 1, 1))
+        ax.grid(True, which="both", ls="-", alpha=0.2)
+        ax.set_xlabel('Eb/N0 [dB]')
+        ax.set_ylabel(f'${tasa}$')
+        ax.set_title(f'Comparación de códigos - MODO: {modo}')
+        ax.legend()
+
+    plt.tight_layout()
+    graficos_dir = os.path.join(os.path.dirname(__file__), 'graficos')
+    os.makedirs(graficos_dir, exist_ok=True)
+    plt.savefig(os.path.join(graficos_dir, 'COMPARACION.png'))
+    plt.show()
+
+def simulation_table(Ebn_c, P_ep, P_eb, Gc, Ga, intervalos=None):
     """
     Crea y retorna una tabla (DataFrame) con los resultados de la simulación.
     Todos los argumentos deben ser np.arrays.
+    intervalos: diccionario de Simulacion (o SimulacionImportancia) con las cotas de confianza
+    y los conteos o varianzas (opcional)
     """
     Ebn_c = np.asarray(Ebn_c)
     P_ep = np.asarray(P_ep)
@@ -117,6 +193,15 @@ def simulation_table(Ebn_c, P_ep, P_eb, Gc, Ga):
         'Gc (dB)': Gc,
         'Ga (dB)': Ga_arr
     })
+    if intervalos is not None:
+        columnas = {
+            'P_ep_inf': 'P_ep inf', 'P_ep_sup': 'P_ep sup', 'P_eb_inf': 'P_eb inf', 'P_eb_sup': 'P_eb sup',
+            'var_ep': 'Var P_ep', 'var_eb': 'Var P_eb', 'palabras': 'Palabras',
+            'e_p': 'Errores de palabra', 'e_b': 'Errores de bit',
+        }
+        for clave, columna in columnas.items():
+            if clave in intervalos:
+                df[columna] = intervalos[clave]
     return df
 
     
@@ -0,0 +1,252 @@
+from contextlib import contextmanager, nullcontext
+import numpy as np
+import pandas as pd
+import tracemalloc
+import platform
+import time
+import json
+import csv
+import os
+
+# Etapas de una iteración de Simulacion, en orden
+ETAPAS = ('fuente', 'codificacion', 'canal', 'decodificacion', 'descarte', 'conteo')
+_NULO = nullcontext()
+
+
+class SinPerfil:
+    """
+    Perfil desactivado: etapa() devuelve siempre el mismo contexto vacío (costo de una llamada por bloque).
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        pass
+
+    def etapa(self, nombre):
+        return _NULO
+
+    def resultado(self):
+        return None
+
+SIN_PERFIL = SinPerfil()
+
+
+class Perfil:
+    """
+    Acumula el tiempo de cada etapa y, con memoria=True, el pico de memoria (tracemalloc)
+    reservada dentro de la etapa. Se usa como contexto alrededor de la unidad medida:
+
+        with Perfil() as perfil:
+            iteracion(..., perfil=perfil)
+        perfil.resultado()
+    """
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.tiempos = dict.fromkeys(ETAPAS, 0.0)
+        self.picos = dict.fromkeys(ETAPAS, 0)
+        self.total = 0.0
+        self._iniciado = False
+
+    def __enter__(self):
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciado = True
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.total += time.perf_counter() - self._inicio
+        if self._iniciado:
+            tracemalloc.stop()
+            self._iniciado = False
+
+    @contextmanager
+    def etapa(self, nombre):
+        if self.memoria:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tiempos[nombre] += time.perf_counter() - inicio
+            if self.memoria:
+                self.picos[nombre] = max(self.picos[nombre], tracemalloc.get_traced_memory()[1] - base)
+
+    def resultado(self):
+        """
+        Diccionario serializable (se devuelve desde los procesos del pool).
+        """
+        return {'tiempos': dict(self.tiempos), 'picos': dict(self.picos) if self.memoria else None,
+                'total': self.total}
+
+
+def acumular(acumulado, resultado):
+    """
+    Suma a acumulado (dict de Perfil.resultado(), o None) el resultado de otra unidad:
+    tiempos y total se suman, los picos de memoria se toman como máximo.
+    """
+    if acumulado is None:
+        return {'tiempos': dict(resultado['tiempos']),
+                'picos': None if resultado['picos'] is None else dict(resultado['picos']),
+                'total': resultado['total'], 'unidades': 1}
+    for etapa, t in resultado['tiempos'].items():
+        acumulado['tiempos'][etapa] += t
+    if resultado['picos'] is not None:
+        for etapa, pico in resultado['picos'].items():
+            acumulado['picos'][etapa] = max(acumulado['picos'][etapa], pico)
+    acumulado['total'] += resultado['total']
+    acumulado['unidades'] += 1
+    return acumulado
+
+def tabla_perfil(EbN0_c, perfiles, palabras, k):
+    """
+    Tabla con una fila por (Eb/N0, etapa), más una fila 'total' por punto.
+
+    Las velocidades son de un proceso: palabras (y bits de fuente) generadas en el punto sobre
+    el tiempo acumulado de la etapa en todas las tandas.
+
+    Args:
+        EbN0_c: Puntos de Eb/N0 [dB]
+        perfiles: Lista (uno por punto) de diccionarios de acumular(), o None si el punto no se simuló
+        palabras: Palabras generadas en las tandas medidas de cada punto
+        k: Bits de fuente por palabra
+
+    Returns:
+        pd.DataFrame: Columnas Eb/N0 [dB], Etapa, Tiempo [s], Fracción, Palabras/s, Bits/s, Pico memoria [bytes]
+    """
+    filas = []
+    for EbN0, perfil, N in zip(EbN0_c, perfiles, palabras):
+        if perfil is None:
+            continue
+        # Las etapas que no se usan en el modo simulado (p. ej. descarte en CORRECTOR) no se listan
+        etapas = [(etapa, t) for etapa, t in perfil['tiempos'].items() if t > 0] + [('total', perfil['total'])]
+        for etapa, t in etapas:
+            pico = None
+            if perfil['picos'] is not None:
+                pico = max(perfil['picos'].values()) if etapa == 'total' else perfil['picos'][etapa]
+            filas.append({
+                'Eb/N0 [dB]': float(EbN0), 'Etapa': etapa, 'Tiempo [s]': t,
+                'Fracción': t / perfil['total'] if perfil['total'] else np.nan,
+                'Palabras/s': N / t if t else np.nan, 'Bits/s': k * N / t if t else np.nan,
+                'Pico memoria [bytes]': pico,
+            })
+    return pd.DataFrame(filas)
+
+def guardar_traza(ruta, tabla, configuracion):
+    """
+    Guarda la tabla de perfil como JSON, con la configuración de la corrida y datos del entorno.
+    """
+    os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+    filas = json.loads(tabla.to_json(orient='records'))
+    with open(ruta, 'w') as archivo:
+        json.dump({'entorno': entorno(), 'configuracion': configuracion, 'perfil': filas}, archivo, indent=2)
+    return ruta
+
+def imprimir_perfil(tabla):
+    """
+    Resumen por punto: tiempo y velocidad de cada etapa.
+    """
+    for EbN0, filas in tabla.groupby('Eb/N0 [dB]', sort=False):
+        partes = [f"{fila['Etapa']} {fila['Tiempo [s]']:.2f} s ({100 * fila['Fracción']:.0f}%)"
+                  for _, fila in filas.iterrows() if fila['Etapa'] != 'total']
+        total = filas[filas['Etapa'] == 'total'].iloc[0]
+        print(f"Perfil - Eb/N0: {EbN0:.2f} dB, {total['Palabras/s']:.3g} palabras/s, "
+              f"{total['Bits/s']:.3g} bits/s: " + ', '.join(partes))
+
+
+def entorno():
+    """
+    Datos del entorno de una medición (versiones, plataforma, núcleos y fecha), para trazas y benchmarks.
+    """
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor(),
+        'nucleos': os.cpu_count(),
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def medir(funcion, *args, repeticiones=5):
+    """
+    Devuelve la mediana del tiempo (en segundos) de varias ejecuciones, después de una
+    ejecución de calentamiento (tablas de síndromes en caché), y el resultado de la última.
+    """
+    resultado = funcion(*args)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos)), resultado
+
+
+def memoria_pico(funcion, *args):
+    """
+    Pico de memoria (bytes) reservada por Python/NumPy durante una ejecución, medido con tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        funcion(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def guardar_resultados(filas, nombre, directorio):
+    """
+    Guarda los resultados de un benchmark como JSON (con datos del entorno) y CSV.
+
+    Returns:
+        str: Ruta del archivo JSON
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta_json = os.path.join(directorio, f'{nombre}.json')
+    with open(ruta_json, 'w') as archivo:
+        json.dump({'entorno': entorno(), 'resultados': filas}, archivo, indent=2)
+    with open(os.path.join(directorio, f'{nombre}.csv'), 'w', newline='') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(filas[0].keys()))
+        escritor.writeheader()
+        escritor.writerows(filas)
+    return ruta_json
+
+
+def comparar_resultados(ruta_base, ruta_nueva, claves, etapas, umbral=0.2, minimo=1e-3):
+    """
+    Compara dos corridas de un benchmark y lista las etapas que empeoraron más que el umbral.
+
+    Args:
+        ruta_base (str): JSON de referencia
+        ruta_nueva (str): JSON a evaluar
+        claves: Campos que identifican cada caso
+        etapas: Etapas comparadas (métricas t_<etapa> y mem_<etapa>)
+        umbral (float): Aumento relativo tolerado (0.2 = 20 %)
+        minimo (float): Tiempos por debajo de este valor [s] se ignoran (ruido de medición)
+
+    Returns:
+        list: Regresiones (caso, métrica, valor base, valor nuevo, cociente)
+    """
+    def indexar(ruta):
+        with open(ruta) as archivo:
+            filas = json.load(archivo)['resultados']
+        return {tuple(f[c] for c in claves): f for f in filas}
+
+    base, nueva = indexar(ruta_base), indexar(ruta_nueva)
+    regresiones = []
+    for caso in sorted(base.keys() & nueva.keys()):
+        for metrica in [f't_{e}' for e in etapas] + [f'mem_{e}' for e in etapas]:
+            if metrica not in base[caso] or metrica not in nueva[caso]:
+                continue
+            anterior, actual = base[caso][metrica], nueva[caso][metrica]
+            if metrica.startswith('t_') and max(anterior, actual) < minimo:
+                continue
+            if anterior > 0 and actual / anterior > 1 + umbral:
+                regresiones.append((caso, metrica, anterior, actual, actual / anterior))
+
+    for caso, metrica, anterior, actual, cociente in regresiones:
+        print(f"REGRESIÓN {caso} {metrica}: {anterior:.4g} -> {actual:.4g} (x{cociente:.2f})")
+    print(f"{len(base.keys() & nueva.keys())} casos comparados, {len(regresiones)} regresiones")
+    return regresiones
@@ -1,9 +1,17 @@
-from helpers import random_U, graficos_corrector, graficos_detector, simulation_table, Qinv, Q
-from codificacion import matrizGeneradora, mejorCodigo 
-from decodificacion import corregir, detectar
-from csb import canalCSB
+from helpers import random_U, graficos_corrector, graficos_detector, simulation_table, intervalo_confianza, bloques_palabras, Qinv, Q
+from codificacion import matrizGeneradora
+from diseno import disenar_codigo
+from decodificacion import corregir, detectar, decodificar_ml, decodificar_chase
+from csb import canalCSB, canalCSB_errores, probabilidad_error
+from empaquetado import CodigoEmpaquetado, random_U_empaquetado, canalCSB_empaquetado, canalCSB_errores_empaquetado, popcount
+from muestreo_importancia import SimulacionImportancia
+from analitico import tasas_analiticas, prob_no_detectado, MAX_N_ENUMERACION
+import almacen as almacen_resultados
+from tuberia import iteracion_tuberia
+from instrumentacion import Perfil, SIN_PERFIL, acumular, tabla_perfil, guardar_traza, imprimir_perfil
+from concurrent.futures import ProcessPoolExecutor
+from collections import namedtuple
 import numpy as np
-from scipy.special import erfcinv
 import os
 
 
@@ -17,9 +25,219 @@ import os
 # Ga: Ganancia de codigo asintotica [dB]
 
 
-def Simulacion(EbN0_c, n, k, dmin, MODO, A = 1):
+# Canales por modo: 'awgn' sortea el ruido gaussiano; 'errores' sortea directamente las posiciones
+# con error del canal binario simétrico equivalente (costo proporcional a la cantidad de errores)
+CANALES = {'awgn': canalCSB, 'errores': canalCSB_errores}
+CANALES_EMPAQUETADOS = {'awgn': canalCSB_empaquetado, 'errores': canalCSB_errores_empaquetado}
+
+# Memoria aproximada por proceso para los arreglos de un bloque de palabras [bytes]
+MEMORIA_BLOQUE = 64 << 20
+# Palabras por Generator dentro de una tanda (ver bloques_trozos); los bloques son múltiplos de este valor
+PALABRAS_TROZO = 1 << 14
+
+
+def bytes_por_palabra(n, k, empaquetado=False, tuberia=False):
+    """
+    Estimación de los bytes que ocupa cada palabra de un bloque durante una iteración
+    (fuente, código, ruido, recepción y decodificación).
+    """
+    if tuberia:
+        # Dos buffers de ruido float32 y mensajes uint8, más los temporales de canal y decodificación
+        return 2 * (4 * n + (8 if empaquetado else k)) + (4 if empaquetado else 28) * n
+    if empaquetado:
+        return 64
+    return 8 * k + 64 * n
+
+def bloques_trozos(PALABRAS, palabras_bloque, rng=None):
+    """
+    Divide una tanda en bloques (palabras_bloque redondeado a un múltiplo de PALABRAS_TROZO) y cada
+    bloque en trozos de PALABRAS_TROZO palabras, cada uno con su propio Generator derivado de rng
+    (rng.spawn; None = estado global de np.random). Cada palabra usa siempre los mismos números
+    aleatorios, así que los conteos no dependen del tamaño de bloque.
+
+    Yields:
+        tuple: (m, [(inicio, fin, Generator), ...]) - palabras del bloque y sus trozos (índices en el bloque)
+    """
+    palabras_bloque = max(PALABRAS_TROZO, palabras_bloque // PALABRAS_TROZO * PALABRAS_TROZO)
+    cantidad = -(-PALABRAS // PALABRAS_TROZO)
+    generadores = iter([None] * cantidad if rng is None else rng.spawn(cantidad))
+    for m in bloques_palabras(PALABRAS, palabras_bloque):
+        yield m, [(inicio, min(inicio + PALABRAS_TROZO, m), next(generadores)) for inicio in range(0, m, PALABRAS_TROZO)]
+
+def iteracion(PALABRAS, n, k, A, EbfN0, H_t, G, MODO, tc, rng=None, palabras_bloque=None, canal='awgn',
+              decision='dura', perfil=SIN_PERFIL):
+    """
+    Simula PALABRAS palabras (un bit por elemento) y cuenta los errores.
+
+    Las palabras se procesan por bloques de palabras_bloque (generar -> codificar -> canal ->
+    decodificar -> contar), conservando sólo los contadores. Los mensajes, las palabras código y
+    las recibidas se escriben en buffers de un bloque reutilizados entre bloques; los temporales
+    de la decodificación (síndromes, máscaras) se crean por bloque. Así la memoria depende del
+    bloque y no de PALABRAS. Mensajes y ruido se sortean por trozos (ver bloques_trozos): con el
+    mismo rng los conteos no dependen de palabras_bloque. canal elige el modelo de canal (ver CANALES).
+
+    En CORRECTOR, decision = 'ml' o 'chase' decodifica con las muestras reales del canal AWGN
+    (decodificar_ml / decodificar_chase) en lugar de la detección dura.
+
+    perfil (instrumentacion.Perfil) acumula el tiempo de cada etapa (ver instrumentacion.ETAPAS).
+    Returns:
+        tuple: (e_p, e_b, palabras) - errores de palabra, de bit y palabras evaluadas
+        (en DETECTOR, las no descartadas)
+    """
+    suave = MODO and decision != 'dura'
+    bloques = list(bloques_trozos(PALABRAS, palabras_bloque or PALABRAS, rng))
+    maximo = max((m for m, _ in bloques), default=0)
+    # Buffers de un bloque, reutilizados entre bloques
+    U_bloque = np.empty((maximo, k), dtype=np.int64)
+    V_bloque = np.empty((maximo, n), dtype=np.int64)
+    R_bloque = np.empty((maximo, n), dtype=np.float32 if suave else np.int64)
+    simular_canal = CANALES[canal]
+    e_p = e_b = palabras = 0
+    for m, trozos in bloques:
+        U, V, R = U_bloque[:m], V_bloque[:m], R_bloque[:m]
+        with perfil.etapa('fuente'):
+            for inicio, fin, g in trozos:
+                U[inicio:fin] = random_U(fin - inicio, k, g)          # Palabras fuente random
+        with perfil.etapa('codificacion'):
+            np.dot(U, G, out=V)                                       # Codificar palabras fuente
+            V %= 2
+        with perfil.etapa('canal'):
+            for inicio, fin, g in trozos:
+                if suave:
+                    R[inicio:fin] = canalCSB(n, k, A, EbfN0, V[inicio:fin], g, suave=True)  # Muestras reales
+                else:
+                    R[inicio:fin] = simular_canal(n, k, A, EbfN0, V[inicio:fin], g)         # Canal con ruido
+        if MODO:
+            with perfil.etapa('decodificacion'):
+                if suave:
+                    Ve = decodificar_ml(R, G) if decision == 'ml' else decodificar_chase(R, H_t, tc)
+                else:
+                    Ve = corregir(R, H_t, tc)                         # Decodificar palabras recibidas
+        else:
+            with perfil.etapa('decodificacion'):
+                detectados = detectar(R, H_t)
+            with perfil.etapa('descarte'):
+                Ve = R[~detectados]
+                U = U[~detectados]
+        with perfil.etapa('conteo'):
+            E = U != Ve[:, :k]
+            e_p += int((E.sum(axis=1) > 0).sum())
+            e_b += int(E.sum())
+            palabras += E.shape[0]
+    return e_p, e_b, palabras
+
+def iteracion_empaquetada(PALABRAS, codigo, A, EbfN0, MODO, rng=None, palabras_bloque=None, canal='awgn',
+                          perfil=SIN_PERFIL):
+    """
+    Igual que iteracion, con cada palabra en un uint64 (codigo: CodigoEmpaquetado).
+    """
+    n, k = codigo.n, codigo.k
+    bloques = list(bloques_trozos(PALABRAS, palabras_bloque or PALABRAS, rng))
+    maximo = max((m for m, _ in bloques), default=0)
+    # Mensajes, palabras código y recibidas de un bloque, reutilizados entre bloques
+    U_bloque = np.empty(maximo, dtype=np.uint64)
+    V_bloque = np.empty_like(U_bloque)
+    R_bloque = np.empty_like(U_bloque)
+    simular_canal = CANALES_EMPAQUETADOS[canal]
+    e_p = e_b = palabras = 0
+    for m, trozos in bloques:
+        U, R = U_bloque[:m], R_bloque[:m]
+        with perfil.etapa('fuente'):
+            for inicio, fin, g in trozos:
+                U[inicio:fin] = random_U_empaquetado(fin - inicio, k, g)             # Palabras fuente random
+        with perfil.etapa('codificacion'):
+            V = codigo.codificar(U, out=V_bloque[:m])                                 # XOR de las filas de G
+        with perfil.etapa('canal'):
+            for inicio, fin, g in trozos:
+                simular_canal(n, k, A, EbfN0, V[inicio:fin], g, out=R[inicio:fin])    # Simular canal con ruido
+        if MODO:
+            with perfil.etapa('decodificacion'):
+                Ve = codigo.corregir(R)
+        else:
+            with perfil.etapa('decodificacion'):
+                validas = ~codigo.detectar(R)
+            with perfil.etapa('descarte'):
+                U = U[validas]
+                Ve = R[validas]
+        with perfil.etapa('conteo'):
+            E = U ^ codigo.mensaje(Ve)
+            e_p += int(np.count_nonzero(E))
+            e_b += int(popcount(E).sum())
+            palabras += len(E)
+    return e_p, e_b, palabras
+
+# Unidad de trabajo del pool (ver crear_tarea)
+Tarea = namedtuple('Tarea', ['PALABRAS', 'n', 'k', 'A', 'EbfN0', 'H_t', 'G', 'MODO', 'tc', 'codigo', 'palabras_bloque',
+                             'canal', 'decision', 'perfil', 'hilos', 'semilla'])
+
+def crear_tarea(PALABRAS, n, k, EbfN0, H_t, G, MODO, tc, semilla, A=1, codigo=None, palabras_bloque=None,
+                canal='awgn', decision='dura', perfil=None, hilos=None, memoria_bloque=MEMORIA_BLOQUE):
+    """
+    Tarea de _unidad: una tanda de PALABRAS palabras de un punto Eb/N0 (EbfN0 en veces) con la
+    SeedSequence (o entero) semilla. codigo = CodigoEmpaquetado para el camino empaquetado; sin
+    palabras_bloque, se toma el bloque que entra en memoria_bloque bytes (ver bytes_por_palabra).
+    """
+    if palabras_bloque is None:
+        palabras_bloque = max(1, memoria_bloque // bytes_por_palabra(n, k, codigo is not None, bool(hilos)))
+    return Tarea(PALABRAS, n, k, A, EbfN0, H_t, G, MODO, tc, codigo, palabras_bloque, canal, decision, perfil, hilos,
+                 semilla)
+
+def _unidad(tarea):
+    """
+    Unidad de trabajo del pool: una tanda de palabras de un punto Eb/N0 con su propio Generator.
+
+    Returns:
+        tuple: (e_p, e_b, palabras, perfil), con perfil = Perfil.resultado() o None si perfil está apagado
+    """
+    t = tarea
+    rng = np.random.default_rng(t.semilla)
+    medicion = Perfil(memoria=t.perfil == 'memoria') if t.perfil else SIN_PERFIL
+    with medicion:
+        if t.hilos:
+            conteos = iteracion_tuberia(t.PALABRAS, t.n, t.k, t.A, t.EbfN0, t.MODO, t.semilla, t.hilos,
+                                        t.palabras_bloque, t.codigo, t.H_t, t.G, t.tc, t.decision, medicion)
+        elif t.codigo is not None:
+            conteos = iteracion_empaquetada(t.PALABRAS, t.codigo, t.A, t.EbfN0, t.MODO, rng, t.palabras_bloque,
+                                            t.canal, medicion)
+        else:
+            conteos = iteracion(t.PALABRAS, t.n, t.k, t.A, t.EbfN0, t.H_t, t.G, t.MODO, t.tc, rng, t.palabras_bloque,
+                                t.canal, t.decision, medicion)
+    return conteos + (medicion.resultado(),)
+
+def _detener(e_p, e_b, palabras, generadas, errores_objetivo, ancho_relativo, max_palabras, confianza, metodo_ic):
+    """
+    Criterio de parada del modo adaptivo para un punto Eb/N0.
+    """
+    if generadas >= max_palabras:
+        return True
+    if errores_objetivo is not None and e_p >= errores_objetivo and e_b >= errores_objetivo:
+        return True
+    if ancho_relativo is not None and e_p > 0:
+        inferior, superior = intervalo_confianza(e_p, palabras, confianza, metodo_ic)
+        return (superior - inferior) / (e_p / palabras) <= ancho_relativo
+    return False
+
+def Simulacion(EbN0_c, n, k, dmin, MODO, A = 1, empaquetado = False, procesos = None, semilla = None,
+               errores_objetivo = None, ancho_relativo = None, max_palabras = 10**9, palabras_lote = 10**6,
+               confianza = 0.95, metodo_ic = 'wilson', memoria_bloque = MEMORIA_BLOQUE,
+               canal = 'awgn', decision = 'dura', H_t = None, G = None, almacen = None, perfil = None, traza = None,
+               hilos = None, con_intervalos = False):
     """
     Simula el canal de comunicaciones y calcula las tasas de error de palabra y bit para un rango de energía/ruido.
+
+    Cada unidad de trabajo (una tanda de palabras de un punto Eb/N0) usa un np.random.Generator
+    propio derivado de SeedSequence(semilla) y del valor de Eb/N0, así que con la misma semilla el
+    resultado es idéntico bit a bit para cualquier cantidad de procesos y no depende de la grilla.
+
+    Sin errores_objetivo ni ancho_relativo se simulan ITERACIONES tandas de
+    max(1e6, 100/P_eb teorica) palabras por punto. Con alguno de ellos (modo adaptivo) se
+    simulan rondas de ITERACIONES tandas de palabras_lote palabras hasta que se observan
+    errores_objetivo errores de palabra y de bit, o el intervalo de confianza de P_ep tiene
+    un ancho relativo <= ancho_relativo, o se llega a max_palabras.
+
+    Cada tanda se procesa por bloques de palabras de unos memoria_bloque bytes, así que la
+    memoria de cada proceso no depende de la cantidad de palabras simuladas.
+
     Args:
         EbN0_c (array): Rango de energía/ruido con codigo [dB]
         n (int): Longitud del bloque
@@ -27,64 +245,224 @@ def Simulacion(EbN0_c, n, k, dmin, MODO, A = 1):
         tc (int): Longitud del codigo
         dmin (int): Distancia minima del codigo
         MODO (int): 0 = DETECTOR; 1 = CORRECTOR
+        empaquetado (bool): Una palabra por uint64 (n <= 64) en lugar de un int64 por bit
+        procesos (int): Cantidad de procesos (None = todos los núcleos, 1 = sin pool)
+        semilla (int): Semilla de la SeedSequence (None = entropía del sistema)
+        errores_objetivo (int): Errores de palabra y de bit a observar (modo adaptivo)
+        ancho_relativo (float): Ancho relativo del intervalo de P_ep buscado (modo adaptivo)
+        max_palabras (int): Tope de palabras por punto (modo adaptivo)
+        palabras_lote (int): Palabras por tanda (modo adaptivo)
+        confianza (float): Nivel de confianza de los intervalos
+        metodo_ic (str): 'wilson' o 'clopper-pearson'
+        memoria_bloque (int): Memoria aproximada por proceso para un bloque de palabras [bytes]
+        canal (str): 'awgn' (ruido gaussiano) o 'errores' (patrón de errores del canal binario
+            simétrico equivalente, mucho más rápido con Eb/N0 alto)
+        decision (str): En CORRECTOR, 'dura' (síndromes), 'ml' (máxima verosimilitud con decisión
+            suave, k <= 12) o 'chase' (Chase-2 con decisión suave); 'ml' y 'chase' requieren
+            canal 'awgn' y sin empaquetado
+        H_t, G: Matrices del código (p. ej. de diseno.disenar_codigo); por defecto matrizGeneradora(n, k, dmin)
+        almacen (str): Ruta de un almacén SQLite (ver almacen.py) donde se guarda cada tanda al
+            terminar. Las tandas ya guardadas con la misma semilla no se vuelven a simular (reanudación)
+            y las de otras semillas se suman a los conteos del punto (corridas extra; se informa por
+            punto). Sin modo adaptivo, un punto cuyas tandas de otras semillas ya suman las palabras
+            pedidas no se vuelve a simular
+        perfil (str): None (apagado), 'tiempo' (tiempo por etapa) o 'memoria' (además, pico de memoria
+            por etapa con tracemalloc, que hace más lenta la simulación); ver instrumentacion.py
+        traza (str): Ruta de un JSON donde guardar la tabla de perfil (requiere perfil)
+        hilos (int): None = generación en serie; si no, cada tanda genera mensajes (uint8) y ruido
+            (float32) con esa cantidad de hilos, en paralelo con la decodificación del bloque anterior
+            (ver tuberia.py). Sólo canal 'awgn'; misma estadística, otra secuencia de números
+        con_intervalos (bool): Devuelve además el diccionario intervalos
     Returns:
         P_ep (np.ndarray): Tasa de error de palabra
         P_eb (np.ndarray): Tasa de error de bit
+        intervalos (dict): Sólo con con_intervalos=True. Cotas 'P_ep_inf', 'P_ep_sup', 'P_eb_inf', 'P_eb_sup' y conteos
+            'e_p', 'e_b', 'palabras' (evaluadas) de cada punto. Con perfil, además 'perfil': tabla
+            (pd.DataFrame) con tiempo, palabras/s, bits/s y pico de memoria por punto y etapa
     """
-    P_ep = np.zeros_like(EbN0_c, dtype=float)
-    P_eb = np.zeros_like(EbN0_c, dtype=float)
+    if decision != 'dura' and (empaquetado or canal != 'awgn'):
+        raise ValueError("La decisión suave requiere canal 'awgn' y empaquetado=False")
+    if hilos and canal != 'awgn':
+        raise ValueError("La generación en tubería (hilos) requiere canal 'awgn'")
+    tc = (dmin - 1) // 2                      # Errores corregibles
     ITERACIONES = 10
-    
+    adaptivo = errores_objetivo is not None or ancho_relativo is not None
+    puntos = len(EbN0_c)
+    # Semilla de cada punto según su Eb/N0 (los bits del float como clave), independiente de la grilla
+    semilla = np.random.SeedSequence(semilla).entropy
+    semillas = [np.random.SeedSequence(semilla, spawn_key=(int(np.float64(EbN0).view(np.uint64)),))
+                for EbN0 in EbN0_c]
+    palabras_bloque = max(1, memoria_bloque // bytes_por_palabra(n, k, empaquetado, bool(hilos)))
+    if H_t is None:
+        H_t, G = matrizGeneradora(n, k, dmin) # Generar matrices de codigo (una vez para todos los puntos)
+    codigo = CodigoEmpaquetado(H_t, G, tc) if empaquetado else None
+
+    # Parámetros de las tareas y palabras por tanda de cada punto
+    parametros, lotes = [], []
     for i, EbN0 in enumerate(EbN0_c):
-        H_t, G = matrizGeneradora(n, k, dmin) # Generar matrices de codigo 
         EbfN0 = 10**(EbN0/10)                 # Eb/N0 [veces]
         P_eb_t = Q(np.sqrt(2 * EbfN0))        # Tasa de error de bit teorica (estimada)
         PALABRAS = int((100) * (1/P_eb_t)) 
         PALABRAS = PALABRAS if (PALABRAS > 1000000) else 1000000
-        
-        # Arrays para almacenar resultados de cada iteración
-        P_ep_iter = np.zeros(ITERACIONES)
-        P_eb_iter = np.zeros(ITERACIONES)
-        
-        for iter in range(ITERACIONES):
-            U = random_U(PALABRAS, k)             # Palabras fuente random
-            V = np.dot(U, G) % 2                  # Codificar palabras fuente
-            R = canalCSB(n, k, A, EbfN0, V)       # Simular canal con ruido
-            if MODO:
-                Ve = corregir(R, H_t)             # Decodificar palabras recibidas
-                Ue = Ve[:, :k]
-                E = U != Ue
-            else:
-                detectados = detectar(R, H_t)
-                Ve = np.delete(R, detectados, axis=0)
-                U = np.delete(U, detectados, axis=0)
-                Ue = Ve[:, :k]
-                E = U != Ue
-            e_p = (E.sum(axis=1) > 0).sum() 
-            P_ep_iter[iter] = e_p / E.shape[0] # Tasa de error de palabra
-            e_b = E.sum()
-            P_eb_iter[iter] = e_b / (k * E.shape[0]) # Tasa de error de bit
-        # Promedio de iteraciones
-        P_ep[i] = np.mean(P_ep_iter)
-        P_eb[i] = np.mean(P_eb_iter)
+        parametros.append(dict(n=n, k=k, EbfN0=EbfN0, H_t=H_t, G=G, MODO=MODO, tc=tc, A=A, codigo=codigo,
+                               palabras_bloque=palabras_bloque, canal=canal, decision=decision, perfil=perfil,
+                               hilos=hilos))
+        lotes.append(palabras_lote if adaptivo else PALABRAS)
+
+    # Conteos acumulados por punto
+    e_p = np.zeros(puntos, dtype=np.int64)
+    e_b = np.zeros(puntos, dtype=np.int64)
+    palabras = np.zeros(puntos, dtype=np.int64)
+    generadas = np.zeros(puntos, dtype=np.int64)
+    # Perfil acumulado por punto (sólo tandas simuladas en esta corrida)
+    perfiles = [None] * puntos
+    medidas = np.zeros(puntos, dtype=np.int64)
+
+    # Tandas ya guardadas: las de esta semilla se reutilizan, las de otras se suman al punto
+    guardadas = [{} for _ in range(puntos)]
+    conexion = None
+    if almacen is not None:
+        conexion = almacen_resultados.abrir(almacen)
+        configuracion = {
+            'n': n, 'k': k, 'dmin': dmin, 'modo': MODO, 'canal': canal, 'decision': decision,
+            'codigo': almacen_resultados.huella_codigo(G),
+            # Sin hilos los conteos no dependen del bloque sino de los trozos (ver bloques_trozos)
+            'flujo': f"{'empaquetado' if empaquetado else 'bits'}:trozo{PALABRAS_TROZO}"
+                     + (f":hilos{hilos}:{palabras_bloque}" if hilos else ''),
+        }
+        print(f"Almacén {almacen}: semilla {semilla}")
+        for i, EbN0 in enumerate(EbN0_c):
+            otras = 0
+            for (semilla_tanda, tanda), conteos in almacen_resultados.leer_tandas(conexion, configuracion, EbN0).items():
+                if semilla_tanda == str(semilla):
+                    guardadas[i][tanda] = conteos
+                else:
+                    otras += 1
+                    generadas[i] += conteos[0]
+                    e_p[i] += conteos[1]
+                    e_b[i] += conteos[2]
+                    palabras[i] += conteos[3]
+            if otras:
+                print(f"Eb/N0: {EbN0:.2f} dB, se suman {generadas[i]} palabras de {otras} tandas guardadas "
+                      f"con otras semillas")
+
+    activos = list(range(puntos))
+    if not adaptivo and conexion is not None:
+        # Puntos cuyas tandas de otras semillas ya cubren las palabras pedidas: no se simulan
+        # (se suman también las tandas guardadas de esta semilla, si las hay)
+        for i in [i for i in activos if generadas[i] >= lotes[i] * ITERACIONES]:
+            for conteos in guardadas[i].values():
+                generadas[i] += conteos[0]
+                e_p[i] += conteos[1]
+                e_b[i] += conteos[2]
+                palabras[i] += conteos[3]
+            activos.remove(i)
+            print(f"Eb/N0: {EbN0_c[i]:.2f} dB, cubierto por el almacén ({generadas[i]} palabras); no se simula")
+    if adaptivo:
+        activos = [i for i in activos if not _detener(e_p[i], e_b[i], palabras[i], generadas[i], errores_objetivo,
+                                                      ancho_relativo, max_palabras, confianza, metodo_ic)]
+
+    pool = ProcessPoolExecutor(max_workers=procesos) if procesos != 1 and activos else None
+    try:
+        while activos:
+            # Una ronda: ITERACIONES tandas por punto activo (la última recortada al tope)
+            tareas, destino = [], []
+            for i in activos:
+                lote = lotes[i]
+                restantes = max_palabras - generadas[i] if adaptivo else lote * ITERACIONES
+                for semilla_tanda in semillas[i].spawn(min(ITERACIONES, -(-restantes // lote))):
+                    PALABRAS = int(min(lote, restantes))
+                    restantes -= PALABRAS
+                    generadas[i] += PALABRAS
+                    tanda = semilla_tanda.spawn_key[-1]
+                    guardada = guardadas[i].get(tanda)
+                    if guardada is not None and guardada[0] == PALABRAS:
+                        # Tanda ya simulada en una corrida anterior con la misma semilla
+                        e_p[i] += guardada[1]
+                        e_b[i] += guardada[2]
+                        palabras[i] += guardada[3]
+                        continue
+                    tareas.append(crear_tarea(PALABRAS, semilla=semilla_tanda, **parametros[i]))
+                    destino.append((i, tanda, PALABRAS))
+            conteos = map(_unidad, tareas) if pool is None else pool.map(_unidad, tareas)
+            for (i, tanda, PALABRAS), (e_p_t, e_b_t, palabras_t, perfil_t) in zip(destino, conteos):
+                e_p[i] += e_p_t
+                e_b[i] += e_b_t
+                palabras[i] += palabras_t
+                if perfil_t is not None:
+                    perfiles[i] = acumular(perfiles[i], perfil_t)
+                    medidas[i] += PALABRAS
+                if conexion is not None:
+                    almacen_resultados.guardar_tanda(conexion, configuracion, EbN0_c[i], semilla, tanda,
+                                                     PALABRAS, e_p_t, e_b_t, palabras_t)
 
+            if not adaptivo:
+                break
+            activos = [i for i in activos if not _detener(e_p[i], e_b[i], palabras[i], generadas[i], errores_objetivo,
+                                                          ancho_relativo, max_palabras, confianza, metodo_ic)]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if conexion is not None:
+            conexion.close()
+
+    # Tasas e intervalos a partir de los conteos totales
+    P_ep = e_p / np.maximum(palabras, 1)
+    P_eb = e_b / np.maximum(k * palabras, 1)
+    P_ep_inf, P_ep_sup = intervalo_confianza(e_p, palabras, confianza, metodo_ic)
+    P_eb_inf, P_eb_sup = intervalo_confianza(e_b, k * palabras, confianza, metodo_ic)
+
+    for i, EbN0 in enumerate(EbN0_c):
         # Si no se observaron errores, establecer una cota superior para evitar ceros en la gráfica logarítmica
-        total_palabras_simuladas = PALABRAS * ITERACIONES
-        total_bits_simulados = k * total_palabras_simuladas
         if P_ep[i] == 0:
-            P_ep[i] = 1 / total_palabras_simuladas
+            P_ep[i] = 1 / generadas[i]
         if P_eb[i] == 0:
-            P_eb[i] = 1 / total_bits_simulados
+            P_eb[i] = 1 / (k * generadas[i])
         
-        print(f"Promedio final - Eb/N0: {EbN0:.2f} dB, Tasa de error de bit: {P_eb[i]:.6f}")
+        print(f"Promedio final - Eb/N0: {EbN0:.2f} dB, Tasa de error de bit: {P_eb[i]:.6f} "
+              f"[{P_eb_inf[i]:.2e}, {P_eb_sup[i]:.2e}], palabras: {generadas[i]}")
+
+    intervalos = {
+        'P_ep_inf': P_ep_inf, 'P_ep_sup': P_ep_sup,
+        'P_eb_inf': P_eb_inf, 'P_eb_sup': P_eb_sup,
+        'e_p': e_p, 'e_b': e_b, 'palabras': palabras,
+    }
+    if perfil:
+        intervalos['perfil'] = tabla_perfil(EbN0_c, perfiles, medidas, k)
+        imprimir_perfil(intervalos['perfil'])
+        if traza is not None:
+            configuracion = {'n': n, 'k': k, 'dmin': dmin, 'modo': MODO, 'empaquetado': empaquetado,
+                             'canal': canal, 'decision': decision, 'procesos': procesos,
+                             'palabras_bloque': int(palabras_bloque), 'perfil': perfil, 'hilos': hilos}
+            print(f"Traza de perfil: {guardar_traza(traza, intervalos['perfil'], configuracion)}")
+    if con_intervalos:
+        return P_ep, P_eb, intervalos
     return P_ep, P_eb
 
 def main():
     MODO = 0 # 0 = DETECTOR; 1 = CORRECTOR
+    PROCESOS = None # None = todos los núcleos; 1 = sin pool
+    SEMILLA = 0     # Fija: corridas repetibles (y reanudables con ALMACEN)
+    ERRORES_OBJETIVO = None # Modo adaptivo: p. ej. 100 errores de palabra y de bit por punto
+    ANCHO_RELATIVO = None   # Modo adaptivo: p. ej. 0.2 = intervalo del 95% de +-10% de P_ep
+    IMPORTANCIA = False     # True = muestreo de importancia (tasas muy bajas, Eb/N0 altos)
+    DECISION = 'dura'       # CORRECTOR: 'dura', 'ml' o 'chase' (decisión suave)
+    ALMACEN = None          # almacen_resultados.RUTA_ALMACEN = guardar tandas y reanudar (suma corridas previas)
+    PERFIL = None           # None, 'tiempo' o 'memoria' (tiempo y pico de memoria por etapa)
+    HILOS = None            # Hilos que generan mensajes y ruido en paralelo con la decodificación; None = en serie
     n, k = 14, 10 # Parametros del codigo
-    tc, dmin = mejorCodigo(n, k) # Parametros del codigo: Mejor (14,10)
+    H_t, G, dmin, pesos = disenar_codigo(n, k) # Mejor código (n, k) encontrado, con su dmin exacta (en caché)
+    tc = (dmin - 1) // 2
     EbN0_c = np.linspace(1, 10, 30) # Rango de energia/ruido [dB]
-    P_ep, P_eb = Simulacion(EbN0_c, n, k, dmin, MODO)
+    if IMPORTANCIA:
+        P_ep, P_eb, intervalos = SimulacionImportancia(EbN0_c, n, k, dmin, MODO, procesos=PROCESOS, semilla=SEMILLA,
+                                                       H_t=H_t, G=G, con_intervalos=True)
+    else:
+        P_ep, P_eb, intervalos = Simulacion(EbN0_c, n, k, dmin, MODO, procesos=PROCESOS, semilla=SEMILLA,
+                                            errores_objetivo=ERRORES_OBJETIVO, ancho_relativo=ANCHO_RELATIVO,
+                                            decision=DECISION, H_t=H_t, G=G, almacen=ALMACEN, perfil=PERFIL,
+                                            traza=os.path.join(os.path.dirname(__file__), 'resultados', 'perfil.json'),
+                                            hilos=HILOS, con_intervalos=True)
     Ga = 10 * np.log10((k/n)*np.floor((dmin + 1)/2)) # Ganancia de codigo asintotica
     EbN0_sc = 10 * np.log10((Qinv(P_eb) ** 2) * 0.5)
     Gc = EbN0_sc - EbN0_c
@@ -96,25 +474,28 @@ def main():
     # Analizar resultados
     print(f"n: {n}, k: {k}, tc: {tc}, dmin: {dmin}, Ga: {Ga:.2f} dB")
     
+    # Curvas exactas del decodificador, en una grilla densa. Con n > MAX_N_ENUMERACION no se pueden
+    # recorrer los patrones de error: en DETECTOR alcanza la distribución de pesos (error entre las
+    # aceptadas = patrón que es palabra código no nula); en CORRECTOR no se grafica la curva
+    EbN0_denso = np.linspace(EbN0_c[0], EbN0_c[-1], 500)
+    analitica = None
+    if n <= MAX_N_ENUMERACION:
+        P_ep_exacta, P_eb_exacta = tasas_analiticas(EbN0_denso, n, k, H_t, G, dmin, MODO)
+        analitica = (EbN0_denso, P_eb_exacta if MODO else P_ep_exacta)
+    elif MODO == 0:
+        p = probabilidad_error(n, k, 10**(EbN0_denso/10))
+        P_u = prob_no_detectado(pesos, p)
+        analitica = (EbN0_denso, P_u / (P_u + (1 - p)**n))
+
     if MODO == 0:  # DETECTOR
-        graficos_detector(EbN0_c, P_ep, n, k, td=dmin - 1)
+        graficos_detector(EbN0_c, P_ep, n, k, td=dmin - 1, analitica=analitica)
     else:  # CORRECTOR
-        graficos_corrector(EbN0_c, P_eb, Gc, Ga, n, k, tc)
+        graficos_corrector(EbN0_c, P_eb, Gc, Ga, n, k, tc, analitica=analitica)
     
     # Guardar resultados
-    df = simulation_table(EbN0_c, P_ep, P_eb, Gc, Ga)
+    df = simulation_table(EbN0_c, P_ep, P_eb, Gc, Ga, intervalos)
     output_file = os.path.join(resultados_dir, f'{"detector" if MODO == 0 else "corrector"}.csv')
     df.to_csv(output_file, index=False)
 
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
-
-
-
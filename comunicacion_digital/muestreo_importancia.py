@@ -0,0 +1,165 @@
+from helpers import bloques_palabras, Qinv
+from codificacion import matrizGeneradora
+from csb import probabilidad_error
+from empaquetado import CodigoEmpaquetado, random_U_empaquetado, patron_errores_empaquetado, popcount
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Estimación por muestreo de importancia (MI) sobre el canal binario simétrico equivalente:
+# los bits se invierten con una probabilidad sesgada q > p y cada palabra se pondera por la
+# razón de verosimilitud L = (p/q)^w ((1-p)/(1-q))^(n-w), con w la cantidad de bits invertidos.
+# E_q[L * 1{error}] = P(error), así que el estimador es insesgado para cualquier q.
+
+# Sumas por unidad de trabajo (índices de SUMAS): palabras, x = L·1{error de palabra},
+# b = L·(bits con error), v = L·1{palabra aceptada}, y sus cuadrados y productos cruzados
+SUMAS = ('N', 'x', 'x2', 'b', 'b2', 'v', 'v2', 'xv', 'bv')
+PALABRAS_POR_BLOQUE = 1 << 18
+
+
+def sesgo_por_defecto(n, dmin, MODO):
+    """
+    Probabilidad de inversión sesgada: centra el peso de los patrones sorteados en el menor
+    peso que produce un error (tc + 1 en CORRECTOR, dmin en DETECTOR).
+    """
+    tc = (dmin - 1) // 2
+    peso = tc + 1 if MODO else dmin
+    return min(peso / n, 0.5)
+
+def iteracion_importancia(PALABRAS, codigo, EbfN0, MODO, q, rng=None, palabras_bloque=PALABRAS_POR_BLOQUE):
+    """
+    Simula PALABRAS palabras con probabilidad de inversión q y acumula las sumas ponderadas.
+
+    Args:
+        PALABRAS: Cantidad de palabras
+        codigo: CodigoEmpaquetado
+        EbfN0: Cociente Eb/N0 (en veces)
+        MODO: 0 = DETECTOR; 1 = CORRECTOR
+        q: Probabilidad de inversión sesgada
+        rng: np.random.Generator (opcional)
+        palabras_bloque: Palabras por bloque
+
+    Returns:
+        np.ndarray: Sumas en el orden de SUMAS
+    """
+    n, k = codigo.n, codigo.k
+    p = probabilidad_error(n, k, EbfN0)
+    log_err, log_ok = np.log(p / q), np.log((1 - p) / (1 - q))
+    sumas = np.zeros(len(SUMAS))
+    for m in bloques_palabras(PALABRAS, palabras_bloque):
+        U = random_U_empaquetado(m, k, rng)
+        V = codigo.codificar(U)
+        e = patron_errores_empaquetado(m, n, q, rng)
+        R = V ^ e
+        w = popcount(e).astype(float)
+        L = np.exp(w * log_err + (n - w) * log_ok)     # Razón de verosimilitud de cada palabra
+
+        if MODO:
+            aceptadas = np.ones(m, dtype=bool)
+            Ue = codigo.mensaje(codigo.corregir(R))
+        else:
+            aceptadas = ~codigo.detectar(R)
+            Ue = np.where(aceptadas, codigo.mensaje(R), U)  # Las descartadas no suman errores
+        errores = popcount(U ^ Ue).astype(float)
+
+        x = L * (errores > 0)
+        b = L * errores
+        v = L * aceptadas
+        sumas += [m, x.sum(), x @ x, b.sum(), b @ b, v.sum(), v @ v, x @ v, b @ v]
+    return sumas
+
+def estimar(sumas, k, MODO, confianza=0.95):
+    """
+    Tasas de error, varianzas e intervalos (aproximación normal) a partir de las sumas de MI.
+
+    En CORRECTOR P_ep = E[x] y P_eb = E[b]/k. En DETECTOR las tasas se condicionan a las palabras
+    aceptadas (P_ep = E[x]/E[v]) y la varianza del cociente se aproxima por el método delta.
+
+    Returns:
+        dict: 'P_ep', 'P_eb', 'var_ep', 'var_eb', 'P_ep_inf', 'P_ep_sup', 'P_eb_inf', 'P_eb_sup'
+    """
+    s = dict(zip(SUMAS, np.asarray(sumas, dtype=float).T))
+    N = s['N']
+    x, b, v = s['x'] / N, s['b'] / N, s['v'] / N
+    var_x, var_b, var_v = s['x2'] / N - x**2, s['b2'] / N - b**2, s['v2'] / N - v**2
+
+    if MODO:
+        P_ep, var_ep = x, var_x / N
+        P_eb, var_eb = b / k, var_b / (k**2 * N)
+    else:
+        P_ep = x / v
+        P_eb = b / (k * v)
+        cov_xv, cov_bv = s['xv'] / N - x * v, s['bv'] / N - b * v
+        var_ep = (var_x + P_ep**2 * var_v - 2 * P_ep * cov_xv) / (N * v**2)
+        var_eb = (var_b + (k * P_eb)**2 * var_v - 2 * k * P_eb * cov_bv) / (N * (k * v)**2)
+
+    z = Qinv((1 - confianza) / 2)
+    var_ep, var_eb = np.maximum(var_ep, 0), np.maximum(var_eb, 0)
+    return {
+        'P_ep': P_ep, 'P_eb': P_eb, 'var_ep': var_ep, 'var_eb': var_eb,
+        'P_ep_inf': np.maximum(P_ep - z * np.sqrt(var_ep), 0), 'P_ep_sup': P_ep + z * np.sqrt(var_ep),
+        'P_eb_inf': np.maximum(P_eb - z * np.sqrt(var_eb), 0), 'P_eb_sup': P_eb + z * np.sqrt(var_eb),
+    }
+
+def _unidad(tarea):
+    PALABRAS, codigo, EbfN0, MODO, q, semilla = tarea
+    return iteracion_importancia(PALABRAS, codigo, EbfN0, MODO, q, np.random.default_rng(semilla))
+
+def SimulacionImportancia(EbN0_c, n, k, dmin, MODO, palabras = 10**6, sesgo = None, procesos = None,
+                          semilla = None, confianza = 0.95, H_t = None, G = None, con_intervalos = False):
+    """
+    Equivalente a Simulacion (canal con detección dura) usando muestreo de importancia, para
+    estimar tasas de error muy bajas (Eb/N0 altos) con pocas palabras.
+
+    Args:
+        EbN0_c (array): Rango de energía/ruido con codigo [dB]
+        n, k, dmin, MODO: Como en Simulacion
+        palabras (int): Palabras simuladas por punto
+        sesgo (float): Probabilidad de inversión sesgada q (None = sesgo_por_defecto)
+        procesos (int): Cantidad de procesos (None = todos los núcleos, 1 = sin pool)
+        semilla (int): Semilla de la SeedSequence (None = entropía del sistema)
+        confianza (float): Nivel de confianza de los intervalos
+        H_t, G: Matrices del código; por defecto matrizGeneradora(n, k, dmin)
+        con_intervalos (bool): Devuelve además el diccionario intervalos, como Simulacion
+
+    Returns:
+        P_ep (np.ndarray): Tasa de error de palabra
+        P_eb (np.ndarray): Tasa de error de bit
+        intervalos (dict): Sólo con con_intervalos=True. Cotas de confianza, varianzas ('var_ep', 'var_eb') y 'palabras'
+    """
+    ITERACIONES = 10
+    tc = (dmin - 1) // 2
+    if H_t is None:
+        H_t, G = matrizGeneradora(n, k, dmin)
+    codigo = CodigoEmpaquetado(H_t, G, tc)
+    semillas = np.random.SeedSequence(semilla).spawn(len(EbN0_c) * ITERACIONES)
+
+    tareas = []
+    for i, EbN0 in enumerate(EbN0_c):
+        EbfN0 = 10**(EbN0/10)
+        # Nunca sesgar por debajo de la p real
+        q = max(sesgo if sesgo is not None else sesgo_por_defecto(n, dmin, MODO), probabilidad_error(n, k, EbfN0))
+        for iter, PALABRAS in enumerate(bloques_palabras(palabras, -(-palabras // ITERACIONES))):
+            tareas.append((PALABRAS, codigo, EbfN0, MODO, q, semillas[i * ITERACIONES + iter]))
+
+    if procesos == 1:
+        resultados = [_unidad(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_unidad, tareas))
+
+    # Reducción de las sumas de cada punto
+    sumas = np.zeros((len(EbN0_c), len(SUMAS)))
+    unidades = len(resultados) // len(EbN0_c)
+    for i in range(len(EbN0_c)):
+        sumas[i] = np.sum(resultados[i * unidades:(i + 1) * unidades], axis=0)
+    estimacion = estimar(sumas, k, MODO, confianza)
+
+    for i, EbN0 in enumerate(EbN0_c):
+        print(f"Muestreo de importancia - Eb/N0: {EbN0:.2f} dB, Tasa de error de bit: {estimacion['P_eb'][i]:.3e} "
+              f"(desvío {np.sqrt(estimacion['var_eb'][i]):.1e})")
+
+    P_ep, P_eb = estimacion.pop('P_ep'), estimacion.pop('P_eb')
+    estimacion['palabras'] = sumas[:, 0].astype(np.int64)
+    if con_intervalos:
+        return P_ep, P_eb, estimacion
+    return P_ep, P_eb
@@ -0,0 +1,61 @@
+from diseno import disenar_codigo
+from decodificacion import corregir, detectar, sindromes, decodificar_chase, decodificar_ml
+from csb import canalCSB
+import numpy as np
+
+
+def test_chase_devuelve_palabras_codigo_y_mejora_la_decision_dura():
+    n, k, EbN0 = 14, 10, 4.0
+    H_t, G, dmin, _ = disenar_codigo(n, k)
+    tc = (dmin - 1) // 2
+    rng = np.random.default_rng(0)
+    U = rng.integers(0, 2, (50000, k))
+    Y = canalCSB(n, k, 1, 10**(EbN0/10), U @ G % 2, rng, suave=True)
+
+    Ve = decodificar_chase(Y, H_t, tc)
+    assert np.all(sindromes(Ve, H_t) == 0)
+
+    ber = lambda V: np.mean(U != V[:, :k])
+    ber_dura = ber(corregir((Y > 0).astype(np.int64), H_t, tc))
+    ber_chase, ber_ml = ber(Ve), ber(decodificar_ml(Y, G))
+    assert ber_ml <= ber_chase * 1.05
+    assert ber_chase < 0.5 * ber_dura
+
+
+def _recibidas(G, palabras, max_errores, rng):
+    # Palabras código con entre 0 y max_errores bits invertidos
+    n = G.shape[1]
+    V = rng.integers(0, 2, (palabras, G.shape[0])) @ G % 2
+    E = np.zeros_like(V)
+    for fila, peso in enumerate(rng.integers(0, max_errores + 1, palabras)):
+        E[fila, rng.choice(n, peso, replace=False)] = 1
+    return V ^ E
+
+
+def test_corregir_coincide_con_la_palabra_mas_cercana():
+    rng = np.random.default_rng(1)
+    for n, k in ((15, 7), (15, 5)):
+        H_t, G, dmin, _ = disenar_codigo(n, k)
+        tc = (dmin - 1) // 2
+        assert tc >= 2
+        R = _recibidas(G, 3000, tc + 2, rng)
+        # Fuerza bruta: distancia a las 2^k palabras código
+        mensajes = (np.arange(1 << k)[:, None] >> np.arange(k - 1, -1, -1)) & 1
+        C = mensajes @ G % 2
+        distancias = (R[:, None, :] != C[None, :, :]).sum(axis=2)
+        cercana = C[distancias.argmin(axis=1)]
+        dentro = distancias.min(axis=1) <= tc
+
+        Ve = corregir(R.copy(), H_t, tc)
+        assert dentro.any() and (~dentro).any()
+        assert np.array_equal(Ve[dentro], cercana[dentro])
+        # Fuera del radio de corrección la palabra no se modifica
+        assert np.array_equal(Ve[~dentro], R[~dentro])
+
+
+def test_detectar_coincide_con_el_producto_por_H():
+    rng = np.random.default_rng(2)
+    for n, k in ((7, 4), (14, 10), (15, 5)):
+        H_t, G, dmin, _ = disenar_codigo(n, k)
+        R = _recibidas(G, 5000, 3, rng)
+        assert np.array_equal(detectar(R, H_t), (R @ H_t % 2).any(axis=1))
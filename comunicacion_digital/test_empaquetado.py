@@ -0,0 +1,36 @@
+from diseno import disenar_codigo
+from decodificacion import corregir, detectar
+from csb import canalCSB_errores
+from empaquetado import CodigoEmpaquetado, empaquetar, desempaquetar, canalCSB_errores_empaquetado, popcount
+import numpy as np
+
+
+def test_canal_errores_empaquetado_igual_al_de_bits():
+    n, k, EbfN0 = 15, 11, 10**(3/10)
+    rng = np.random.default_rng(0)
+    V = rng.integers(0, 2, (20000, n))
+    R = canalCSB_errores(n, k, 1, EbfN0, V, np.random.default_rng(1))
+    r = canalCSB_errores_empaquetado(n, k, 1, EbfN0, empaquetar(V), np.random.default_rng(1))
+    assert np.array_equal(desempaquetar(r, n), R)
+    assert int(popcount(r ^ empaquetar(V)).sum()) == int((R != V).sum())
+
+
+def test_corregir_y_detectar_iguales_al_camino_de_bits():
+    rng = np.random.default_rng(2)
+    for n, k in ((7, 4), (14, 10), (15, 5)):
+        H_t, G, dmin, _ = disenar_codigo(n, k)
+        tc = (dmin - 1) // 2
+        codigo = CodigoEmpaquetado(H_t, G, tc)
+        U = rng.integers(0, 2, (20000, k))
+        V = U @ G % 2
+        assert np.array_equal(codigo.codificar(empaquetar(U)), empaquetar(V))
+
+        R = canalCSB_errores(n, k, 1, 10**(2/10), V, rng)
+        r = empaquetar(R)
+        Ve, ve = corregir(R.copy(), H_t, tc), codigo.corregir(r)
+        assert np.array_equal(desempaquetar(ve, n), Ve)
+        assert np.array_equal(codigo.detectar(r), detectar(R, H_t))
+        # Mismos conteos de errores de palabra y de bit que la simulación de bits
+        E, e = U != Ve[:, :k], empaquetar(U) ^ codigo.mensaje(ve)
+        assert np.count_nonzero(e) == (E.sum(axis=1) > 0).sum()
+        assert int(popcount(e).sum()) == E.sum()
@@ -0,0 +1,25 @@
+from main import Simulacion, bytes_por_palabra, PALABRAS_TROZO
+import numpy as np
+
+EbN0_c = np.array([3.0, 5.0])
+
+
+def _conteos(palabras_lote=20000, **opciones):
+    _, _, intervalos = Simulacion(EbN0_c, 7, 4, 3, 1, semilla=3, errores_objetivo=50, palabras_lote=palabras_lote,
+                                  con_intervalos=True, **opciones)
+    return [intervalos[c].tolist() for c in ('e_p', 'e_b', 'palabras')]
+
+
+def test_misma_semilla_mismos_conteos_con_cualquier_cantidad_de_procesos():
+    for opciones in ({}, {'empaquetado': True}, {'hilos': 2}):
+        assert _conteos(procesos=1, **opciones) == _conteos(procesos=2, **opciones)
+
+
+def test_el_tamano_de_bloque_no_cambia_los_conteos():
+    # Bloques de 1 y de 4 trozos (PALABRAS_TROZO palabras) en tandas de 5 trozos
+    lote = 5 * PALABRAS_TROZO
+    for opciones in ({}, {'empaquetado': True}, {'canal': 'errores'}, {'decision': 'chase'}):
+        empaquetado = opciones.get('empaquetado', False)
+        memoria = [trozos * PALABRAS_TROZO * bytes_por_palabra(7, 4, empaquetado) for trozos in (1, 4)]
+        conteos = [_conteos(procesos=1, palabras_lote=lote, memoria_bloque=m, **opciones) for m in memoria]
+        assert conteos[0] == conteos[1]
@@ -0,0 +1,6 @@
+from validacion import validar_canal_errores
+
+
+def test_canal_de_errores_equivalente_al_gaussiano():
+    # Versión rápida de python validacion.py (semilla fija: resultado determinista)
+    assert validar_canal_errores(EbN0_dB=(0, 4), palabras=20000, semilla=0)
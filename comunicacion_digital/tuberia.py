@@ -0,0 +1,147 @@
+from helpers import bloques_palabras
+from decodificacion import corregir, detectar, decodificar_ml, decodificar_chase
+from empaquetado import empaquetar, desempaquetar, popcount
+from instrumentacion import SIN_PERFIL
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Generación en tubería: hilos productores llenan buffers preasignados (mensajes uint8 y ruido
+# normal estándar float32) mientras el hilo principal codifica, aplica el canal y decodifica el
+# bloque anterior (doble buffer). Cada hilo tiene su propio Generator, obtenido con jumped() del
+# PCG64 de la unidad, y llena siempre la misma porción de cada bloque, así que el resultado es
+# reproducible para una misma (semilla, hilos, palabras_bloque). Los llenados de NumPy liberan el GIL.
+
+
+def flujos(semilla, hilos):
+    """
+    Un Generator por hilo: saltos de 2^127 pasos del PCG64 de la semilla (flujos sin solapamiento).
+    """
+    base = np.random.PCG64(semilla)
+    return [np.random.Generator(base.jumped(i + 1)) for i in range(hilos)]
+
+def _llenar(rng, U, Z, maximo):
+    # Mensajes uniformes (bytes o bits) y ruido normal estándar, escritos en los buffers del bloque
+    U[...] = rng.integers(0, maximo, U.shape, dtype=np.uint8)
+    rng.standard_normal(out=Z, dtype=np.float32)
+
+class _Buffers:
+    """
+    Mensajes y ruido de un bloque. Empaquetado: 8 bytes por palabra (se leen como uint64 y se
+    conservan los k bits más significativos, como random_U_empaquetado); si no, un uint8 por bit.
+    """
+    def __init__(self, palabras, n, k, empaquetado):
+        self.U = np.empty(8 * palabras if empaquetado else (palabras, k), dtype=np.uint8)
+        self.Z = np.empty((palabras, n), dtype=np.float32)
+        self.empaquetado = empaquetado
+        self.maximo = 256 if empaquetado else 2
+
+    def porciones(self, m, hilos):
+        limites = np.linspace(0, m, hilos + 1).astype(int)
+        escala = 8 if self.empaquetado else 1
+        return [(self.U[escala * a:escala * b], self.Z[a:b]) for a, b in zip(limites[:-1], limites[1:])]
+
+def iteracion_tuberia(PALABRAS, n, k, A, EbfN0, MODO, semilla, hilos, palabras_bloque=None, codigo=None,
+                      H_t=None, G=None, tc=1, decision='dura', perfil=SIN_PERFIL):
+    """
+    Igual que iteracion (codigo = None) o iteracion_empaquetada (codigo: CodigoEmpaquetado) con el
+    canal AWGN, generando mensajes y ruido en hilos mientras se decodifica el bloque anterior.
+
+    Misma estadística que el camino serie (p = Q(sqrt(2 Es/N0)) por bit, mensajes uniformes),
+    pero otra secuencia de números: los conteos no coinciden bit a bit con iteracion.
+
+    Args:
+        PALABRAS: Cantidad de palabras
+        n, k, A, EbfN0, MODO: Como en iteracion
+        semilla: SeedSequence (o entero) de la unidad
+        hilos: Hilos productores
+        palabras_bloque: Palabras por bloque (hay dos bloques en memoria)
+        codigo: CodigoEmpaquetado para el camino empaquetado; si no, H_t, G y tc
+        decision: En CORRECTOR sin empaquetado, 'dura', 'ml' o 'chase'
+        perfil: instrumentacion.Perfil; 'fuente' es la espera por los buffers generados
+
+    Returns:
+        tuple: (e_p, e_b, palabras)
+    """
+    palabras_bloque = min(palabras_bloque or PALABRAS, PALABRAS)
+    empaquetado = codigo is not None
+    buffers = [_Buffers(palabras_bloque, n, k, empaquetado) for _ in range(2)]
+    generadores = flujos(semilla, hilos)
+    sigma = np.sqrt(A**2 * n / k / EbfN0 / 2)
+    umbral = np.float32(A / sigma)             # Error cuando el ruido supera A en sentido contrario
+    if empaquetado:
+        V_bloque = np.empty(palabras_bloque, dtype=np.uint64)
+    else:
+        G32 = np.asarray(G, dtype=np.float32)
+        P_bloque = np.empty((palabras_bloque, n), dtype=np.float32)
+        V_bloque = np.empty((palabras_bloque, n), dtype=np.uint8)
+    bloques = list(bloques_palabras(PALABRAS, palabras_bloque))
+    e_p = e_b = palabras = 0
+
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        def generar(j):
+            destino = buffers[j % 2]
+            porciones = destino.porciones(bloques[j], hilos)
+            return [pool.submit(_llenar, rng, U, Z, destino.maximo) for rng, (U, Z) in zip(generadores, porciones)]
+
+        pendientes = generar(0)
+        for j, m in enumerate(bloques):
+            with perfil.etapa('fuente'):
+                for futuro in pendientes:
+                    futuro.result()
+            # El bloque j + 1 se genera mientras se procesa el j
+            pendientes = generar(j + 1) if j + 1 < len(bloques) else []
+            U, Z = buffers[j % 2].U, buffers[j % 2].Z[:m]
+
+            if empaquetado:
+                with perfil.etapa('codificacion'):
+                    U = U[:8 * m].view(np.uint64) >> np.uint64(64 - k)
+                    V = codigo.codificar(U, out=V_bloque[:m])
+                with perfil.etapa('canal'):
+                    bits = desempaquetar(V, n).astype(bool)
+                    R = V ^ empaquetar(np.where(bits, Z <= -umbral, Z > umbral))
+                if MODO:
+                    with perfil.etapa('decodificacion'):
+                        Ve = codigo.corregir(R)
+                else:
+                    with perfil.etapa('decodificacion'):
+                        validas = ~codigo.detectar(R)
+                    with perfil.etapa('descarte'):
+                        U = U[validas]
+                        Ve = R[validas]
+                with perfil.etapa('conteo'):
+                    E = U ^ codigo.mensaje(Ve)
+                    e_p += int(np.count_nonzero(E))
+                    e_b += int(popcount(E).sum())
+                    palabras += len(E)
+                continue
+
+            U = U[:m]
+            with perfil.etapa('codificacion'):
+                # Producto float32 (BLAS; sumas exactas, k < 2^24) y paridad en uint8
+                np.matmul(U.astype(np.float32), G32, out=P_bloque[:m])
+                V = V_bloque[:m]
+                np.copyto(V, P_bloque[:m], casting='unsafe')
+                V &= 1
+            if MODO and decision != 'dura':
+                with perfil.etapa('canal'):
+                    Y = sigma * Z + (2 * V.astype(np.float32) - 1) * A    # Muestras reales (decisión suave)
+                with perfil.etapa('decodificacion'):
+                    Ve = decodificar_ml(Y, G) if decision == 'ml' else decodificar_chase(Y, H_t, tc)
+            else:
+                with perfil.etapa('canal'):
+                    R = V ^ np.where(V.astype(bool), Z <= -umbral, Z > umbral).view(np.uint8)
+                if MODO:
+                    with perfil.etapa('decodificacion'):
+                        Ve = corregir(R, H_t, tc)
+                else:
+                    with perfil.etapa('decodificacion'):
+                        detectados = detectar(R, H_t)
+                    with perfil.etapa('descarte'):
+                        Ve = R[~detectados]
+                        U = U[~detectados]
+            with perfil.etapa('conteo'):
+                E = U != Ve[:, :k]
+                e_p += int((E.sum(axis=1) > 0).sum())
+                e_b += int(E.sum())
+                palabras += E.shape[0]
+    return e_p, e_b, palabras
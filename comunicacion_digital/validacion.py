@@ -0,0 +1,65 @@
+from csb import canalCSB, canalCSB_errores, probabilidad_error
+from empaquetado import canalCSB_empaquetado, canalCSB_errores_empaquetado, empaquetar, popcount
+import numpy as np
+from scipy.stats import chi2_contingency, binomtest
+
+# Chequeos estadísticos entre modelos de canal equivalentes (termina con código 1 si alguno falla)
+
+def pesos_error(R, V):
+    """
+    Cantidad de bits con error de cada palabra recibida (matrices de bits).
+    """
+    return (R != V).sum(axis=1)
+
+def comparar_pesos(pesos_a, pesos_b, n):
+    """
+    Prueba chi-cuadrado de homogeneidad entre las distribuciones de peso del error de dos canales.
+
+    Returns:
+        float: p-valor
+    """
+    tabla = np.array([np.bincount(pesos_a, minlength=n + 1), np.bincount(pesos_b, minlength=n + 1)])
+    tabla = tabla[:, tabla.sum(axis=0) > 0]
+    return chi2_contingency(tabla)[1]
+
+def validar_canal_errores(n=14, k=10, EbN0_dB=(0, 3, 6), palabras=200000, semilla=0, alfa=1e-3):
+    """
+    Compara canalCSB_errores (y su versión empaquetada) con el canal gaussiano canalCSB:
+    tasa de error de bit contra la p teórica (prueba binomial) y distribución de la cantidad
+    de errores por palabra (chi-cuadrado).
+
+    Returns:
+        bool: True si ninguna prueba rechaza con nivel alfa
+    """
+    rng = np.random.default_rng(semilla)
+    ok = True
+    for EbN0 in EbN0_dB:
+        EbfN0 = 10**(EbN0/10)
+        p = probabilidad_error(n, k, EbfN0)
+        V = rng.integers(0, 2, (palabras, n))
+        v = empaquetar(V)
+
+        pesos = {
+            'awgn': pesos_error(canalCSB(n, k, 1, EbfN0, V, rng), V),
+            'errores': pesos_error(canalCSB_errores(n, k, 1, EbfN0, V, rng), V),
+            'awgn empaquetado': popcount(canalCSB_empaquetado(n, k, 1, EbfN0, v, rng) ^ v).astype(np.int64),
+            'errores empaquetado': popcount(canalCSB_errores_empaquetado(n, k, 1, EbfN0, v, rng) ^ v).astype(np.int64),
+        }
+        print(f"Eb/N0 = {EbN0} dB, p teórica = {p:.3e}")
+        for nombre, w in pesos.items():
+            p_bin = binomtest(int(w.sum()), palabras * n, p).pvalue
+            p_chi = comparar_pesos(pesos['awgn'], w, n) if nombre != 'awgn' else None
+            aprobado = p_bin > alfa and (p_chi is None or p_chi > alfa)
+            ok &= aprobado
+            chi = '-' if p_chi is None else f"{p_chi:.3f}"
+            print(f"  {nombre:20s} p = {w.sum() / (palabras * n):.3e}  p-valor binomial = {p_bin:.3f}  "
+                  f"p-valor chi2 (vs awgn) = {chi:>5s}  {'OK' if aprobado else 'RECHAZADO'}")
+    return ok
+
+def main():
+    ok = validar_canal_errores()
+    print("Validación", "aprobada" if ok else "FALLIDA")
+    raise SystemExit(0 if ok else 1)   # Código de salida distinto de 0 si algún punto es rechazado
+
+if __name__ == "__main__":
+    main()